@@ -0,0 +1,92 @@
+"""
+Benchmark: batched province-wide forecasting vs the per-model loop
+
+Scores every barangay model three ways and checks all produce the same forecasts:
+- baseline: predict_next_month() + predict_future_months() per model - two NeuralProphet
+  passes with components, logging and progress bars on (the path before batching)
+- single pass: predict_forecast_anchors() per model (what get_forecast_summary does on a
+  cache miss)
+- batched: predict_forecast_batch() (what refresh_forecast_store / build_forecast_store use)
+
+Usage:
+    python benchmark_batch_inference.py                 # all models
+    python benchmark_batch_inference.py --limit 10 --repeat 3
+"""
+import argparse
+import os
+import time
+
+os.environ.setdefault("BUILD_FORECAST_STORE", "0")  # scores the models itself, no startup store
+
+import main
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Compare batched vs per-model forecast scoring")
+    parser.add_argument('--model-dir', help="Score the models in this directory instead of main.MODEL_DIR")
+    parser.add_argument('--limit', type=int, help="Only score the first N models")
+    parser.add_argument('--repeat', type=int, default=1, help="Timing rounds (best round is reported)")
+    parser.add_argument('--months', type=int, default=main.FORECAST_HORIZON_MONTHS, help="Forecast horizon")
+    return parser.parse_args()
+
+
+def per_model_baseline(keys, months):
+    return {
+        key: (main.predict_next_month(main.MODELS[key]), main.predict_future_months(main.MODELS[key], months_ahead=months))
+        for key in keys
+    }
+
+
+def per_model_single_pass(keys, months):
+    return {key: main.predict_forecast_anchors(main.MODELS[key], months_ahead=months) for key in keys}
+
+
+def mismatched_keys(keys, expected, actual):
+    return [key for key in keys if expected[key][1] != actual[key][1]
+            or round(float(expected[key][0] or 0), 6) != round(float(actual[key][0] or 0), 6)]
+
+
+def best_time(func, repeat):
+    best, result = None, None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.model_dir:
+        main.MODEL_DIR = args.model_dir
+        main.MODELS = main.ModelRegistry(args.model_dir).build_index()
+    keys = list(main.MODELS)[:args.limit] if args.limit else list(main.MODELS)
+    if not keys:
+        raise SystemExit("❌ No models found - check MODEL_DIR")
+
+    # Keep every model resident so both runs measure inference, not unpickling
+    main.MODELS.max_resident = 0
+    for key in keys:
+        main.MODELS[key]
+    main.predict_future_months(main.MODELS[keys[0]], months_ahead=args.months)  # torch warm-up
+
+    baseline_seconds, baseline_results = best_time(lambda: per_model_baseline(keys, args.months), args.repeat)
+    single_seconds, single_results = best_time(lambda: per_model_single_pass(keys, args.months), args.repeat)
+    batch_seconds, batch_results = best_time(lambda: main.predict_forecast_batch(keys, months_ahead=args.months), args.repeat)
+
+    mismatched = set(mismatched_keys(keys, baseline_results, single_results))
+    mismatched |= set(mismatched_keys(keys, baseline_results, batch_results))
+
+    print("\n" + "=" * 60)
+    print("BATCHED FORECAST BENCHMARK")
+    print("=" * 60)
+    print(f"Models:              {len(keys)} ({args.months}-month horizon, best of {args.repeat})")
+    for label, seconds in [("Baseline (2 passes)", baseline_seconds), ("Single pass", single_seconds),
+                           ("Batched", batch_seconds)]:
+        print(f"{label + ':':<21}{seconds:.2f}s ({seconds / len(keys) * 1000:.0f} ms/model, "
+              f"{baseline_seconds / seconds:.2f}x vs baseline)")
+    if mismatched:
+        print(f"❌ {len(mismatched)} models produced different forecasts: {sorted(mismatched)[:5]}")
+        raise SystemExit(1)
+    print("✅ Single-pass and batched forecasts identical to the baseline")
@@ -0,0 +1,151 @@
+"""
+PDF report chart rendering (matplotlib object-oriented API, no pyplot)
+
+Every chart is drawn on a Figure + FigureCanvasAgg owned by the calling thread. Nothing
+touches pyplot's global figure manager, so the API worker threads render in parallel
+without a lock. Figures are reused: each thread keeps one preconfigured Figure per chart
+size and clears it between charts instead of creating and destroying one per request.
+
+Imported lazily by main.py the first time a report chart is rendered.
+"""
+import threading
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+from matplotlib import colormaps
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure, SubplotParams
+
+CHART_DPI = 150
+
+_FIGURES = threading.local()  # per-thread {figsize: Figure}
+
+
+def get_figure(figsize):
+    """This thread's cleared Figure for a chart size (created on first use)."""
+    figures = getattr(_FIGURES, 'by_size', None)
+    if figures is None:
+        figures = _FIGURES.by_size = {}
+
+    fig = figures.get(figsize)
+    if fig is None:
+        fig = Figure(figsize=figsize)
+        FigureCanvasAgg(fig)  # attaches itself as fig.canvas
+        figures[figsize] = fig
+    else:
+        fig.clear()
+        # tight_layout() moved the margins of the last chart - start from the defaults again
+        defaults = SubplotParams()
+        fig.subplots_adjust(left=defaults.left, bottom=defaults.bottom, right=defaults.right,
+                            top=defaults.top, wspace=defaults.wspace, hspace=defaults.hspace)
+    return fig
+
+
+def figure_png(fig, **savefig_kwargs):
+    """Figure -> PNG bytes at CHART_DPI (the figure stays in the pool)."""
+    img_buffer = BytesIO()
+    fig.savefig(img_buffer, format='png', dpi=CHART_DPI, **savefig_kwargs)
+    return img_buffer.getvalue()
+
+
+def style_impact_axes(ax, legend_fontsize, legend_ncol=1, zero_line=False):
+    """Shared axes styling of the component/regressor charts (date vs. impact on cases)."""
+    ax.set_xlabel('Date', fontsize=10)
+    ax.set_ylabel('Impact on Cases', fontsize=10)
+    ax.legend(loc='best', fontsize=legend_fontsize, ncol=legend_ncol)
+    ax.grid(True, alpha=0.3)
+    if zero_line:
+        ax.axhline(y=0, color='k', linestyle='-', linewidth=0.5)
+    ax.tick_params(axis='x', rotation=45, labelsize=8)
+
+
+def render_forecast_chart(data):
+    """Forecast line + filled area ({'dates': ['YYYY-MM-DD', ...], 'values': [...], 'title'})."""
+    dates = pd.to_datetime(data['dates'])
+    fig = get_figure((8, 4))
+    ax = fig.add_subplot()
+    ax.plot(dates, data['values'], color='#3498db', linewidth=2)
+    ax.fill_between(dates, 0, data['values'], alpha=0.3, color='#3498db')
+    ax.set_xlabel('Date', fontsize=12)
+    ax.set_ylabel('Predicted Cases', fontsize=12)
+    ax.set_title(data['title'], fontsize=14, fontweight='bold')
+    ax.grid(True, alpha=0.3)
+    ax.tick_params(axis='x', labelrotation=45)
+    fig.tight_layout()
+    return figure_png(fig)
+
+
+def render_decomposition_chart(data):
+    """Trend, seasonality and holiday components over the model history."""
+    dates = data['dates']
+    fig = get_figure((10, 5))
+    ax = fig.add_subplot()
+    ax.plot(dates, data['trend'], label='Trend', linewidth=2, color='#3498db')
+    ax.plot(dates, data['seasonality'], label='Seasonality', linewidth=2, color='#e74c3c', linestyle='--')
+    ax.plot(dates, data['holidays'], label='Holiday Effects', linewidth=2, color='#f39c12', alpha=0.7)
+    style_impact_axes(ax, legend_fontsize=9)
+    fig.tight_layout()
+    return figure_png(fig, bbox_inches='tight')
+
+
+def render_weather_chart(data):
+    """Weather regressor contributions (all-zero series are skipped)."""
+    fig = get_figure((10, 5))
+    ax = fig.add_subplot()
+    for col, values in data['regressors'].items():
+        if values and any(v != 0 for v in values):  # Only plot non-zero data
+            label = col.replace('_', ' ').title()
+            ax.plot(data['dates'], values, label=label, linewidth=1.5, alpha=0.8)
+    style_impact_axes(ax, legend_fontsize=8, legend_ncol=2, zero_line=True)
+    fig.tight_layout()
+    return figure_png(fig, bbox_inches='tight')
+
+
+def render_vaccination_chart(data):
+    """Vaccination campaign regressor contributions (all-zero series are skipped)."""
+    fig = get_figure((10, 5))
+    ax = fig.add_subplot()
+    for col, values in data['regressors'].items():
+        if values and any(v != 0 for v in values):
+            label = col.replace('_', ' ').title()
+            ax.plot(data['dates'], values, label=label, linewidth=2, marker='o', markersize=3)
+    style_impact_axes(ax, legend_fontsize=9, zero_line=True)
+    fig.tight_layout()
+    return figure_png(fig, bbox_inches='tight')
+
+
+def render_feature_importance_chart(data):
+    """Horizontal XGBoost feature-importance bars with percentage labels."""
+    feature_names = data['features']
+    fig = get_figure((8, 5))
+    ax = fig.add_subplot()
+    colors_list = colormaps['viridis'](np.linspace(0.3, 0.9, len(feature_names)))
+    bars = ax.barh(feature_names, data['importance'], color=colors_list)
+
+    ax.set_xlabel('Importance (%)', fontsize=10)
+    ax.set_ylabel('Feature', fontsize=10)
+    ax.set_title('Top 10 Most Important Features', fontsize=12, fontweight='bold')
+
+    # Add percentage labels on bars
+    for bar in bars:
+        width = bar.get_width()
+        ax.text(width, bar.get_y() + bar.get_height()/2, f'{width:.1f}%',
+                ha='left', va='center', fontsize=8, fontweight='bold')
+
+    fig.tight_layout()
+    return figure_png(fig, bbox_inches='tight')
+
+
+CHART_RENDERERS = {
+    'forecast': render_forecast_chart,
+    'decomposition': render_decomposition_chart,
+    'weather': render_weather_chart,
+    'vaccination': render_vaccination_chart,
+    'feature_importance': render_feature_importance_chart
+}
+
+
+def render_chart(chart_type, data):
+    """PNG bytes of a report chart (see CHART_RENDERERS for the types)."""
+    return CHART_RENDERERS[chart_type](data)
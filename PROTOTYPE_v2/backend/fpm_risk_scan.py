@@ -0,0 +1,49 @@
+"""
+Province-wide FPM risk scan (command line)
+
+Runs the same scan as GET /api/fpm/risk-scan over the loaded weather history and
+writes one row per barangay-month: MUN_CODE, BGY_CODE, month, risk, top_rule, lift.
+
+Usage:
+    python fpm_risk_scan.py                         # whole province -> fpm_risk_scan.csv
+    python fpm_risk_scan.py --risk HIGH             # only high-risk months
+    python fpm_risk_scan.py --municipality Antipolo --start 2024-01 --output antipolo.csv
+"""
+import argparse
+import time
+
+import main
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Scan every barangay-month for FPM weather-rabies risk")
+    parser.add_argument('--output', default='fpm_risk_scan.csv', help="CSV file to write ('-' for stdout)")
+    parser.add_argument('--risk', help="HIGH, MEDIUM, LOW or a comma list")
+    parser.add_argument('--municipality', help="Municipality name")
+    parser.add_argument('--barangay', help="Barangay name")
+    parser.add_argument('--start', help="First month (YYYY-MM)")
+    parser.add_argument('--end', help="Last month (YYYY-MM)")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    started = time.perf_counter()
+    scan = main.get_fpm_risk_scan()
+    if scan is None:
+        raise SystemExit("❌ Weather data or FPM model not loaded - check WEATHER_DATA_PATH / FPM_MODEL_PATH")
+    rows = main.filter_fpm_risk_scan(scan, args.risk, args.municipality, args.barangay, args.start, args.end)
+    elapsed = time.perf_counter() - started
+
+    if args.output == '-':
+        print(rows.to_csv(index=False), end='')
+    else:
+        rows.to_csv(args.output, index=False)
+        print("=" * 60)
+        print("FPM RISK SCAN")
+        print("=" * 60)
+        print(f"Barangay-months: {len(rows)} (of {len(scan)}) in {elapsed:.2f}s")
+        for level, count in rows['risk'].value_counts().items():
+            print(f"  {level}: {count}")
+        print(f"✅ Written to {args.output}")
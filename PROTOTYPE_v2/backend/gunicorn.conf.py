@@ -0,0 +1,33 @@
+# Gunicorn settings for production on Linux (used by start_production.sh)
+#
+# preload_app imports main.py ONCE in the master process: models (WARM_MODELS), the
+# forecast store (BUILD_FORECAST_STORE), the FPM model and the monthly weather frame
+# are loaded there, then workers are forked and share those memory pages copy-on-write
+# instead of each loading (or computing) a copy.
+
+import gc
+import os
+import sys
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", "4"))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+timeout = int(os.getenv("WORKER_TIMEOUT", "300"))  # PDF reports can take a while
+graceful_timeout = 30
+
+
+def when_ready(server):
+    # Everything loaded so far is read-only from here on. Freezing it keeps the
+    # garbage collector in the workers from touching (and so copying) those pages.
+    gc.freeze()
+    server.log.info("Preloaded app, gc frozen - forking %s workers", workers)
+
+
+def post_fork(server, worker):
+    # Split cores between workers so torch doesn't oversubscribe the CPU. Only if the
+    # master already loaded it - when serving from the precomputed forecast database
+    # (precompute_forecasts.py) the workers never import torch at all.
+    torch = sys.modules.get("torch")
+    if torch is not None:
+        torch.set_num_threads(max(1, (os.cpu_count() or 1) // workers))
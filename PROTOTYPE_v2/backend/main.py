@@ -4,19 +4,32 @@
 
 import pickle
 import os
+import json
+import hashlib
+import re
+import unicodedata
+import asyncio
+import threading
+import time
+import logging
+import math
+import sqlite3
+import weakref
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from collections import OrderedDict
+from collections.abc import Mapping
 from datetime import datetime
 from typing import List, Dict, Optional
 import pandas as pd
 import numpy as np
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse, FileResponse
-import io
+from fastapi.responses import StreamingResponse, FileResponse, JSONResponse, Response
 from io import BytesIO
 
-# Import ML libraries (required for unpickling)
-from neuralprophet import NeuralProphet
-import xgboost as xgb
+# ML libraries (NeuralProphet pulls in torch) are imported on first model load - see
+# import_model_libraries(). Requests served from the precomputed forecast database never need them.
 
 # Initialize FastAPI
 app = FastAPI(
@@ -160,6 +173,173 @@ def add_antipolo_vaccination_campaigns(df):
 # PREDICTION FUNCTIONS
 # ==============================================
 
+# XGBoost residual model features (EXACT order as training)
+XGB_FEATURE_NAMES = [
+    'Year', 'Month', 'lag_1', 'lag_2', 'rolling_mean_3',
+    'rolling_std_3', 'lag_12', 'month_sin', 'month_cos',
+    'rate_of_change_1', 'np_prediction'
+]
+
+
+def build_xgb_feature_matrix(dates, np_predictions):
+    """
+    Build the XGBoost feature matrix for a batch of future dates as one NumPy array.
+    Lag/rolling features are unknown for future months and stay 0 (same as training export).
+    """
+    dates = pd.DatetimeIndex(dates)
+    months = dates.month.to_numpy(dtype=np.float64)
+    
+    X = np.zeros((len(dates), len(XGB_FEATURE_NAMES)), dtype=np.float64)
+    X[:, XGB_FEATURE_NAMES.index('Year')] = dates.year.to_numpy(dtype=np.float64)
+    X[:, XGB_FEATURE_NAMES.index('Month')] = months
+    X[:, XGB_FEATURE_NAMES.index('month_sin')] = np.sin(2 * np.pi * months / 12)
+    X[:, XGB_FEATURE_NAMES.index('month_cos')] = np.cos(2 * np.pi * months / 12)
+    X[:, XGB_FEATURE_NAMES.index('np_prediction')] = np.asarray(np_predictions, dtype=np.float64)
+    return X
+
+
+def predict_xgb_residuals(xgb_model, dates, np_predictions):
+    """
+    Score XGBoost residual corrections for all dates in a single predict call.
+    The matrix is wrapped (zero-copy) with the training column names so XGBoost
+    still validates the feature order.
+    """
+    X = build_xgb_feature_matrix(dates, np_predictions)
+    if len(X) == 0:
+        return np.zeros(0)
+    return np.asarray(xgb_model.predict(pd.DataFrame(X, columns=XGB_FEATURE_NAMES, copy=False)))
+
+
+def score_hybrid(xgb_model, dates, np_predictions):
+    """Hybrid prediction (NeuralProphet baseline + XGBoost residual), clipped at 0."""
+    np_predictions = np.asarray(np_predictions, dtype=np.float64)
+    residuals = predict_xgb_residuals(xgb_model, dates, np_predictions)
+    return np.maximum(0, np_predictions + residuals)
+
+
+# NeuralProphet.predict mutates model state (dataloaders/trainer), so concurrent
+# requests for the same barangay must not predict on one model at the same time.
+# Keyed weakly by the model object, so a lock goes away with its model when the
+# registry evicts it (no growth, and no recycled id() picking up a stale lock)
+_NP_PREDICT_LOCKS = weakref.WeakKeyDictionary()
+_NP_PREDICT_LOCKS_GUARD = threading.Lock()
+_NP_QUIET = threading.local()  # .active inside quiet_neuralprophet() on this thread
+
+
+def np_predict(np_model, df, **kwargs):
+    """
+    Thread-safe NeuralProphet predict (one lock per model object).
+    Inside quiet_neuralprophet() the model's Lightning progress bar is switched off for the call.
+    """
+    with _NP_PREDICT_LOCKS_GUARD:
+        lock = _NP_PREDICT_LOCKS.get(np_model)
+        if lock is None:
+            lock = _NP_PREDICT_LOCKS[np_model] = threading.Lock()
+    with lock:
+        progress_bar = None
+        if getattr(_NP_QUIET, 'active', False):
+            # Models fitted with progress="bar" keep a TQDM callback on the pickled trainer
+            progress_bar = getattr(getattr(np_model, 'trainer', None), 'progress_bar_callback', None)
+        if not getattr(progress_bar, 'is_enabled', False):
+            progress_bar = None  # no bar, or already off - nothing to switch back on afterwards
+        if progress_bar is not None:
+            progress_bar.disable()
+        try:
+            return np_model.predict(df, **kwargs)
+        finally:
+            if progress_bar is not None:
+                progress_bar.enable()
+
+
+def component_column(forecast_df, candidates):
+    """First of the candidate column names present in a NeuralProphet forecast, or None."""
+    return next((col for col in candidates if col in forecast_df.columns), None)
+
+
+def round_component(values):
+    """Column -> list of floats, each round(float(x), 2) like the API has always returned."""
+    return [round(value, 2) for value in np.asarray(values, dtype=np.float64).tolist()]
+
+
+def extract_component_series(forecast_df, dates, holiday_col=None, weather_cols=(), vax_cols=(), seasonal_cols=()):
+    """
+    Per-date component lists (trend, seasonality, holidays, regressor contributions)
+    from a NeuralProphet forecast over the history in `dates`.
+    
+    Missing components are filled with 0 (0.0 for regressors), as before.
+    """
+    n_rows = len(dates)
+    if len(forecast_df) < n_rows:
+        raise ValueError(f"Forecast has {len(forecast_df)} rows for {n_rows} historical dates")
+    
+    def column_values(col, missing):
+        if col is None:
+            return [missing] * n_rows
+        return round_component(forecast_df[col].to_numpy()[:n_rows])
+    
+    def regressor_values(cols):
+        # NeuralProphet stores regressor contributions as 'future_regressor_{name}' ('season_{name}' in some versions)
+        return {
+            col: column_values(component_column(forecast_df, [f'future_regressor_{col}', f'season_{col}']), 0.0)
+            for col in cols
+        }
+    
+    return {
+        # No explicit trend -> fall back to the prediction itself
+        'trend': column_values(component_column(forecast_df, ['trend', 'yhat1']), 0),
+        'yearly_seasonality': column_values(
+            component_column(forecast_df, ['season_yearly', 'seasonal_yearly', 'yearly', 'seasonality']), 0
+        ),
+        'holidays': column_values(holiday_col, 0),  # NEW: Holiday effects
+        'weather_regressors': regressor_values(weather_cols),  # 🆕 Weather contributions
+        'vaccination_regressors': regressor_values(vax_cols),  # 🆕 Vaccination campaign contributions
+        'seasonal_regressors': regressor_values(seasonal_cols),  # 🆕 Custom seasonal features
+        'dates': pd.DatetimeIndex(dates).strftime('%Y-%m').tolist()
+    }
+
+
+HOLIDAY_EFFECT_THRESHOLD = 0.1  # |events_additive| above this counts as a significant effect
+HOLIDAY_ACTIVE_THRESHOLD = 0.01  # |event_<name>| above this means that holiday is active on the date
+HOLIDAY_TOP_N = 20
+
+
+def attribute_holiday_effects(forecast_df, holiday_values, dates, top_n=HOLIDAY_TOP_N):
+    """
+    Top-N significant holiday effects, each labelled with the holiday(s) active that month.
+    
+    Picks the strongest |effect| rows with np.argpartition, then labels them from one
+    boolean mask over the event_* column block.
+    
+    Returns:
+        List of {'date', 'holiday', 'effect', 'impact'}, strongest effect first
+    """
+    holiday_values = np.asarray(holiday_values, dtype=np.float64)
+    magnitudes = np.abs(holiday_values)
+    rows = np.flatnonzero(magnitudes > HOLIDAY_EFFECT_THRESHOLD)
+    if len(rows) > top_n:
+        rows = rows[np.argpartition(-magnitudes[rows], top_n - 1)[:top_n]]
+    rows = rows[np.lexsort((rows, -magnitudes[rows]))]  # strongest first, earlier date on ties
+    if len(rows) == 0:
+        return []
+    
+    # Holiday name from each event column (e.g., 'event_New Year's Day' -> 'New Year's Day')
+    event_columns = [col for col in forecast_df.columns if col.startswith('event_')]
+    event_names = np.array([col.replace('event_', '').replace('_', ' ') for col in event_columns], dtype=object)
+    active = np.abs(forecast_df[event_columns].to_numpy(dtype=np.float64)[rows]) > HOLIDAY_ACTIVE_THRESHOLD
+    
+    effects = []
+    for row, active_events in zip(rows, active):
+        effect = holiday_values[row]
+        effects.append({
+            'date': dates[row],
+            # Combine multiple holidays with " + " if multiple occur on same date
+            'holiday': ' + '.join(event_names[active_events]) or 'Holiday',
+            'effect': round(float(effect), 2),
+            'impact': 'Positive' if effect > 0 else 'Negative'
+        })
+    return effects
+
+
 def extract_model_components(model_data):
     """
     Extract interpretability components from NeuralProphet and XGBoost models.
@@ -266,22 +446,11 @@ def extract_model_components(model_data):
         
         # Get NeuralProphet components decomposition
         # This includes trend, seasonality patterns, AND holidays
-        forecast_df = np_model.predict(df_components)
+        forecast_df = np_predict(np_model, df_components)
         
         # Debug: Print available columns
         print(f"🔍 NeuralProphet forecast columns: {forecast_df.columns.tolist()}")
         
-        # Extract components
-        components = {
-            'trend': [],
-            'yearly_seasonality': [],
-            'holidays': [],  # NEW: Holiday effects
-            'weather_regressors': {},  # 🆕 Weather contributions
-            'vaccination_regressors': {},  # 🆕 Vaccination campaign contributions
-            'seasonal_regressors': {},  # 🆕 Custom seasonal features
-            'dates': []
-        }
-        
         # Find holiday column name (different NeuralProphet versions use different names)
         # NeuralProphet combines all holidays into 'events_additive' column
         holiday_col = None
@@ -316,98 +485,18 @@ def extract_model_components(model_data):
         
         print(f"   🔍 Extracting regressors: Weather={len(weather_cols)}, Vaccination={len(vax_cols)}, Seasonal={len(seasonal_cols)}")
         
-        # 🆕 Initialize regressor arrays
-        for col in weather_cols:
-            components['weather_regressors'][col] = []
-        for col in vax_cols:
-            components['vaccination_regressors'][col] = []
-        for col in seasonal_cols:
-            components['seasonal_regressors'][col] = []
-        
         # 🔍 DEBUG: Check which regressor columns exist in forecast
         regressor_columns_found = [col for col in forecast_df.columns if 'future_regressor_' in col or 'season_' in col]
         if regressor_columns_found:
             print(f"   📊 Regressor columns in forecast: {regressor_columns_found[:10]}...")  # Show first 10
         
-        for i in range(len(df_components)):
-            date = df_components['ds'].iloc[i]
-            components['dates'].append(date.strftime('%Y-%m'))
-            
-            # Trend component (try different column names)
-            if 'trend' in forecast_df.columns:
-                components['trend'].append(round(float(forecast_df['trend'].iloc[i]), 2))
-            elif 'yhat1' in forecast_df.columns:
-                # If no explicit trend, use the prediction itself
-                components['trend'].append(round(float(forecast_df['yhat1'].iloc[i]), 2))
-            else:
-                components['trend'].append(0)
-            
-            # Yearly seasonality (if exists)
-            # NeuralProphet might use different naming conventions
-            season_col = None
-            for col in ['season_yearly', 'seasonal_yearly', 'yearly', 'seasonality']:
-                if col in forecast_df.columns:
-                    season_col = col
-                    break
-            
-            if season_col:
-                components['yearly_seasonality'].append(round(float(forecast_df[season_col].iloc[i]), 2))
-            else:
-                # If no seasonality component, it might be 0 or not configured
-                components['yearly_seasonality'].append(0)
-            
-            # Holiday effects (NEW!)
-            if holiday_col:
-                components['holidays'].append(round(float(forecast_df[holiday_col].iloc[i]), 2))
-            else:
-                components['holidays'].append(0)
-            
-            # 🆕 Extract WEATHER regressor contributions
-            # NeuralProphet stores regressor contributions as 'future_regressor_{regressor_name}'
-            for col in weather_cols:
-                regressor_col = f'future_regressor_{col}'
-                if regressor_col in forecast_df.columns:
-                    components['weather_regressors'][col].append(round(float(forecast_df[regressor_col].iloc[i]), 2))
-                else:
-                    # Try alternative naming: 'season_{col}'
-                    alt_col = f'season_{col}'
-                    if alt_col in forecast_df.columns:
-                        components['weather_regressors'][col].append(round(float(forecast_df[alt_col].iloc[i]), 2))
-                    else:
-                        components['weather_regressors'][col].append(0.0)
-            
-            # 🆕 Extract VACCINATION regressor contributions
-            for col in vax_cols:
-                regressor_col = f'future_regressor_{col}'
-                if regressor_col in forecast_df.columns:
-                    components['vaccination_regressors'][col].append(round(float(forecast_df[regressor_col].iloc[i]), 2))
-                else:
-                    # Try alternative naming
-                    alt_col = f'season_{col}'
-                    if alt_col in forecast_df.columns:
-                        components['vaccination_regressors'][col].append(round(float(forecast_df[alt_col].iloc[i]), 2))
-                    else:
-                        components['vaccination_regressors'][col].append(0.0)
-            
-            # 🆕 Extract SEASONAL regressor contributions
-            for col in seasonal_cols:
-                regressor_col = f'future_regressor_{col}'
-                if regressor_col in forecast_df.columns:
-                    components['seasonal_regressors'][col].append(round(float(forecast_df[regressor_col].iloc[i]), 2))
-                else:
-                    # Try alternative naming
-                    alt_col = f'season_{col}'
-                    if alt_col in forecast_df.columns:
-                        components['seasonal_regressors'][col].append(round(float(forecast_df[alt_col].iloc[i]), 2))
-                    else:
-                        components['seasonal_regressors'][col].append(0.0)
+        # Extract components (whole columns; column names resolved once)
+        components = extract_component_series(
+            forecast_df, df_components['ds'], holiday_col, weather_cols, vax_cols, seasonal_cols
+        )
         
         # XGBoost Feature Importance
-        feature_names = [
-            'Year', 'Month', 'lag_1', 'lag_2', 'rolling_mean_3',
-            'rolling_std_3', 'lag_12', 'month_sin', 'month_cos',
-            'rate_of_change_1', 'np_prediction'
-        ]
+        feature_names = XGB_FEATURE_NAMES
         
         importance_scores = xgb_model.feature_importances_
         feature_importance = [
@@ -437,34 +526,10 @@ def extract_model_components(model_data):
                         'value': trend_values[i]
                     })
         
-        # Identify significant holiday effects WITH NAMES
+        # Identify significant holiday effects WITH NAMES (strongest first)
         holiday_effects = []
         if components['holidays']:
-            holiday_values = np.array(components['holidays'])
-            
-            # Get all individual event columns to identify which holiday occurred on each date
-            event_columns = [col for col in forecast_df.columns if col.startswith('event_')]
-            
-            # Find dates where holiday effect is significant (non-zero or above threshold)
-            for i, effect in enumerate(holiday_values):
-                if abs(effect) > 0.1:  # Threshold for significant effect
-                    # Find which holiday(s) occurred on this date
-                    holiday_names = []
-                    for event_col in event_columns:
-                        if abs(forecast_df[event_col].iloc[i]) > 0.01:  # Holiday is active
-                            # Extract holiday name from column (e.g., 'event_New Year's Day' -> 'New Year's Day')
-                            holiday_name = event_col.replace('event_', '').replace('_', ' ')
-                            holiday_names.append(holiday_name)
-                    
-                    # Combine multiple holidays with " + " if multiple occur on same date
-                    holiday_label = ' + '.join(holiday_names) if holiday_names else 'Holiday'
-                    
-                    holiday_effects.append({
-                        'date': components['dates'][i],
-                        'holiday': holiday_label,
-                        'effect': round(float(effect), 2),
-                        'impact': 'Positive' if effect > 0 else 'Negative'
-                    })
+            holiday_effects = attribute_holiday_effects(forecast_df, components['holidays'], components['dates'])
         
         # Check if holidays are configured
         has_holidays = holiday_col is not None
@@ -474,7 +539,7 @@ def extract_model_components(model_data):
             'components': components,
             'feature_importance': feature_importance,
             'changepoints': changepoints[:10],  # Limit to top 10 changepoints
-            'holiday_effects': holiday_effects[:20],  # Top 20 significant holiday effects
+            'holiday_effects': holiday_effects,  # Top HOLIDAY_TOP_N significant holiday effects
             'has_holidays': has_holidays,
             'regressor_metadata': model_data.get('regressors', {}),  # 🆕 Regressor metadata
             'model_info': {
@@ -512,57 +577,68 @@ def extract_model_components(model_data):
         }
 
 
+def build_future_frame(model_data, dates):
+    """
+    NeuralProphet input frame for future dates, with every regressor the model was trained on.
+    """
+    future_df = pd.DataFrame({'ds': pd.DatetimeIndex(dates), 'y': [0] * len(dates)})
+    municipality = model_data.get('municipality', '')
+    
+    # 🆕 ADD WEATHER REGRESSORS (if model was trained with them)
+    weather_cols = model_data.get('regressors', {}).get('weather', [])
+    if weather_cols:
+        print(f"   🌤️ Adding {len(weather_cols)} weather regressors for future prediction")
+        # Use mean values from training data as defaults for future weather
+        # In production, you'd use actual weather forecasts or historical averages
+        for col in weather_cols:
+            future_df[col] = 0.0  # Neutral impact (you can replace with historical means)
+    
+    # 🆕 ADD VACCINATION REGRESSORS FOR ANTIPOLO (generate fresh using function)
+    if municipality == "CITY OF ANTIPOLO":
+        future_df = add_antipolo_vaccination_campaigns(future_df)
+        print(f"   💉 Added ALL 20 ANTIPOLO vaccination columns (guaranteed)")
+    
+    # ❌ REMOVED: CAINTA/ANGONO seasonal features (no longer used in new models)
+    # New models only use NeuralProphet's Fourier seasonality + holidays
+    # Only ANTIPOLO has custom regressors (vaccination campaigns)
+    return future_df
+
+
+def format_future_predictions(future_dates, hybrid_preds):
+    """[{'date': 'YYYY-MM', 'predicted': x.x}, ...] as returned by the forecast endpoints."""
+    return [
+        {
+            'date': future_date.strftime('%Y-%m'),
+            'predicted': round(float(hybrid_pred), 1)
+        }
+        for future_date, hybrid_pred in zip(future_dates, hybrid_preds)
+    ]
+
+
+def next_month_start(date):
+    """
+    First day of the month after `date`, on the models' month-start (MS) grid.
+    Month-end and mid-month anchors (e.g. training_end = 2024-12-31) map to the same
+    date as the month-start one (2025-01-01).
+    """
+    return pd.Timestamp(date).normalize() + pd.offsets.MonthBegin(1)
+
+
 def predict_next_month(model_data):
     """Predict next month using saved models."""
     try:
-        np_model = model_data['np_model']
-        xgb_model = model_data['xgb_model']
         training_end = model_data['training_end']
-        municipality = model_data.get('municipality', '')
-        
-        # Generate next month date
-        next_month = training_end + pd.DateOffset(months=1)
-        future_df = pd.DataFrame({'ds': [next_month], 'y': [0]})
-        
-        # 🆕 ADD WEATHER REGRESSORS (if model was trained with them)
-        weather_cols = model_data.get('regressors', {}).get('weather', [])
-        if weather_cols:
-            for col in weather_cols:
-                future_df[col] = 0.0  # Neutral weather impact
         
-        # 🆕 ADD VACCINATION REGRESSORS FOR ANTIPOLO (generate fresh using function)
-        if municipality == "CITY OF ANTIPOLO":
-            future_df = add_antipolo_vaccination_campaigns(future_df)
-            print(f"   💉 Added ALL 20 ANTIPOLO vaccination columns (guaranteed)")
-        
-        # ❌ REMOVED: CAINTA/ANGONO seasonal features (no longer used in new models)
-        # New models only use NeuralProphet's Fourier seasonality + holidays
-        # Only ANTIPOLO has custom regressors (vaccination campaigns)
+        # Generate next month date (snapped to the month-start grid)
+        next_month = next_month_start(training_end)
+        future_df = build_future_frame(model_data, [next_month])
         
         # Get NeuralProphet prediction
-        np_forecast = np_model.predict(future_df)
+        np_forecast = np_predict(model_data['np_model'], future_df)
         np_baseline = np_forecast['yhat1'].values[0]
         
-        # Prepare XGBoost features (EXACT order as training)
-        X_future = pd.DataFrame({
-            'Year': [next_month.year],
-            'Month': [next_month.month],
-            'lag_1': [0],
-            'lag_2': [0],
-            'rolling_mean_3': [0],
-            'rolling_std_3': [0],
-            'lag_12': [0],
-            'month_sin': [np.sin(2 * np.pi * next_month.month / 12)],
-            'month_cos': [np.cos(2 * np.pi * next_month.month / 12)],
-            'rate_of_change_1': [0],
-            'np_prediction': [np_baseline]
-        })
-        
-        # Get XGBoost correction
-        xgb_residual = xgb_model.predict(X_future)[0]
-        
-        # Hybrid prediction
-        hybrid_pred = max(0, np_baseline + xgb_residual)
+        # XGBoost correction + hybrid prediction (EXACT feature order as training)
+        hybrid_pred = score_hybrid(model_data['xgb_model'], [next_month], [np_baseline])[0]
         
         return hybrid_pred
     except Exception as e:
@@ -576,81 +652,201 @@ def predict_future_months(model_data, months_ahead=12):
     Returns list of predictions with dates.
     """
     try:
-        np_model = model_data['np_model']
-        xgb_model = model_data['xgb_model']
         validation_end = model_data.get('validation_end', model_data['training_end'])
-        municipality = model_data.get('municipality', '')
         
-        # Start predictions from validation end + 1 month
-        start_date = validation_end + pd.DateOffset(months=1)
+        # Start predictions from the month after validation end
+        start_date = next_month_start(validation_end)
         
         # Generate future dates TEMPLATE
         future_dates = pd.date_range(start=start_date, periods=months_ahead, freq='MS')
-        future_df = pd.DataFrame({'ds': future_dates, 'y': [0] * months_ahead})
-        
-        # 🆕 ADD WEATHER REGRESSORS (if model was trained with them)
-        weather_cols = model_data.get('regressors', {}).get('weather', [])
-        if weather_cols:
-            print(f"   🌤️ Adding {len(weather_cols)} weather regressors for future prediction")
-            # Use mean values from training data as defaults for future weather
-            # In production, you'd use actual weather forecasts or historical averages
-            for col in weather_cols:
-                future_df[col] = 0.0  # Neutral impact (you can replace with historical means)
-        
-        # 🆕 ADD VACCINATION REGRESSORS (if model was trained with them - ANTIPOLO only)
-        # 🆕 ADD VACCINATION REGRESSORS FOR ANTIPOLO (generate fresh using function)
-        if municipality == "CITY OF ANTIPOLO":
-            future_df = add_antipolo_vaccination_campaigns(future_df)
-            print(f"   💉 Added ALL 20 ANTIPOLO vaccination columns (guaranteed)")
-        
-        # ❌ REMOVED: CAINTA/ANGONO seasonal features (no longer used in new models)
-        # New models only use NeuralProphet's Fourier seasonality + holidays
-        # Only ANTIPOLO has custom regressors (vaccination campaigns)
+        future_df = build_future_frame(model_data, future_dates)
         
         # Get NeuralProphet predictions for all future dates
-        np_forecast = np_model.predict(future_df)
+        np_forecast = np_predict(model_data['np_model'], future_df)
         np_predictions = np_forecast['yhat1'].values
         
 
 
         # XGBOOST PHASE
-        # Prepare features for each future month
-        predictions = []
-        for i, future_date in enumerate(future_dates):
-            # Prepare XGBoost features
-            # ITO YUNG NASA FEATURE IMPORTANCE! so feed np_prediction here!
-            X_future = pd.DataFrame({
-                'Year': [future_date.year],
-                'Month': [future_date.month],
-                'lag_1': [0],  # In real scenario, use last prediction
-                'lag_2': [0],
-                'rolling_mean_3': [0],
-                'rolling_std_3': [0],
-                'lag_12': [0],
-                'month_sin': [np.sin(2 * np.pi * future_date.month / 12)],
-                'month_cos': [np.cos(2 * np.pi * future_date.month / 12)],
-                'rate_of_change_1': [0],
-                'np_prediction': [np_predictions[i]]
-            })
-            
-            # Get XGBoost correction
-            xgb_residual = xgb_model.predict(X_future)[0]
-            
-            # Hybrid prediction
-            hybrid_pred = max(0, float(np_predictions[i] + xgb_residual))
-            
-            predictions.append({
-                'date': future_date.strftime('%Y-%m'),
-                'predicted': round(hybrid_pred, 1)
-            })
+        # ITO YUNG NASA FEATURE IMPORTANCE! so feed np_prediction here!
+        # All future months are scored in one batched predict call
+        hybrid_preds = score_hybrid(model_data['xgb_model'], future_dates, np_predictions)
         
-        return predictions
+        return format_future_predictions(future_dates, hybrid_preds)
     except Exception as e:
         print(f"❌ Future prediction error: {e}")
         import traceback
         traceback.print_exc()
         return []
 
+
+def forecast_anchor_dates(training_end, validation_end, months_ahead):
+    """
+    (next_month, future_dates, frame_dates) for the two forecast anchors.
+    Both anchors are snapped to the month-start grid (next_month_start), so
+    frame_dates - the contiguous monthly range covering both - always contains them.
+    """
+    validation_end = validation_end if validation_end is not None else training_end
+    next_month = next_month_start(training_end)
+    future_dates = pd.date_range(start=next_month_start(validation_end), periods=months_ahead, freq='MS')
+    frame_dates = pd.date_range(start=min(next_month, future_dates[0]), end=future_dates[-1], freq='MS')
+    return next_month, future_dates, frame_dates
+
+
+def score_forecast_anchors(model_data, future_df, next_month, future_dates):
+    """
+    Hybrid next-month value and future path read out of one NeuralProphet predict over future_df.
+    Only yhat1 is needed, so components aren't computed (decompose=False).
+    """
+    np_forecast = np_predict(model_data['np_model'], future_df, decompose=False)
+    np_by_date = pd.Series(np_forecast['yhat1'].to_numpy(dtype=np.float64), index=pd.DatetimeIndex(np_forecast['ds']))
+    
+    # Row 0 = next month, rows 1.. = future path
+    wanted_dates = pd.DatetimeIndex([next_month]).append(future_dates)
+    np_predictions = np_by_date.reindex(wanted_dates).to_numpy()
+    if np.isnan(np_predictions).any():
+        raise ValueError("NeuralProphet forecast is missing anchor dates")
+    
+    hybrid_preds = score_hybrid(model_data['xgb_model'], wanted_dates, np_predictions)
+    return hybrid_preds[0], format_future_predictions(future_dates, hybrid_preds[1:])
+
+
+def predict_forecast_anchors(model_data, months_ahead=12, future_df=None, raise_errors=False):
+    """
+    Next-month prediction (from training_end) and the months_ahead path (from validation_end)
+    out of ONE NeuralProphet predict and ONE XGBoost predict.
+    
+    Both anchors go into a single contiguous monthly frame (NeuralProphet fills gaps in a
+    series anyway); each month is scored independently, so the values equal what
+    predict_next_month / predict_future_months return on their own.
+    
+    Args:
+        future_df: Optional prebuilt build_future_frame() for this model's anchor range
+                   (predict_forecast_batch shares one frame across models)
+        raise_errors: Re-raise a failed forecast instead of returning (None, [])
+    
+    Returns:
+        (next_month_prediction or None, future_predictions list)
+    """
+    try:
+        next_month, future_dates, frame_dates = forecast_anchor_dates(
+            model_data['training_end'], model_data.get('validation_end'), months_ahead
+        )
+        if future_df is not None:
+            try:
+                return score_forecast_anchors(model_data, future_df.copy(), next_month, future_dates)
+            except ValueError:
+                pass  # shared frame doesn't cover this model's anchors - build its own
+        return score_forecast_anchors(model_data, build_future_frame(model_data, frame_dates), next_month, future_dates)
+    except Exception as e:
+        print(f"❌ Forecast error: {e}")
+        import traceback
+        traceback.print_exc()
+        if raise_errors:
+            raise
+        return None, []
+
+
+# NeuralProphet / Lightning loggers muted while a batch runs ('py.warnings' carries the
+# pandas/Lightning deprecation warnings NeuralProphet routes into logging on every predict)
+QUIET_LOGGERS = [
+    'NP', 'neuralprophet', 'pytorch_lightning', 'lightning.pytorch', 'lightning_fabric', 'lightning.fabric',
+    'py.warnings'
+]
+
+
+@contextmanager
+def quiet_neuralprophet():
+    """
+    Raise NeuralProphet/Lightning log levels to ERROR and hide the per-predict progress
+    bar (np_predict on this thread) for the duration of a batch.
+    """
+    loggers = [logging.getLogger(name) for name in QUIET_LOGGERS]
+    previous = [logger.level for logger in loggers]
+    was_quiet = getattr(_NP_QUIET, 'active', False)
+    for logger in loggers:
+        logger.setLevel(logging.ERROR)
+    _NP_QUIET.active = True
+    try:
+        yield
+    finally:
+        _NP_QUIET.active = was_quiet
+        for logger, level in zip(loggers, previous):
+            logger.setLevel(level)
+
+
+def forecast_batch_group(meta, months_ahead):
+    """
+    Batch group of a model from its sidecar metadata: models with the same regressor
+    schema and the same anchor range get byte-identical future frames.
+    """
+    regressors = meta.get('regressors') or {}
+    schema = (tuple(regressors.get('weather', [])), meta.get('municipality') == "CITY OF ANTIPOLO")
+    try:
+        _, _, frame_dates = forecast_anchor_dates(meta['training_end'], meta.get('validation_end'), months_ahead)
+    except (KeyError, TypeError, ValueError):
+        frame_dates = None
+    return schema, (frame_dates[0], len(frame_dates)) if frame_dates is not None else None
+
+
+def predict_forecast_batch(keys, months_ahead=12, on_result=None, on_error=None):
+    """
+    predict_forecast_anchors() for many models, grouped so the fixed per-call costs are paid once per group.
+    
+    - models are grouped by regressor schema + anchor range (from sidecar metadata,
+      no unpickling) and each group's future frame is built once and shared
+    - NeuralProphet runs with decompose=False and its logging muted
+    - models are loaded one at a time, so the registry LRU bound still holds
+    
+    Each model is a separate network, so the NeuralProphet/XGBoost calls themselves
+    stay per model.
+    
+    Args:
+        keys: Model keys to score
+        on_result: Optional callback(key, model_data, next_month, predictions) run while
+                   the model is still loaded
+        on_error: Optional callback(key, error) for a model that failed to load or predict
+                  (its result is (None, []) and on_result is not called)
+    
+    Returns:
+        Dict key -> (next_month, predictions)
+    """
+    groups = {}
+    for key in keys:
+        groups.setdefault(forecast_batch_group(MODELS.metadata(key), months_ahead), []).append(key)
+    
+    results = {}
+    with quiet_neuralprophet():
+        for (schema, frame_key), members in groups.items():
+            shared_frame = None
+            for key in members:
+                try:
+                    model_data = MODELS[key]
+                except Exception as e:
+                    print(f"❌ Failed to load {key}: {e}")
+                    results[key] = (None, [])
+                    if on_error is not None:
+                        on_error(key, f"Failed to load model: {e}")
+                    continue
+                try:
+                    if shared_frame is None and frame_key is not None:
+                        _, _, frame_dates = forecast_anchor_dates(
+                            model_data['training_end'], model_data.get('validation_end'), months_ahead
+                        )
+                        shared_frame = build_future_frame(model_data, frame_dates)
+                    results[key] = predict_forecast_anchors(
+                        model_data, months_ahead=months_ahead, future_df=shared_frame, raise_errors=True
+                    )
+                except Exception as e:
+                    results[key] = (None, [])
+                    if on_error is not None:
+                        on_error(key, f"Forecast failed: {e}")
+                    continue
+                if on_result is not None:
+                    on_result(key, model_data, *results[key])
+    print(f"   ✓ Batched forecast: {len(results)} models in {len(groups)} frame groups")
+    return results
+
 # ==============================================
 # LOAD MODELS  Latest_FINALIZED_barangay_models_20251207_170009 STABLEST
 #Latest_FINALIZED_barangay_models_20251223_110351 == DO NOT HAVE FUTURE REGRESSORS (cainta/angono non)
@@ -665,58 +861,323 @@ FPM_MODEL_PATH = "rabies_weather_fpm_model.pkl"
 # Weather data CSV path for FPM analysis
 WEATHER_DATA_PATH = "../../CORRECT_rabies_weather_merged_V2_withmuncode.csv"
 
+# Max number of fully unpickled models kept in memory (least recently used are evicted)
+MODEL_CACHE_SIZE = int(os.getenv("MODEL_CACHE_SIZE", "16"))
+
+# Load every model at startup (production) instead of on first request
+WARM_MODELS = os.getenv("WARM_MODELS", "1" if os.getenv("ENV") == "production" else "0") == "1"
+
+# Score the whole model set into FORECAST_STORE at import, after the warm-up. Under gunicorn's
+# preload_app that is the master, so forked workers start with the store filled.
+BUILD_FORECAST_STORE = os.getenv("BUILD_FORECAST_STORE", "1" if WARM_MODELS else "0") == "1"
+
+# Sidecar index written inside MODEL_DIR (municipality/barangay per .pkl + file fingerprint)
+MODEL_INDEX_FILENAME = "model_index.json"
+MODEL_INDEX_VERSION = 3  # 3: training series for /api/barangay
+
 # Initialize MODELS as empty dict (required for caching check)
 MODELS = {}
 FPM_MODEL = None
 WEATHER_DF = None  # Global cache for weather data
 
+
+def import_model_libraries():
+    """Import the ML libraries the pickled models are built from (cached by Python after the first call)."""
+    import neuralprophet  # noqa: F401  (pulls in torch)
+    import xgboost  # noqa: F401
+
+
+def read_model_file(path):
+    """Unpickle a single barangay model bundle."""
+    import_model_libraries()
+    with open(path, 'rb') as f:
+        model_data = pickle.load(f)
+    
+    # 🆕 DEBUG: Print regressor metadata for ANTIPOLO
+    if model_data.get('municipality') == "CITY OF ANTIPOLO":
+        regressors = model_data.get('regressors', {})
+        print(f"   🔍 {model_data['barangay']}: Weather={len(regressors.get('weather', []))}, Vax={len(regressors.get('vaccination', []))}, Seasonal={len(regressors.get('seasonal', []))}")
+    
+    return model_data
+
+
+def summarize_model(model_data):
+    """
+    Lightweight JSON-serializable summary of a model bundle (stored in the sidecar index).
+    Enough for the listing, comparison and barangay detail endpoints without touching
+    NeuralProphet objects.
+    """
+    def to_float(value, default=0.0):
+        if hasattr(value, 'item'):  # numpy type
+            value = value.item()
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return default
+    
+    def first_metric(*names):
+        for name in names:
+            if name in model_data:
+                return to_float(model_data[name])
+        return 0.0
+    
+    def to_dates(values):
+        return [pd.Timestamp(d).strftime('%Y-%m-%d') for d in values]
+    
+    def to_date(value):
+        return pd.Timestamp(value).strftime('%Y-%m-%d') if value is not None else None
+    
+    train_dates = model_data.get('train_dates', [])
+    
+    return {
+        'mae': to_float(model_data.get('mae', 0)),
+        'metrics': {k: to_float(v, v) for k, v in (model_data.get('metrics') or {}).items()},
+        # Same fallback chain as /api/barangay (hybrid_* -> val_* -> plain)
+        'hybrid_metrics': {
+            'mae': first_metric('hybrid_mae', 'val_mae', 'mae'),
+            'rmse': first_metric('hybrid_rmse', 'val_rmse', 'rmse'),
+            'mape': first_metric('hybrid_mape', 'val_mape', 'mape'),
+            'r2': first_metric('hybrid_r2', 'val_r2', 'r2'),
+            'mase': first_metric('hybrid_mase', 'val_mase', 'mase')
+        },
+        'train_start': to_date(train_dates[0]) if len(train_dates) else None,
+        'training_end': to_date(model_data.get('training_end')),
+        'validation_end': to_date(model_data.get('validation_end', model_data.get('training_end'))),
+        'regressors': {k: list(v) for k, v in (model_data.get('regressors') or {}).items()},
+        'dates': to_dates(model_data.get('dates', [])),
+        'actuals': [to_float(v) for v in model_data.get('actuals', [])],
+        'predictions': [to_float(v) for v in model_data.get('predictions', [])],
+        'train_dates': to_dates(train_dates),
+        'train_actuals': [to_float(v) for v in model_data.get('train_actuals', [])],
+        'train_predictions': [to_float(v) for v in model_data.get('train_predictions', [])]
+    }
+
+
+class ModelRegistry(Mapping):
+    """
+    Dict-like access to the barangay models in MODEL_DIR, keyed "{municipality}_{barangay}".
+    
+    Startup only indexes the directory (file stats + the sidecar index). A model's
+    pickle is loaded on first access (once, even when several requests miss on it
+    together) and at most `max_resident` loaded models stay in memory (LRU eviction).
+    """
+    
+    def __init__(self, model_dir, max_resident=MODEL_CACHE_SIZE):
+        self.model_dir = model_dir
+        self.max_resident = max_resident
+        self._index = {}  # key -> {'path', 'mtime_ns', 'size', 'municipality', 'barangay', 'summary'}
+        self._resident = OrderedDict()  # key -> model_data (most recently used last)
+        self._lock = threading.RLock()
+        self._load_locks = {}  # key -> Lock held while that model's pickle is being read
+    
+    # ---------- Mapping interface ----------
+    
+    def __getitem__(self, key):
+        with self._lock:
+            model_data = self._resident_get(key)
+            if model_data is not None:
+                return model_data
+            entry = self._index[key]  # KeyError for unknown barangays
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+        
+        # Concurrent misses on one key wait for the first reader instead of unpickling a second copy
+        with load_lock:
+            with self._lock:
+                model_data = self._resident_get(key)
+            if model_data is None:
+                model_data = read_model_file(entry['path'])
+                self._remember(key, model_data)
+        return model_data
+    
+    def __iter__(self):
+        return iter(list(self._index))
+    
+    def __len__(self):
+        return len(self._index)
+    
+    def __contains__(self, key):
+        return key in self._index
+    
+    # ---------- Index ----------
+    
+    def index_path(self):
+        return os.path.join(self.model_dir, MODEL_INDEX_FILENAME)
+    
+    def iter_model_files(self):
+        """Yield (municipality_dir, .pkl path) for every model file in MODEL_DIR."""
+        for municipality_dir in sorted(os.listdir(self.model_dir)):
+            mun_path = os.path.join(self.model_dir, municipality_dir)
+            if os.path.isdir(mun_path):
+                for model_file in sorted(os.listdir(mun_path)):
+                    if model_file.endswith('.pkl'):
+                        yield municipality_dir, os.path.join(mun_path, model_file)
+    
+    def read_sidecar(self):
+        try:
+            with open(self.index_path(), 'r', encoding='utf-8') as f:
+                sidecar = json.load(f)
+            if sidecar.get('version') != MODEL_INDEX_VERSION:
+                return {}  # Older layout, rebuild
+            return sidecar.get('models', {})
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            print(f"⚠️ Ignoring unreadable model index ({e})")
+            return {}
+    
+    def write_sidecar(self, entries):
+        try:
+            with open(self.index_path(), 'w', encoding='utf-8') as f:
+                json.dump({'version': MODEL_INDEX_VERSION, 'models': entries}, f)
+        except OSError as e:
+            print(f"⚠️ Could not write model index ({e}), it will be rebuilt next start")
+    
+    def build_index(self):
+        """
+        Stat every .pkl and read its municipality/barangay/summary from the sidecar index.
+        Only files that are new or changed since the sidecar was written get unpickled.
+        """
+        sidecar = self.read_sidecar()
+        entries = {}
+        index = {}
+        refreshed = 0
+        
+        for _, path in self.iter_model_files():
+            rel_path = os.path.relpath(path, self.model_dir).replace(os.sep, '/')
+            stat = os.stat(path)
+            entry = sidecar.get(rel_path)
+            
+            if not entry or entry.get('mtime_ns') != stat.st_mtime_ns or entry.get('size') != stat.st_size:
+                try:
+                    model_data = read_model_file(path)
+                except Exception as e:
+                    print(f"⚠️ Failed to load {os.path.basename(path)}: {e}")
+                    continue
+                entry = {
+                    'mtime_ns': stat.st_mtime_ns,
+                    'size': stat.st_size,
+                    'municipality': str(model_data['municipality']),
+                    'barangay': str(model_data['barangay']),
+                    'summary': summarize_model(model_data)
+                }
+                refreshed += 1
+                self._remember(f"{entry['municipality']}_{entry['barangay']}", model_data)
+            
+            entries[rel_path] = entry
+            key = f"{entry['municipality']}_{entry['barangay']}"
+            index[key] = dict(entry, path=path)
+        
+        if refreshed or set(entries) != set(sidecar):
+            self.write_sidecar(entries)
+        
+        with self._lock:
+            self._index = index
+            for key in [k for k in self._resident if k not in index]:
+                del self._resident[key]
+        
+        print(f"✅ Indexed {len(index)} barangay models ({refreshed} read from pickle, rest from {MODEL_INDEX_FILENAME})\n")
+        return self
+    
+    # ---------- Warm-up ----------
+    
+    def warm(self):
+        """
+        Load every indexed model, one after the other. Residency becomes unbounded (the
+        whole set is meant to stay warm). Returns a summary with per-file load times and failures.
+        
+        Sequential on purpose: unpickling holds the GIL, so loader threads only overlap file
+        reads and measured slower, and a process pool would have to pickle every model back
+        into this process. Cores pay off in precompute_forecasts.py instead.
+        """
+        with self._lock:
+            self.max_resident = 0
+            items = [(key, entry['path']) for key, entry in self._index.items()]
+        
+        print(f"🔥 Warming {len(items)} models...")
+        
+        started = time.perf_counter()
+        files = []
+        for key, path in items:
+            file_started = time.perf_counter()
+            try:
+                self._remember(key, read_model_file(path))
+                files.append({'key': key, 'path': path, 'ok': True, 'error': None,
+                              'seconds': round(time.perf_counter() - file_started, 3)})
+            except Exception as e:
+                files.append({'key': key, 'path': path, 'ok': False, 'error': str(e),
+                              'seconds': round(time.perf_counter() - file_started, 3)})
+        
+        failed = [f for f in files if not f['ok']]
+        summary = {
+            'total_seconds': round(time.perf_counter() - started, 3),
+            'loaded': len(files) - len(failed),
+            'failed': len(failed),
+            'slowest': sorted(files, key=lambda f: f['seconds'], reverse=True)[:5],
+            'failures': failed,
+            'files': files
+        }
+        
+        print(f"✅ Warmed {summary['loaded']} models in {summary['total_seconds']}s ({summary['failed']} failed)")
+        for f in failed:
+            print(f"   ⚠️ {os.path.basename(f['path'])}: {f['error']}")
+        print()
+        return summary
+    
+    # ---------- Helpers ----------
+    
+    def metadata(self, key):
+        """Sidecar summary of a model (metrics, date range, regressors, validation arrays)."""
+        entry = self._index[key]
+        return dict(entry['summary'], municipality=entry['municipality'], barangay=entry['barangay'])
+    
+    def model_path(self, key):
+        entry = self._index.get(key)
+        return entry['path'] if entry else None
+    
+    def resident_count(self):
+        return len(self._resident)
+    
+    def _resident_get(self, key):
+        """Loaded model for a key (marked most recently used), None if not resident. Call with _lock held."""
+        model_data = self._resident.get(key)
+        if model_data is not None:
+            self._resident.move_to_end(key)
+        return model_data
+    
+    def _remember(self, key, model_data):
+        with self._lock:
+            self._resident[key] = model_data
+            self._resident.move_to_end(key)
+            while self.max_resident and len(self._resident) > self.max_resident:
+                self._resident.popitem(last=False)
+
+
 def load_all_models():
-    """Load all barangay models with caching."""
+    """Index all barangay models (pickles are loaded lazily on first request)."""
     global MODELS
     
-    # Check if models already loaded (prevents duplicate loading)
+    # Check if models already indexed (prevents duplicate loading)
     if MODELS:
         print("✅ Models already in memory, skipping reload...")
         return MODELS
     
-    models = {}
+    registry = ModelRegistry(MODEL_DIR)
     
     if not os.path.exists(MODEL_DIR):
         print(f"❌ Model directory not found: {MODEL_DIR}")
-        return models
-    
-    print(f"📂 Loading models from: {MODEL_DIR}")
-    
-    for municipality_dir in os.listdir(MODEL_DIR):
-        mun_path = os.path.join(MODEL_DIR, municipality_dir)
-        
-        if os.path.isdir(mun_path):
-            for model_file in os.listdir(mun_path):
-                if model_file.endswith('.pkl'):
-                    try:
-                        with open(os.path.join(mun_path, model_file), 'rb') as f:
-                            model_data = pickle.load(f)
-                            
-                            municipality = model_data['municipality']
-                            barangay = model_data['barangay']
-                            key = f"{municipality}_{barangay}"
-                            
-                            # 🆕 DEBUG: Print regressor metadata for ANTIPOLO
-                            if municipality == "CITY OF ANTIPOLO":
-                                regressors = model_data.get('regressors', {})
-                                print(f"   🔍 {barangay}: Weather={len(regressors.get('weather', []))}, Vax={len(regressors.get('vaccination', []))}, Seasonal={len(regressors.get('seasonal', []))}")
-                            
-                            models[key] = model_data
-                            
-                    except Exception as e:
-                        print(f"⚠️ Failed to load {model_file}: {e}")
-    
-    print(f"✅ Loaded {len(models)} barangay models\n")
-    return models
-
-# Load models on startup
+        return registry
+    
+    print(f"📂 Indexing models in: {MODEL_DIR} (max {MODEL_CACHE_SIZE} resident)")
+    return registry.build_index()
+
+# Index models on startup
 MODELS = load_all_models()
 
+# Production: load the whole model set up front
+MODEL_WARMUP_SUMMARY = None
+if WARM_MODELS and len(MODELS) > 0:
+    MODEL_WARMUP_SUMMARY = MODELS.warm()
+
 # Load FPM model
 def load_fpm_model():
     """Load Frequent Pattern Mining model for weather-rabies insights."""
@@ -740,20 +1201,203 @@ def load_fpm_model():
 
 FPM_MODEL = load_fpm_model()
 
-# Load weather data for FPM analysis
-def load_weather_data():
-    """Load weather data CSV with caching."""
-    global WEATHER_DF
+# Columnar on-disk cache of the aggregated monthly weather frame
+# (one .npy per column, memory-mapped on later starts instead of reparsing the CSV)
+WEATHER_CACHE_DIR = os.getenv("WEATHER_CACHE_DIR", "weather_cache")
+WEATHER_CACHE_MANIFEST = "manifest.json"
+
+
+def get_source_signature(path):
+    """Size + mtime of the source CSV (the content hash is only computed when those change)."""
+    stat = os.stat(path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def hash_file(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_weather_cache(source_path):
+    """Return the cached monthly weather frame if it was built from this exact CSV, else None."""
+    manifest_path = os.path.join(WEATHER_CACHE_DIR, WEATHER_CACHE_MANIFEST)
+    if not os.path.exists(manifest_path):
+        return None
     
-    print(f"🔍 load_weather_data() called...")
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        
+        signature = get_source_signature(source_path)
+        cached = manifest['source']
+        if (cached['size'], cached['mtime_ns']) != (signature['size'], signature['mtime_ns']):
+            # File touched/copied - still valid if the content is identical
+            if cached['size'] != signature['size'] or cached.get('sha256') != hash_file(source_path):
+                return None
+            manifest['source'].update(signature)
+            with open(manifest_path, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f)
+        
+        columns = {}
+        for col in manifest['columns']:
+            values = np.load(os.path.join(WEATHER_CACHE_DIR, col['file']), mmap_mode='r')
+            columns[col['name']] = values.astype(object) if col['dtype'] == 'object' else values
+        
+        return pd.DataFrame(columns, copy=False)
+    except Exception as e:
+        print(f"   ⚠️ Ignoring weather cache ({e})")
+        return None
+
+
+def save_weather_cache(df, source_path):
+    """Persist the monthly weather frame column by column (manifest written last)."""
+    try:
+        os.makedirs(WEATHER_CACHE_DIR, exist_ok=True)
+        columns = []
+        for i, name in enumerate(df.columns):
+            values = df[name].to_numpy()
+            dtype = 'object' if values.dtype == object else str(values.dtype)
+            if dtype == 'object':
+                values = values.astype(str)  # fixed-width unicode can be memory-mapped
+            file_name = f"col{i}.npy"
+            np.save(os.path.join(WEATHER_CACHE_DIR, file_name), values)
+            columns.append({'name': name, 'file': file_name, 'dtype': dtype})
+        
+        manifest = {
+            'source': dict(get_source_signature(source_path), path=os.path.abspath(source_path), sha256=hash_file(source_path)),
+            'rows': len(df),
+            'columns': columns
+        }
+        tmp_path = os.path.join(WEATHER_CACHE_DIR, WEATHER_CACHE_MANIFEST + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, os.path.join(WEATHER_CACHE_DIR, WEATHER_CACHE_MANIFEST))
+        print(f"   ✓ Saved monthly weather cache to {WEATHER_CACHE_DIR}/")
+    except Exception as e:
+        print(f"   ⚠️ Could not write weather cache ({e})")
+
+
+# Monthly weather features used by the FPM analysis
+WEATHER_FEATURES = ['tmean_c', 'rh_pct', 'precip_mm', 'wind_speed_10m_max_kmh', 'sunshine_hours']
+
+WEATHER_BY_MONTH = None  # DATE -> mean weather across all barangays (+ 'records' count)
+WEATHER_BY_BARANGAY = None  # (MUN_CODE, BGY_CODE, DATE) -> weather of that barangay
+
+
+def build_weather_lookup_tables(weather_df):
+    """Precompute date-indexed weather tables once, right after the weather data loads."""
+    global WEATHER_BY_MONTH, WEATHER_BY_BARANGAY
     
-    if WEATHER_DF is not None:
-        print(f"   ✓ Already cached: {len(WEATHER_DF)} records")
-        return WEATHER_DF
+    WEATHER_BY_MONTH = monthly_regional_weather(weather_df)
+    WEATHER_BY_BARANGAY = weather_df.set_index(['MUN_CODE', 'BGY_CODE', 'DATE'])[WEATHER_FEATURES].sort_index()
+    print(f"   ✓ Weather lookup tables: {len(WEATHER_BY_MONTH)} months, {len(WEATHER_BY_BARANGAY)} barangay-months")
+
+
+def monthly_regional_weather(weather_df):
+    """Mean weather across all barangays per month, indexed by DATE."""
+    grouped = weather_df.groupby('DATE')
+    table = grouped[WEATHER_FEATURES].mean()
+    table['records'] = grouped.size()
+    return table.sort_index()
+
+
+# ---------- Barangay name -> weather code mapping ----------
+# MUN_CODE/BGY_CODE in the weather CSV hold place names ("CITY OF ANTIPOLO", "San Roque (Pob.)")
+# that don't always match the model's names exactly, so both sides are normalized.
+WEATHER_CODES_FILENAME = "weather_codes.json"  # persisted inside MODEL_DIR
+
+WEATHER_CODE_INDEX = {}  # (normalized municipality, normalized barangay) -> (MUN_CODE, BGY_CODE)
+MODEL_WEATHER_CODES = {}  # model key -> (MUN_CODE, BGY_CODE) or None
+
+
+def normalize_place_name(name):
+    """Normalize a municipality/barangay name: case, underscores, "(Pob.)" suffix, ñ -> n."""
+    name = unicodedata.normalize('NFKD', str(name)).encode('ascii', 'ignore').decode('ascii')
+    name = name.replace('_', ' ').lower()
+    name = re.sub(r'\(\s*pob\.?\s*\)|\bpoblacion\b', ' ', name)
+    name = re.sub(r'[^a-z0-9]+', ' ', name)
+    return ' '.join(name.split())
+
+
+def build_weather_code_index(weather_df):
+    """Index every (MUN_CODE, BGY_CODE) pair in the weather data by normalized names."""
+    global WEATHER_CODE_INDEX
     
-    try:
+    index = {}
+    pairs = weather_df[['MUN_CODE', 'BGY_CODE']].drop_duplicates().itertuples(index=False)
+    for mun_code, bgy_code in pairs:
+        index.setdefault((normalize_place_name(mun_code), normalize_place_name(bgy_code)), (mun_code, bgy_code))
+    
+    WEATHER_CODE_INDEX = index
+    return index
+
+
+def get_weather_codes(municipality, barangay):
+    """(MUN_CODE, BGY_CODE) of a barangay in the weather data, or None if it has no match."""
+    return WEATHER_CODE_INDEX.get((normalize_place_name(municipality), normalize_place_name(barangay)))
+
+
+def map_models_to_weather_codes():
+    """
+    Resolve weather codes for every indexed model and persist them next to the models
+    (MODEL_DIR/weather_codes.json) so other tools can reuse the mapping.
+    """
+    global MODEL_WEATHER_CODES
+    
+    codes = {}
+    for key in MODELS:
+        meta = MODELS.metadata(key)
+        codes[key] = get_weather_codes(meta['municipality'], meta['barangay'])
+    MODEL_WEATHER_CODES = codes
+    
+    unmatched = [key for key, value in codes.items() if value is None]
+    print(f"   ✓ Weather codes mapped for {len(codes) - len(unmatched)}/{len(codes)} models")
+    for key in unmatched:
+        print(f"      ⚠️ No weather series for {key} (will use regional average)")
+    
+    if os.path.isdir(MODEL_DIR):
+        try:
+            with open(os.path.join(MODEL_DIR, WEATHER_CODES_FILENAME), 'w', encoding='utf-8') as f:
+                json.dump({key: list(value) if value else None for key, value in codes.items()}, f, indent=1, ensure_ascii=False)
+        except OSError as e:
+            print(f"      ⚠️ Could not write {WEATHER_CODES_FILENAME} ({e})")
+    return codes
+
+
+def get_barangay_weather(municipality, barangay):
+    """Monthly weather series (indexed by DATE) of one barangay, or None if unmapped."""
+    codes = get_weather_codes(municipality, barangay)
+    if codes is None or WEATHER_BY_BARANGAY is None:
+        return None
+    try:
+        return WEATHER_BY_BARANGAY.loc[codes]
+    except KeyError:
+        return None
+
+
+# Load weather data for FPM analysis
+def load_weather_data():
+    """Load weather data CSV with caching."""
+    global WEATHER_DF
+    
+    print(f"🔍 load_weather_data() called...")
+    
+    if WEATHER_DF is not None:
+        print(f"   ✓ Already cached: {len(WEATHER_DF)} records")
+        return WEATHER_DF
+    
+    try:
         print(f"   Checking path: {WEATHER_DATA_PATH}")
         if os.path.exists(WEATHER_DATA_PATH):
+            df_monthly = load_weather_cache(WEATHER_DATA_PATH)
+            if df_monthly is not None:
+                WEATHER_DF = df_monthly
+                print(f"✓ Loaded {len(df_monthly)} monthly weather records from cache")
+                return df_monthly
+            
             print(f"   ✓ File exists! Loading CSV...")
             df = pd.read_csv(WEATHER_DATA_PATH)
             
@@ -776,6 +1420,8 @@ def load_weather_data():
                 'RAB_ANIMBITE_TOTAL': 'sum'
             }).reset_index()
             
+            save_weather_cache(df_monthly, WEATHER_DATA_PATH)
+            
             WEATHER_DF = df_monthly
             print(f"✓ Loaded {len(df_monthly)} monthly weather records")
             return df_monthly
@@ -792,6 +1438,9 @@ print("="*60)
 WEATHER_DF = load_weather_data()
 if WEATHER_DF is not None:
     print(f"✅ Weather data loaded successfully: {len(WEATHER_DF)} records")
+    build_weather_lookup_tables(WEATHER_DF)
+    build_weather_code_index(WEATHER_DF)
+    map_models_to_weather_codes()
 else:
     print(f"❌ Weather data failed to load! Check path: {WEATHER_DATA_PATH}")
 print("="*60 + "\n")
@@ -800,6 +1449,54 @@ print("="*60 + "\n")
 # WEATHER-RABIES PATTERN ANALYSIS (FPM)
 # ==============================================
 
+# FPM category -> (weather column, default value when missing)
+FPM_CATEGORY_COLUMNS = {
+    'temperature': ('tmean_c', 27),
+    'humidity': ('rh_pct', 80),
+    'precipitation': ('precip_mm', 200),
+    'wind': ('wind_speed_10m_max_kmh', 12),
+    'sunshine': ('sunshine_hours', 150)
+}
+
+
+def categorize_weather_batch(weather, fpm_model):
+    """
+    Categorize many months of weather at once using FPM thresholds.
+    
+    Same binning as pd.cut(bins, labels) (right-closed intervals, out-of-range -> 'nan'),
+    done with one np.searchsorted per feature.
+    
+    Args:
+        weather: DataFrame (or dict of arrays) with tmean_c, rh_pct, precip_mm,
+                 wind_speed_10m_max_kmh, sunshine_hours
+        fpm_model: Loaded FPM model with thresholds
+    
+    Returns:
+        DataFrame with temperature, humidity, precipitation, wind, sunshine and
+        pattern_string columns (same index as a DataFrame input)
+    """
+    thresholds = fpm_model['thresholds']
+    index = weather.index if isinstance(weather, pd.DataFrame) else None
+    n_rows = len(weather) if index is not None else len(next(iter(weather.values()), []))
+    
+    categories = {}
+    for category, (column, default) in FPM_CATEGORY_COLUMNS.items():
+        values = np.asarray(weather[column], dtype=np.float64) if column in weather else np.full(n_rows, default, dtype=np.float64)
+        bins = np.asarray(thresholds[category]['bins'], dtype=np.float64)
+        labels = np.array(list(thresholds[category]['labels']) + ['nan'], dtype=object)
+        
+        # searchsorted(side='left') finds i with bins[i-1] < x <= bins[i]  ->  label i-1
+        codes = np.searchsorted(bins, values, side='left') - 1
+        codes[(codes < 0) | (codes >= len(bins) - 1) | np.isnan(values)] = -1  # -1 -> 'nan'
+        categories[category] = labels[codes]
+    
+    result = pd.DataFrame(categories, index=index)
+    result['pattern_string'] = (
+        "Humidity: " + result['humidity'] + ", Wind: " + result['wind'] + ", Rain: " + result['precipitation']
+    )
+    return result
+
+
 def categorize_weather_for_fpm(weather_data, fpm_model):
     """
     Categorize weather data using FPM thresholds.
@@ -815,47 +1512,329 @@ def categorize_weather_for_fpm(weather_data, fpm_model):
         return None
     
     try:
-        # Get thresholds from model
-        thresholds = fpm_model['thresholds']
-        
-        # Categorize temperature
-        temp = pd.cut([weather_data.get('tmean_c', 27)], 
-                      bins=thresholds['temperature']['bins'],
-                      labels=thresholds['temperature']['labels'])[0]
-        
-        # Categorize humidity
-        humidity = pd.cut([weather_data.get('rh_pct', 80)], 
-                         bins=thresholds['humidity']['bins'],
-                         labels=thresholds['humidity']['labels'])[0]
-        
-        # Categorize precipitation
-        precip = pd.cut([weather_data.get('precip_mm', 200)], 
-                       bins=thresholds['precipitation']['bins'],
-                       labels=thresholds['precipitation']['labels'])[0]
-        
-        # Categorize wind speed
-        wind = pd.cut([weather_data.get('wind_speed_10m_max_kmh', 12)], 
-                     bins=thresholds['wind']['bins'],
-                     labels=thresholds['wind']['labels'])[0]
-        
-        # Categorize sunshine
-        sunshine = pd.cut([weather_data.get('sunshine_hours', 150)], 
-                         bins=thresholds['sunshine']['bins'],
-                         labels=thresholds['sunshine']['labels'])[0]
-        
-        return {
-            'temperature': str(temp),
-            'humidity': str(humidity),
-            'precipitation': str(precip),
-            'wind': str(wind),
-            'sunshine': str(sunshine),
-            'pattern_string': f"Humidity: {humidity}, Wind: {wind}, Rain: {precip}"
-        }
+        single_month = {col: [weather_data.get(col, default)] for col, default in FPM_CATEGORY_COLUMNS.values()}
+        return categorize_weather_batch(single_month, fpm_model).iloc[0].to_dict()
     except Exception as e:
         print(f"❌ Weather categorization error: {e}")
         return None
 
 
+# ==============================================
+# FPM RULE MATCHING (itemset bitsets)
+# ==============================================
+# Rule items look like 'humidity=Very_High_Humidity'; the categorizer uses the long names
+FPM_ITEM_PREFIXES = {
+    'temperature': 'temp',
+    'humidity': 'humidity',
+    'precipitation': 'rain',
+    'wind': 'wind',
+    'sunshine': 'sunshine'
+}
+FPM_RISK_BY_CASES = {
+    'Very_High_Cases': 'HIGH',
+    'High_Cases': 'HIGH',
+    'Medium_Cases': 'MEDIUM',
+    'Low_Cases': 'LOW',
+    'No_Cases': 'LOW'
+}
+FPM_MIN_RISK_LIFT = 1.5  # strongest matched rule must beat this, otherwise MEDIUM (no strong pattern)
+
+
+def fpm_rule_risk(consequents):
+    """Risk level implied by the rabies=... item of a rule's consequent (None if there isn't one)."""
+    for item in consequents:
+        prefix, _, value = str(item).partition('=')
+        if prefix == 'rabies':
+            return FPM_RISK_BY_CASES.get(value)
+    return None
+
+
+def build_fpm_rule_index(fpm_model):
+    """
+    Compile the FPM weather->rabies rules into antecedent bitmasks.
+
+    Every distinct antecedent item gets one bit, so a month satisfies a rule when
+    (rule_mask & month_mask) == rule_mask. Rules are stored sorted by lift, so
+    matches come out already ranked.
+
+    Returns:
+        Dict index, or None if the model has no rabies_rules table
+    """
+    rules = fpm_model.get('rabies_rules') if fpm_model else None
+    if rules is None or len(rules) == 0:
+        return None
+
+    rules = rules.sort_values(['lift', 'confidence'], ascending=False, kind='mergesort')
+    item_bits = {}
+    masks, antecedents, consequents, risks = [], [], [], []
+    for antecedent, consequent in zip(rules['antecedents'], rules['consequents']):
+        items = tuple(sorted(str(item) for item in antecedent))
+        mask = 0
+        for item in items:
+            mask |= 1 << item_bits.setdefault(item, len(item_bits))
+        masks.append(mask)
+        antecedents.append(items)
+        consequents.append(tuple(sorted(str(item) for item in consequent)))
+        risks.append(fpm_rule_risk(consequent))
+
+    # uint64 covers the 5 features x ~4 categories we have; wider vocabularies fall back to Python ints
+    mask_dtype = np.uint64 if len(item_bits) <= 64 else object
+    index = {
+        'item_bits': item_bits,
+        'masks': np.array(masks, dtype=mask_dtype),
+        'antecedents': antecedents,
+        'consequents': consequents,
+        'risk': risks,
+        'support': rules['support'].to_numpy(dtype=np.float64),
+        'confidence': rules['confidence'].to_numpy(dtype=np.float64),
+        'lift': rules['lift'].to_numpy(dtype=np.float64),
+        'matches': {}  # month mask -> matched rule positions (at most one entry per category combination)
+    }
+    print(f"✅ Indexed {len(masks)} FPM rules over {len(item_bits)} weather items")
+    return index
+
+
+FPM_RULE_INDEX = build_fpm_rule_index(FPM_MODEL)
+
+
+def encode_fpm_month(categorized, rule_index):
+    """Bitmask of the rule items present in one categorized month."""
+    item_bits = rule_index['item_bits']
+    mask = 0
+    for category, prefix in FPM_ITEM_PREFIXES.items():
+        bit = item_bits.get(f"{prefix}={categorized.get(category)}")
+        if bit is not None:
+            mask |= 1 << bit
+    return mask
+
+
+def encode_fpm_months(categories, rule_index):
+    """Vectorized encode_fpm_month for a categorize_weather_batch() frame."""
+    item_bits = rule_index['item_bits']
+    mask_dtype = rule_index['masks'].dtype
+    masks = np.zeros(len(categories), dtype=mask_dtype)
+    for category, prefix in FPM_ITEM_PREFIXES.items():
+        labels, values = [], []
+        for item, bit in item_bits.items():
+            item_prefix, _, label = item.partition('=')
+            if item_prefix == prefix:
+                labels.append(label)
+                values.append(1 << bit)
+        if not labels:
+            continue
+        # get_indexer -> -1 for labels no rule mentions, which picks the trailing 0
+        lookup = np.array(values + [0], dtype=mask_dtype)
+        masks = masks | lookup[pd.Index(labels).get_indexer(categories[category])]
+    return masks
+
+
+def matched_rule_positions(month_mask, rule_index):
+    """Positions of every rule satisfied by month_mask, highest lift first (memoized per mask)."""
+    month_mask = int(month_mask)
+    positions = rule_index['matches'].get(month_mask)
+    if positions is None:
+        masks = rule_index['masks']
+        key = np.uint64(month_mask) if masks.dtype == np.uint64 else month_mask
+        positions = np.flatnonzero((masks & key) == masks)
+        rule_index['matches'][month_mask] = positions
+    return positions
+
+
+def fpm_rule_record(rule_index, position):
+    """JSON-safe view of one indexed rule."""
+    return {
+        'antecedents': list(rule_index['antecedents'][position]),
+        'consequents': list(rule_index['consequents'][position]),
+        'risk': rule_index['risk'][position],
+        'support': round(float(rule_index['support'][position]), 4),
+        'confidence': round(float(rule_index['confidence'][position]), 4),
+        'lift': round(float(rule_index['lift'][position]), 4)
+    }
+
+
+def match_fpm_rules(categorized, rule_index=None, top_n=None):
+    """
+    Every FPM rule whose antecedent is satisfied by a categorized month, ranked by lift.
+
+    Args:
+        categorized: Dict from categorize_weather_for_fpm (temperature, humidity, ...)
+        rule_index: Index from build_fpm_rule_index (defaults to the loaded model's)
+        top_n: Optional cap on the number of rules returned
+
+    Returns:
+        List of rule dicts (antecedents, consequents, risk, support, confidence, lift)
+    """
+    rule_index = rule_index if rule_index is not None else FPM_RULE_INDEX
+    if rule_index is None:
+        return []
+    positions = matched_rule_positions(encode_fpm_month(categorized, rule_index), rule_index)
+    if top_n is not None:
+        positions = positions[:top_n]
+    return [fpm_rule_record(rule_index, position) for position in positions]
+
+
+def assess_fpm_risk(categorized, rule_index=None):
+    """
+    Risk level for one categorized month from the strongest matching rule.
+
+    Returns:
+        (risk_level, top_rule or None, matched_rules); top_rule is None when nothing
+        with a risk consequent reaches FPM_MIN_RISK_LIFT, which reads as MEDIUM
+    """
+    matches = match_fpm_rules(categorized, rule_index)
+    top_rule = next((rule for rule in matches if rule['risk'] is not None), None)
+    if top_rule is None or top_rule['lift'] < FPM_MIN_RISK_LIFT:
+        return 'MEDIUM', None, matches
+    return top_rule['risk'], top_rule, matches
+
+
+# ---------- Province-wide risk scan ----------
+FPM_SCAN_COLUMNS = ['MUN_CODE', 'BGY_CODE', 'month', 'risk', 'top_rule', 'lift', 'confidence']
+FPM_RISK_SCAN = None  # (weather frame, fpm model, result) for the loaded WEATHER_DF/FPM_MODEL
+_FPM_SCAN_LOCK = threading.Lock()
+
+
+def scan_fpm_risk(weather_df, fpm_model, rule_index=None):
+    """
+    FPM risk for every barangay-month in the monthly weather table.
+
+    Categorizes the whole table in one vectorized pass, encodes each row as an
+    itemset bitmask, and runs the rule matcher once per distinct mask (a few
+    hundred at most) instead of once per row.
+
+    Returns:
+        DataFrame with FPM_SCAN_COLUMNS, one row per barangay-month
+    """
+    rule_index = rule_index if rule_index is not None else build_fpm_rule_index(fpm_model)
+    if rule_index is None:
+        raise ValueError("FPM model has no rabies_rules table to match against")
+
+    categories = categorize_weather_batch(weather_df, fpm_model)
+    masks = encode_fpm_months(categories, rule_index)
+    unique_masks, inverse = np.unique(masks, return_inverse=True)
+
+    risks = np.full(len(unique_masks), 'MEDIUM', dtype=object)
+    top_rules = np.full(len(unique_masks), None, dtype=object)
+    lifts = np.full(len(unique_masks), np.nan)
+    confidences = np.full(len(unique_masks), np.nan)
+    for i, mask in enumerate(unique_masks):
+        positions = matched_rule_positions(mask, rule_index)
+        position = next((p for p in positions if rule_index['risk'][p] is not None), None)
+        if position is None or rule_index['lift'][position] < FPM_MIN_RISK_LIFT:
+            continue
+        risks[i] = rule_index['risk'][position]
+        top_rules[i] = ' + '.join(rule_index['antecedents'][position])
+        lifts[i] = round(float(rule_index['lift'][position]), 4)
+        confidences[i] = round(float(rule_index['confidence'][position]), 4)
+
+    return pd.DataFrame({
+        'MUN_CODE': weather_df['MUN_CODE'].to_numpy(),
+        'BGY_CODE': weather_df['BGY_CODE'].to_numpy(),
+        'month': pd.to_datetime(weather_df['DATE']).dt.strftime('%Y-%m').to_numpy(),
+        'risk': risks[inverse],
+        'top_rule': top_rules[inverse],
+        'lift': lifts[inverse],
+        'confidence': confidences[inverse]
+    }, columns=FPM_SCAN_COLUMNS)
+
+
+def get_fpm_risk_scan():
+    """Province-wide scan of the loaded weather data, computed once and reused."""
+    global FPM_RISK_SCAN
+
+    if WEATHER_DF is None or FPM_MODEL is None:
+        return None
+    with _FPM_SCAN_LOCK:
+        if FPM_RISK_SCAN is None or FPM_RISK_SCAN[0] is not WEATHER_DF or FPM_RISK_SCAN[1] is not FPM_MODEL:
+            started = time.perf_counter()
+            result = scan_fpm_risk(WEATHER_DF, FPM_MODEL, FPM_RULE_INDEX)
+            FPM_RISK_SCAN = (WEATHER_DF, FPM_MODEL, result)
+            print(f"✅ FPM risk scan: {len(result)} barangay-months in {time.perf_counter() - started:.2f}s")
+        return FPM_RISK_SCAN[2]
+
+
+def match_place_codes(codes, name):
+    """Boolean mask of the rows whose place code normalizes to the same name (each distinct code normalized once)."""
+    target = normalize_place_name(name)
+    matching = [code for code in pd.unique(codes) if normalize_place_name(code) == target]
+    return codes.isin(matching).to_numpy()
+
+
+def filter_fpm_risk_scan(scan, risk=None, municipality=None, barangay=None, start=None, end=None):
+    """Subset a scan by risk level, place (normalized names) and YYYY-MM month range."""
+    mask = np.ones(len(scan), dtype=bool)
+    if risk:
+        mask &= scan['risk'].isin([level.strip().upper() for level in risk.split(',')]).to_numpy()
+    if municipality:
+        mask &= match_place_codes(scan['MUN_CODE'], municipality)
+    if barangay:
+        mask &= match_place_codes(scan['BGY_CODE'], barangay)
+    if start:
+        mask &= (scan['month'] >= start).to_numpy()
+    if end:
+        mask &= (scan['month'] <= end).to_numpy()
+    return scan[mask]
+
+
+def fpm_rule_pattern(rule):
+    """Pattern dict (conditions, items, confidence, lift) of one matched FPM rule."""
+    return {
+        'conditions': ' + '.join(rule['antecedents']),
+        'items': list(rule['antecedents']),
+        'confidence': rule['confidence'],
+        'lift': rule['lift']
+    }
+
+
+def describe_fpm_item(item):
+    """'humidity=Very_High_Humidity' -> 'Humidity: Very High Humidity'."""
+    prefix, _, value = str(item).strip().partition('=')
+    if not value:
+        return prefix.replace('_', ' ')
+    return f"{prefix.replace('_', ' ').title()}: {value.replace('_', ' ')}"
+
+
+def fpm_pattern_items(pattern):
+    """
+    Antecedent items of a pattern: 'items' if present, else 'conditions' - a list/set in
+    older FPM pickles, an 'a + b' string otherwise.
+    """
+    if pattern.get('items'):
+        return list(pattern['items'])
+    conditions = pattern.get('conditions') or []
+    if isinstance(conditions, str):
+        return [item.strip() for item in conditions.split('+') if item.strip()]
+    if isinstance(conditions, (set, frozenset)):
+        conditions = sorted(conditions, key=str)
+    return [str(item) for item in conditions]
+
+
+def explain_fpm_pattern(pattern, risk_level):
+    """
+    risk_factors and why_this_risk text for the pattern that decided risk_level.
+
+    Everything is taken from the pattern itself (antecedent items, confidence, lift), so
+    the explanation always describes the rule that actually matched.
+    """
+    marker = {'HIGH': '🔴', 'LOW': '🟢'}.get(risk_level, '🟡')
+    outcome = {'HIGH': 'HIGH rabies cases', 'LOW': 'LOW/NO rabies cases'}.get(risk_level, 'MEDIUM rabies cases')
+    items = fpm_pattern_items(pattern)
+    conditions = ' + '.join(describe_fpm_item(item) for item in items)
+    lift = float(pattern['lift'])
+    confidence = float(pattern['confidence'])
+
+    risk_factors = [f"{marker} {describe_fpm_item(item)}" for item in items]
+    risk_factors.append(f"{marker} This combination shows {lift:.2f}× stronger association with {outcome} (lift)")
+    risk_factors.append(f"{marker} Historical data: {confidence:.1%} of months with these conditions had {outcome} (confidence)")
+
+    why_this_risk = (
+        f"Your current weather conditions match a **{risk_level}-RISK PATTERN** mined from the "
+        f"historical weather and rabies records: {conditions}. Months with this combination had "
+        f"{outcome} {confidence:.1%} of the time, {lift:.2f}× more often than average."
+    )
+    return risk_factors, why_this_risk
+
+
 def get_weather_insights(weather_data, fpm_model):
     """
     Get weather-rabies pattern insights using FPM model.
@@ -879,20 +1858,30 @@ def get_weather_insights(weather_data, fpm_model):
         # Check against top patterns
         top_high_risk = fpm_model['top_high_risk_pattern']
         top_low_risk = fpm_model['top_low_risk_pattern']
-        
-        # Simple pattern matching (can be enhanced)
-        pattern_str = categorized['pattern_string']
-        
-        # Check if matches high-risk pattern
-        high_risk_match = False
-        if 'Very_High_Humidity' in pattern_str and 'Calm' in pattern_str and 'Wet_Month' in pattern_str:
-            high_risk_match = True
-        
-        # Check if matches low-risk pattern  
-        low_risk_match = False
-        if 'Low_Humidity' in pattern_str and 'Breezy' in pattern_str and 'Dry_Month' in pattern_str:
-            low_risk_match = True
-        
+
+        rule_index = FPM_RULE_INDEX if fpm_model is FPM_MODEL else build_fpm_rule_index(fpm_model)
+        matched_rules = []
+        medium_pattern = None
+        if rule_index is not None:
+            # Match against every mined rule; the strongest (highest lift) decides the risk
+            fpm_risk, top_rule, matched_rules = assess_fpm_risk(categorized, rule_index)
+            high_risk_match = fpm_risk == 'HIGH'
+            low_risk_match = fpm_risk == 'LOW'
+            # Strongest satisfied rule on each side (matches are already ranked by lift)
+            high_rule = next((rule for rule in matched_rules if rule['risk'] == 'HIGH'), None)
+            low_rule = next((rule for rule in matched_rules if rule['risk'] == 'LOW'), None)
+            if high_rule is not None:
+                top_high_risk = fpm_rule_pattern(high_rule)
+            if low_rule is not None:
+                top_low_risk = fpm_rule_pattern(low_rule)
+            if fpm_risk == 'MEDIUM' and top_rule is not None:
+                medium_pattern = fpm_rule_pattern(top_rule)
+        else:
+            # Older FPM pickles without rule tables: check the two headline patterns
+            pattern_str = categorized['pattern_string']
+            high_risk_match = 'Very_High_Humidity' in pattern_str and 'Calm' in pattern_str and 'Wet_Month' in pattern_str
+            low_risk_match = 'Low_Humidity' in pattern_str and 'Breezy' in pattern_str and 'Dry_Month' in pattern_str
+
         # Determine risk level with detailed explanations
         if high_risk_match:
             risk_level = 'HIGH'
@@ -906,19 +1895,7 @@ def get_weather_insights(weather_data, fpm_model):
                 'Launch public awareness campaigns',
                 'Switch to daily case monitoring'
             ]
-            risk_factors = [
-                '🔴 Very high humidity (>85%) creates favorable conditions for animal behavior changes',
-                '🔴 Calm winds (<15 km/h) reduce dispersion of animal scents, increasing animal encounters',
-                '🔴 Wet months (>300mm rain) drive animals to seek shelter near human settlements',
-                '🔴 Combination of these 3 factors shows 3.44× stronger association with rabies cases',
-                '🔴 Historical data: This pattern occurred in 22% of high-case months'
-            ]
-            why_this_risk = (
-                "Your current weather conditions match the **TOP HIGH-RISK PATTERN** identified "
-                "from 1,627 monthly records across 32 barangays. This specific combination "
-                "(Very High Humidity + Calm Winds + Heavy Rain) has historically been associated "
-                "with significantly higher rabies cases."
-            )
+            risk_factors, why_this_risk = explain_fpm_pattern(matched_pattern, risk_level)
         elif low_risk_match:
             risk_level = 'LOW'
             risk_color = '#388e3c'
@@ -930,40 +1907,32 @@ def get_weather_insights(weather_data, fpm_model):
                 'Reallocate resources to high-risk areas',
                 'Maintain weekly monitoring'
             ]
-            risk_factors = [
-                '🟢 Low humidity (<70%) reduces animal stress and aggressive behavior',
-                '🟢 Breezy winds (15-25 km/h) improve air circulation and reduce animal encounters',
-                '🟢 Dry months (<100mm rain) mean animals stay in natural habitats',
-                '🟢 This pattern shows 4.09× stronger association with LOW/NO rabies cases',
-                '🟢 Historical data: This pattern occurred in 19.4% of low-case months'
-            ]
-            why_this_risk = (
-                "Your current weather conditions match the **TOP LOW-RISK PATTERN** identified "
-                "from historical data. This specific combination has consistently been associated "
-                "with fewer rabies cases across multiple barangays and years."
-            )
+            risk_factors, why_this_risk = explain_fpm_pattern(matched_pattern, risk_level)
         else:
             risk_level = 'MEDIUM'
             risk_color = '#f57c00'
-            confidence = 0.15  # Default medium confidence
-            matched_pattern = None
+            confidence = medium_pattern['confidence'] if medium_pattern else 0.15  # Default medium confidence
+            matched_pattern = medium_pattern
             recommendations = [
                 'Monitor weather trends closely',
                 'Maintain standard vaccination schedule',
                 'Prepare contingency plans'
             ]
-            risk_factors = [
-                f'🟡 Humidity level ({categorized["humidity"]}) is in the moderate range',
-                f'🟡 Wind conditions ({categorized["wind"]}) not strongly predictive',
-                f'🟡 Rainfall ({categorized["precipitation"]}) shows mixed patterns',
-                '🟡 No exact match to high-risk or low-risk patterns',
-                '🟡 Proceed with standard prevention protocols while monitoring trends'
-            ]
-            why_this_risk = (
-                "Your current weather conditions do NOT match any strong high-risk or low-risk patterns "
-                "from the FPM analysis. This suggests **moderate risk** - not alarming, but worth monitoring. "
-                "The weather factors present don't have strong historical associations with extreme rabies cases."
-            )
+            if medium_pattern:
+                risk_factors, why_this_risk = explain_fpm_pattern(medium_pattern, risk_level)
+            else:
+                risk_factors = [
+                    f'🟡 Humidity level ({categorized["humidity"]}) is in the moderate range',
+                    f'🟡 Wind conditions ({categorized["wind"]}) not strongly predictive',
+                    f'🟡 Rainfall ({categorized["precipitation"]}) shows mixed patterns',
+                    '🟡 No exact match to high-risk or low-risk patterns',
+                    '🟡 Proceed with standard prevention protocols while monitoring trends'
+                ]
+                why_this_risk = (
+                    "Your current weather conditions do NOT match any strong high-risk or low-risk patterns "
+                    "from the FPM analysis. This suggests **moderate risk** - not alarming, but worth monitoring. "
+                    "The weather factors present don't have strong historical associations with extreme rabies cases."
+                )
         
         # Build detailed rule explanations
         rule_explanations = {
@@ -1001,6 +1970,7 @@ def get_weather_insights(weather_data, fpm_model):
                 'confidence': round(matched_pattern['confidence'], 3) if matched_pattern else confidence,
                 'lift': round(matched_pattern['lift'], 2) if matched_pattern else 1.0
             } if matched_pattern else None,
+            'matched_rules': matched_rules[:10],  # strongest satisfied rules, by lift
             'recommendations': recommendations,
             'risk_factors': risk_factors,  # NEW: Detailed risk factors
             'why_this_risk': why_this_risk,  # NEW: Explanation
@@ -1050,55 +2020,71 @@ def analyze_monthly_weather_patterns(model_data, fpm_model, weather_df):
         municipality = model_data.get('municipality', '')
         barangay_name = model_data.get('barangay', '')
         
-        # Find MUN_CODE and BGY_CODE
-        # TODO: Need a mapping - for now try to match from weather data
-        # This is a simplified approach - you may need proper code mapping
-        
         timeline = []
         
+        # Join validation months against the precomputed monthly tables (one reindex, no per-month scans)
+        validation_index = pd.DatetimeIndex(pd.to_datetime(validation_dates))
+        barangay_weather = get_barangay_weather(municipality, barangay_name) if weather_df is WEATHER_DF else None
+        
+        if barangay_weather is not None:
+            # The barangay's own weather series
+            weather_scope = 'barangay'
+            validation_weather = barangay_weather.reindex(validation_index)
+            weather_records = validation_index.isin(barangay_weather.index).astype(int)
+        else:
+            # No MUN_CODE/BGY_CODE match - use aggregated regional weather
+            weather_scope = 'regional'
+            weather_by_month = WEATHER_BY_MONTH
+            if weather_by_month is None or weather_df is not WEATHER_DF:
+                weather_by_month = monthly_regional_weather(weather_df)
+            validation_weather = weather_by_month.reindex(validation_index)
+            weather_records = validation_weather['records'].fillna(0).to_numpy()
+        weather_values = validation_weather[WEATHER_FEATURES].to_numpy()
+        
+        # Categorize every validation month in one vectorized call
+        month_categories = categorize_weather_batch(validation_weather, fpm_model).to_dict('records')
+        rule_index = FPM_RULE_INDEX if fpm_model is FPM_MODEL else build_fpm_rule_index(fpm_model)
+        
         for i in range(len(validation_dates)):
             try:
                 month_date = pd.Timestamp(validation_dates[i])
                 actual_cases = validation_actuals[i]
                 predicted_cases = validation_predictions[i]
                 
-                # Find weather data for this month (try to match by date)
-                # Since we don't have exact MUN_CODE/BGY_CODE match, we'll use aggregated regional weather
-                weather_month = weather_df[weather_df['DATE'] == month_date]
-                
-                if len(weather_month) == 0:
+                if weather_records[i] == 0:
                     # No weather data for this month, skip
                     continue
                 
-                # Use mean weather across all barangays for this month (approximation)
-                weather_data = {
-                    'tmean_c': weather_month['tmean_c'].mean(),
-                    'rh_pct': weather_month['rh_pct'].mean(),
-                    'precip_mm': weather_month['precip_mm'].mean(),
-                    'wind_speed_10m_max_kmh': weather_month['wind_speed_10m_max_kmh'].mean(),
-                    'sunshine_hours': weather_month['sunshine_hours'].mean()
-                }
+                # Barangay weather, or mean weather across all barangays for this month (approximation)
+                weather_data = dict(zip(WEATHER_FEATURES, weather_values[i]))
                 
-                # Categorize weather using FPM
-                categorized = categorize_weather_for_fpm(weather_data, fpm_model)
-                if not categorized:
-                    continue
+                # Weather categories (FPM thresholds)
+                categorized = month_categories[i]
                 
-                # Determine FPM risk level (simplified pattern matching)
-                pattern_str = categorized['pattern_string']
+                # Determine FPM risk level
                 fpm_risk = 'MEDIUM'
                 fpm_confidence = 0.15
                 fpm_lift = 1.0
+                fpm_rule = None
                 
-                # Check high-risk pattern
-                if 'Very_High_Humidity' in pattern_str and 'Calm' in pattern_str and 'Wet_Month' in pattern_str:
-                    fpm_risk = 'HIGH'
-                    fpm_confidence = 0.22
-                    fpm_lift = 3.44
-                elif 'Low_Humidity' in pattern_str and 'Breezy' in pattern_str and 'Dry_Month' in pattern_str:
-                    fpm_risk = 'LOW'
-                    fpm_confidence = 0.194
-                    fpm_lift = 4.09
+                if rule_index is not None:
+                    # Strongest mined rule satisfied by this month
+                    fpm_risk, top_rule, _ = assess_fpm_risk(categorized, rule_index)
+                    if top_rule is not None:
+                        fpm_confidence = top_rule['confidence']
+                        fpm_lift = round(top_rule['lift'], 2)
+                        fpm_rule = ' + '.join(top_rule['antecedents'])
+                else:
+                    # Older FPM pickles without rule tables: check the two headline patterns
+                    pattern_str = categorized['pattern_string']
+                    if 'Very_High_Humidity' in pattern_str and 'Calm' in pattern_str and 'Wet_Month' in pattern_str:
+                        fpm_risk = 'HIGH'
+                        fpm_confidence = 0.22
+                        fpm_lift = 3.44
+                    elif 'Low_Humidity' in pattern_str and 'Breezy' in pattern_str and 'Dry_Month' in pattern_str:
+                        fpm_risk = 'LOW'
+                        fpm_confidence = 0.194
+                        fpm_lift = 4.09
                 
                 # Calculate prediction error
                 error = predicted_cases - actual_cases
@@ -1148,9 +2134,11 @@ def analyze_monthly_weather_patterns(model_data, fpm_model, weather_df):
                         'wind': categorized['wind'],
                         'sunshine': categorized['sunshine']
                     },
+                    'weather_scope': weather_scope,
                     'fpm_risk': fpm_risk,
                     'fpm_confidence': round(fpm_confidence, 3),
                     'fpm_lift': round(fpm_lift, 2),
+                    'fpm_rule': fpm_rule,
                     'interpretation': interpretation
                 })
                 
@@ -1166,6 +2154,51 @@ def analyze_monthly_weather_patterns(model_data, fpm_model, weather_df):
         traceback.print_exc()
         return []
 
+# ==============================================
+# WORKER POOL FOR BLOCKING ENDPOINT WORK
+# ==============================================
+# NeuralProphet/XGBoost predict, matplotlib and reportlab all block. Endpoints hand
+# that work to this pool so the event loop keeps serving other clients.
+API_WORKERS = int(os.getenv("API_WORKERS", str(min(4, os.cpu_count() or 1))))
+API_MAX_QUEUE = int(os.getenv("API_MAX_QUEUE", "16"))  # waiting jobs allowed before 503
+
+_WORK_EXECUTOR = None
+_WORK_SLOTS = threading.BoundedSemaphore(API_WORKERS + API_MAX_QUEUE)
+_WORK_EXECUTOR_GUARD = threading.Lock()
+
+
+def get_work_executor():
+    """Create the worker pool on first use (threads must not exist before a fork)."""
+    global _WORK_EXECUTOR
+    with _WORK_EXECUTOR_GUARD:
+        if _WORK_EXECUTOR is None:
+            _WORK_EXECUTOR = ThreadPoolExecutor(max_workers=API_WORKERS, thread_name_prefix="api-work")
+        return _WORK_EXECUTOR
+
+
+async def run_blocking(func, *args, **kwargs):
+    """
+    Run a blocking function in the worker pool.
+    Raises 503 when API_WORKERS jobs are running and API_MAX_QUEUE more are waiting.
+    """
+    if not _WORK_SLOTS.acquire(blocking=False):
+        raise HTTPException(
+            status_code=503,
+            detail="Server is busy generating forecasts/reports, please retry shortly",
+            headers={"Retry-After": "5"}
+        )
+    
+    try:
+        future = get_work_executor().submit(func, *args, **kwargs)
+    except Exception:
+        _WORK_SLOTS.release()
+        raise
+    
+    # Release the slot when the work really finishes (even if the client disconnected)
+    future.add_done_callback(lambda _: _WORK_SLOTS.release())
+    return await asyncio.wrap_future(future)
+
+
 # ==============================================
 # API ENDPOINTS
 # ==============================================
@@ -1177,13 +2210,18 @@ async def root():
         "status": "operational",
         "version": "2.1.0",
         "models_loaded": len(MODELS),
+        "models_resident": MODELS.resident_count(),
+        "models_warmup": {
+            k: MODEL_WARMUP_SUMMARY[k] for k in ('total_seconds', 'loaded', 'failed')
+        } if MODEL_WARMUP_SUMMARY else None,
         "features": ["forecasting", "risk_assessment", "model_interpretability"]
     }
 
-def calculate_risk_level(model_data, forecast_months=8):
+def calculate_risk_level(model_data, forecast_months=8, future_predictions=None):
     """
     Calculate risk level based on RECENT historical data (past 8 months) vs future forecast.
     Compares next 8 months forecast against past 8 months actual data (8-to-8 comparison).
+    Pass future_predictions to reuse an already computed forecast.
     """
     try:
         # Get historical validation data
@@ -1202,7 +2240,8 @@ def calculate_risk_level(model_data, forecast_months=8):
         print(f"   📊 Risk calculation: Using past {recent_months} months (avg={recent_avg:.1f}, max={recent_max:.1f})")
         
         # Get future forecast (8 months)
-        future_predictions = predict_future_months(model_data, months_ahead=forecast_months)
+        if future_predictions is None:
+            future_predictions = predict_future_months(model_data, months_ahead=forecast_months)
         if not future_predictions:
             return 'UNKNOWN', '#666666', '⚪'
         
@@ -1229,99 +2268,578 @@ def calculate_risk_level(model_data, forecast_months=8):
         return 'UNKNOWN', '#666666', '⚪'
 
 
-@app.get("/api/municipalities")
-async def get_municipalities():
-    """Get list of municipalities with summary stats and risk levels."""
-    summaries = {}
-    
-    print("🔄 Calculating risk levels for all barangays...")
+# ==============================================
+# FORECAST STORE (computed once per loaded model set)
+# ==============================================
+RISK_FORECAST_MONTHS = 8
+FORECAST_HORIZON_MONTHS = 24  # longest /api/forecast horizon; shorter ones are prefixes of this path
+
+FORECAST_STORE = {}  # model key -> {'signature', 'next_month', 'forecast_path', 'forecast', 'risk'[, 'error']}
+FORECAST_STORE_DIR = None  # MODEL_DIR the store was built for
+_FORECAST_REFRESH_LOCK = threading.Lock()
+_FORECAST_KEY_LOCKS = {}  # model key -> Lock held while that model's forecast is computed on a miss
+_FORECAST_KEY_LOCKS_GUARD = threading.Lock()
+
+
+def get_model_signature(key):
+    """Fingerprint of a model file (path, mtime, size) - changes when the .pkl is replaced."""
+    path = MODELS.model_path(key)
+    if not path or not os.path.exists(path):
+        return None
+    stat = os.stat(path)
+    return (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+
+def forecast_key_lock(key):
+    """The lock serializing forecast misses of one model (created on first use)."""
+    with _FORECAST_KEY_LOCKS_GUARD:
+        return _FORECAST_KEY_LOCKS.setdefault(key, threading.Lock())
+
+
+def get_forecast_summary(key, model_data=None):
+    """
+    Get next-month forecast, N-month forecast and risk level for a model.
+    Computed on first use and served from FORECAST_STORE until the model file
+    changes or MODEL_DIR points somewhere else. A failed forecast is stored too
+    (empty path, 'error' set), so a broken model is not re-predicted on every request.
     
-    for key, model_data in MODELS.items():
-        mun = model_data['municipality']
-        
-        if mun not in summaries:
-            summaries[mun] = {
-                'barangays': [],
-                'total_barangays': 0,
-                'avg_mae': [],
-                'risk_counts': {'HIGH': 0, 'MEDIUM': 0, 'LOW': 0}
-            }
-        
-        # Convert numpy types to Python native types
-        mae_value = model_data.get('mae', 0)
-        if hasattr(mae_value, 'item'):  # numpy type
-            mae_value = mae_value.item()
-        
-        pred_value = predict_next_month(model_data) or 0
-        if hasattr(pred_value, 'item'):  # numpy type
-            pred_value = pred_value.item()
-        
-        # Calculate risk level
-        risk_level, risk_color, risk_icon = calculate_risk_level(model_data, forecast_months=8)
+    'forecast_path' holds the full FORECAST_HORIZON_MONTHS path; every future month
+    is predicted independently, so any shorter horizon is just a slice of it.
+    """
+    check_forecast_store_dir()
+    
+    signature = get_model_signature(key)
+    cached = FORECAST_STORE.get(key)
+    if cached is not None and cached['signature'] == signature:
+        return cached
+    
+    # Concurrent first requests for one model wait for a single NeuralProphet pass
+    with forecast_key_lock(key):
+        cached = FORECAST_STORE.get(key)
+        if cached is not None and cached['signature'] == signature:
+            return cached
         
-        barangay_info = {
-            'name': str(model_data['barangay']),
-            'mae': round(float(mae_value), 2),
-            'predicted_next': round(float(pred_value), 1),
-            'risk_level': risk_level,
-            'risk_color': risk_color,
-            'risk_icon': risk_icon
-        }
+        # Precomputed by precompute_forecasts.py? Then the model never has to be loaded
+        stored = load_precomputed_forecasts([key], {key: signature}).get(key)
+        if stored is not None:
+            FORECAST_STORE[key] = stored
+            return stored
         
-        summaries[mun]['barangays'].append(barangay_info)
-        summaries[mun]['total_barangays'] += 1
-        summaries[mun]['avg_mae'].append(barangay_info['mae'])
+        try:
+            if model_data is None:
+                model_data = MODELS[key]
+        except Exception as e:
+            print(f"❌ Failed to load {key}: {e}")
+            return store_forecast_failure(key, signature, f"Failed to load model: {e}")
         
-        # Count risk levels
-        if risk_level in summaries[mun]['risk_counts']:
-            summaries[mun]['risk_counts'][risk_level] += 1
-    
-    # Calculate averages
-    result = []
-    for mun, data in summaries.items():
-        avg_mae = float(np.mean(data['avg_mae']))
-        result.append({
-            'municipality': str(mun),
-            'barangays': sorted(data['barangays'], key=lambda x: x['predicted_next'], reverse=True),
-            'total_barangays': int(data['total_barangays']),
-            'avg_mae': round(avg_mae, 2),
-            'risk_summary': data['risk_counts']
-        })
+        # One NeuralProphet pass for both the next-month value and the forecast path
+        try:
+            next_month, forecast_path = predict_forecast_anchors(
+                model_data, months_ahead=FORECAST_HORIZON_MONTHS, raise_errors=True
+            )
+        except Exception as e:
+            return store_forecast_failure(key, signature, f"Forecast failed: {e}")
+        return store_forecast_entry(key, model_data, signature, next_month, forecast_path)
+
+
+def check_forecast_store_dir():
+    """Drop the store when MODEL_DIR was switched to another model set."""
+    global FORECAST_STORE_DIR
     
-    print(f"✅ Risk levels calculated for {len(MODELS)} barangays\n")
-    return {"success": True, "municipalities": result}
+    if FORECAST_STORE_DIR != MODEL_DIR:
+        FORECAST_STORE.clear()
+        FORECAST_STORE_DIR = MODEL_DIR
 
 
-@app.get("/api/weather-insights/{municipality}/{barangay}")
-async def get_weather_insights_endpoint(municipality: str, barangay: str):
+def store_forecast_entry(key, model_data, signature, next_month, forecast_path):
+    """Risk level + FORECAST_STORE entry from a model's next-month value and forecast path."""
+    if hasattr(next_month, 'item'):  # numpy type
+        next_month = next_month.item()
+    
+    forecast = forecast_path[:RISK_FORECAST_MONTHS]
+    risk = calculate_risk_level(model_data, forecast_months=RISK_FORECAST_MONTHS, future_predictions=forecast)
+    
+    entry = {
+        'signature': signature,
+        'next_month': next_month,
+        'forecast_path': forecast_path,
+        'forecast': forecast,
+        'risk': risk
+    }
+    if not forecast_path:
+        return store_forecast_failure(key, signature, "Forecast returned no predictions")
+    FORECAST_STORE[key] = entry
+    return entry
+
+
+def store_forecast_failure(key, signature, error):
     """
-    Get weather-rabies pattern insights using FPM model.
-    
-    ⚠️ IMPORTANT: This analyzes MONTHLY weather patterns, not daily!
-    - FPM trained on MONTHLY aggregates (1,627 barangay-months)
-    - Weather inputs should be MONTHLY values:
-      * Temperature/Humidity: Monthly averages
-      * Precipitation/Sunshine: Monthly totals
-      * Wind: Monthly maximum
-    - Risk assessment is for THE ENTIRE MONTH
-    
-    This is a SEPARATE analysis from the forecasting model.
-    Since adding weather as regressors hurt forecast accuracy,
-    we use FPM to understand weather-rabies associations independently.
+    FORECAST_STORE entry for a model whose forecast failed. Kept under the model's
+    signature like any other entry: retried once the .pkl changes, not per request.
     """
-    if not FPM_MODEL:
-        return {
-            'success': False,
-            'message': 'FPM model not available',
-            'insights': {'available': False}
-        }
-    
-    # For now, use typical MONTHLY weather values for the region
-    # In production, you'd fetch weather FORECASTS for next month or
-    # current month's accumulated values from weather API
-    # ⚠️ NOTE: These are TYPICAL MONTHLY VALUES (not real-time/daily)!
-    typical_weather = {
-        'tmean_c': 27.5,          # Monthly average temperature
+    entry = {
+        'signature': signature,
+        'next_month': None,
+        'forecast_path': [],
+        'forecast': [],
+        'risk': ('UNKNOWN', '#666666', '⚪'),
+        'error': str(error)
+    }
+    FORECAST_STORE[key] = entry
+    return entry
+
+
+def get_forecast_validators(key, months):
+    """
+    ETag for a forecast response (None if the model file is unknown). Derived from the
+    model file AND FORECAST_DB_VERSION, which is bumped whenever forecast output changes
+    without the .pkl changing - so a deploy like that invalidates cached bodies too.
+    No Last-Modified: the file mtime can't express a code change.
+    """
+    signature = get_model_signature(key)
+    if signature is None:
+        return None
+    path, mtime_ns, size = signature
+    etag = hashlib.sha1(f"{path}:{mtime_ns}:{size}:{months}:{FORECAST_DB_VERSION}".encode('utf-8')).hexdigest()[:20]
+    return {
+        'ETag': f'"{etag}"',
+        'Cache-Control': 'no-cache'  # always revalidate - cheap 304 while model and forecast code are unchanged
+    }
+
+
+def is_not_modified(request, validators):
+    """Conditional GET check against the ETag (If-Modified-Since alone never gives a 304)."""
+    if_none_match = request.headers.get('if-none-match')
+    if if_none_match is None:
+        return False
+    tags = [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')]
+    return '*' in tags or validators['ETag'] in tags
+
+
+def refresh_forecast_store(keys=None):
+    """
+    Bring FORECAST_STORE up to date for many models at once: every missing or stale
+    entry is scored through the batched engine (predict_forecast_batch).
+    """
+    with _FORECAST_REFRESH_LOCK:  # concurrent /api/municipalities calls wait for one batch instead of each running it
+        check_forecast_store_dir()
+        
+        signatures = {key: get_model_signature(key) for key in (keys if keys is not None else MODELS)}
+        stale = [
+            key for key, signature in signatures.items()
+            if key not in FORECAST_STORE or FORECAST_STORE[key]['signature'] != signature
+        ]
+        if stale:
+            # Current rows from the precomputed database first, model inference only for the rest
+            stored = load_precomputed_forecasts(stale, signatures)
+            FORECAST_STORE.update(stored)
+            stale = [key for key in stale if key not in stored]
+        if stale:
+            predict_forecast_batch(
+                stale, months_ahead=FORECAST_HORIZON_MONTHS,
+                on_result=lambda key, model_data, next_month, forecast_path: store_forecast_entry(
+                    key, model_data, signatures[key], next_month, forecast_path
+                ),
+                on_error=lambda key, error: store_forecast_failure(key, signatures[key], error)
+            )
+        return stale
+
+
+def build_forecast_store():
+    """Precompute forecast summaries for every loaded model."""
+    print(f"🔄 Building forecast store for {len(MODELS)} models...")
+    refresh_forecast_store()
+    print(f"✅ Forecast store ready ({len(FORECAST_STORE)} entries)\n")
+    return FORECAST_STORE
+
+
+# ==============================================
+# INTERPRETABILITY COMPONENT CACHE
+# ==============================================
+# extract_model_components() runs NeuralProphet over the whole train+validation history,
+# and its output only depends on the model pickle. Interpretability, CSV, PDF and
+# insights-PDF all ask for it, so keep recent results (LRU) keyed by model.
+COMPONENTS_CACHE_SIZE = int(os.getenv("COMPONENTS_CACHE_SIZE", "64"))
+
+COMPONENTS_CACHE = OrderedDict()  # model key -> (signature, components)
+_COMPONENTS_CACHE_LOCK = threading.Lock()
+
+
+def get_model_components(key, model_data=None):
+    """
+    extract_model_components() for a model key, memoized until the model file changes.
+    The returned dict is shared between requests - treat it as read-only.
+    """
+    signature = get_model_signature(key)
+    with _COMPONENTS_CACHE_LOCK:
+        cached = COMPONENTS_CACHE.get(key)
+        if cached is not None and cached[0] == signature:
+            COMPONENTS_CACHE.move_to_end(key)
+            return cached[1]
+
+    components = load_precomputed_components(key, signature)
+    if components is None:
+        if model_data is None:
+            model_data = MODELS[key]
+        components = extract_model_components(model_data)
+
+    # Failures aren't cached so the next request retries
+    if components.get('success') and signature is not None:
+        with _COMPONENTS_CACHE_LOCK:
+            COMPONENTS_CACHE[key] = (signature, components)
+            COMPONENTS_CACHE.move_to_end(key)
+            while len(COMPONENTS_CACHE) > COMPONENTS_CACHE_SIZE:
+                COMPONENTS_CACHE.popitem(last=False)
+    return components
+
+
+# ==============================================
+# PRECOMPUTED FORECAST DATABASE (SQLite)
+# ==============================================
+# precompute_forecasts.py scores every model offline (process pool across cores) and
+# writes 24-month forecasts, risk levels, interpretability components and the CSV report
+# frame here. The API
+# checks this file before touching a model, so requests it covers never unpickle a model
+# or import NeuralProphet/torch.
+FORECAST_DB_FILENAME = "forecast_store.sqlite"
+FORECAST_DB_PATH = os.getenv("FORECAST_DB_PATH") or os.path.join(MODEL_DIR, FORECAST_DB_FILENAME)
+FORECAST_DB_VERSION = "3"  # bump when forecast output changes - also invalidates /api/forecast ETags (2: anchors snapped to month starts, 3: report frames)
+_FORECAST_DB_VERSION_WARNED = False
+
+FORECAST_DB_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS forecasts (
+    model_key TEXT PRIMARY KEY,
+    municipality TEXT,
+    barangay TEXT,
+    mtime_ns INTEGER,      -- model file fingerprint the row was computed from
+    size INTEGER,
+    horizon INTEGER,
+    next_month REAL,
+    forecast_path TEXT,    -- JSON [{"date", "predicted"}, ...]
+    risk TEXT,             -- JSON [level, color, icon]
+    components TEXT,       -- JSON extract_model_components() result (NULL if it failed)
+    report TEXT,           -- JSON build_report_frame() columns (NULL if it failed)
+    computed_at TEXT
+);
+"""
+
+
+def to_json_value(value):
+    """json.dumps(default=...) for numpy values and timestamps found in model-derived results."""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (pd.Timestamp, datetime)):
+        return value.isoformat()
+    return str(value)
+
+
+def connect_forecast_db(path=None, writable=False):
+    """SQLite connection to the forecast database (None if it doesn't exist and writable is False)."""
+    path = path or FORECAST_DB_PATH
+    if not writable and not os.path.exists(path):
+        return None
+    conn = sqlite3.connect(path, timeout=30)
+    if writable:
+        conn.executescript(FORECAST_DB_SCHEMA)
+    return conn
+
+
+def read_forecast_db_rows(keys, columns):
+    """{model_key: row tuple} for the given keys (empty when there is no database or it's outdated)."""
+    global _FORECAST_DB_VERSION_WARNED
+    keys = list(keys)
+    try:
+        conn = connect_forecast_db()
+    except sqlite3.Error as e:
+        print(f"⚠️ Forecast database unavailable ({e})")
+        return {}
+    if conn is None or not keys:
+        return {}
+    
+    rows = {}
+    try:
+        version = conn.execute("SELECT value FROM meta WHERE name = 'version'").fetchone()
+        if version is None or version[0] != FORECAST_DB_VERSION:
+            if not _FORECAST_DB_VERSION_WARNED:
+                print("⚠️ Forecast database is from an older version - ignoring it (rerun precompute_forecasts.py)")
+                _FORECAST_DB_VERSION_WARNED = True
+            return {}
+        for start in range(0, len(keys), 500):  # stay under SQLite's bound-parameter limit
+            chunk = keys[start:start + 500]
+            query = (
+                f"SELECT model_key, mtime_ns, size, {', '.join(columns)} FROM forecasts "
+                f"WHERE model_key IN ({', '.join('?' * len(chunk))})"
+            )
+            for row in conn.execute(query, chunk):
+                rows[row[0]] = row
+    except sqlite3.Error as e:
+        print(f"⚠️ Forecast database read failed ({e})")
+    finally:
+        conn.close()
+    return rows
+
+
+def is_current_row(row, signature):
+    """A stored row is usable while the model file still has the same mtime and size."""
+    return signature is not None and row[1] == signature[1] and row[2] == signature[2]
+
+
+def load_precomputed_forecasts(keys, signatures):
+    """FORECAST_STORE-shaped entries from the database for the keys whose rows are current."""
+    entries = {}
+    rows = read_forecast_db_rows(keys, ['horizon', 'next_month', 'forecast_path', 'risk'])
+    for key, row in rows.items():
+        signature = signatures.get(key)
+        if not is_current_row(row, signature) or (row[3] or 0) < FORECAST_HORIZON_MONTHS:
+            continue
+        forecast_path = json.loads(row[5] or '[]')
+        if not forecast_path:
+            continue
+        entries[key] = {
+            'signature': signature,
+            'next_month': row[4],
+            'forecast_path': forecast_path,
+            'forecast': forecast_path[:RISK_FORECAST_MONTHS],
+            'risk': tuple(json.loads(row[6]))
+        }
+    return entries
+
+
+def load_precomputed_components(key, signature):
+    """Stored extract_model_components() result for a model, or None if missing/stale."""
+    row = read_forecast_db_rows([key], ['components']).get(key)
+    if row is None or not is_current_row(row, signature) or not row[3]:
+        return None
+    return json.loads(row[3])
+
+
+def load_precomputed_report(key, signature):
+    """Stored build_report_frame() result for a model, or None if missing/stale."""
+    row = read_forecast_db_rows([key], ['report']).get(key)
+    if row is None or not is_current_row(row, signature) or not row[3]:
+        return None
+    return pd.DataFrame(json.loads(row[3]), columns=REPORT_COLUMNS)
+
+
+def precompute_models(keys):
+    """
+    Forecast entry, interpretability components and report frame for a chunk of models,
+    as database rows.
+    Runs inside a precompute pool process (uses that process's MODELS registry).
+    """
+    rows = []
+    
+    def collect(key, model_data, next_month, forecast_path):
+        if not forecast_path:
+            return  # failed forecast - not written, counted as failed by run_precompute
+        signature = get_model_signature(key)
+        entry = store_forecast_entry(key, model_data, signature, next_month, forecast_path)
+        components = extract_model_components(model_data)
+        try:
+            report = build_report_frame(model_data).to_dict(orient='list')
+        except Exception as e:
+            print(f"⚠️ Report frame failed for {key}: {e}")
+            report = None
+        rows.append((
+            key,
+            str(model_data.get('municipality', '')),
+            str(model_data.get('barangay', '')),
+            signature[1] if signature else None,
+            signature[2] if signature else None,
+            FORECAST_HORIZON_MONTHS,
+            float(entry['next_month']) if entry['next_month'] is not None else None,
+            json.dumps(entry['forecast_path']),
+            json.dumps(list(entry['risk']), ensure_ascii=False),
+            json.dumps(components, default=to_json_value, ensure_ascii=False) if components.get('success') else None,
+            json.dumps(report, default=to_json_value) if report is not None else None,
+            datetime.now().isoformat(timespec='seconds')
+        ))
+    
+    predict_forecast_batch(keys, months_ahead=FORECAST_HORIZON_MONTHS, on_result=collect)
+    return rows
+
+
+def run_precompute(workers=None, keys=None, db_path=None):
+    """
+    Score every model in MODEL_DIR and write the results to the forecast database.
+    
+    Keys are ordered by batch group (shared future frames) and split into ~2 chunks per
+    worker; each chunk runs in its own process, and this process is the only writer.
+    
+    Returns:
+        Summary dict (models, written, failed, workers, seconds, db_path)
+    """
+    keys = list(keys) if keys is not None else list(MODELS)
+    keys.sort(key=lambda key: str(forecast_batch_group(MODELS.metadata(key), FORECAST_HORIZON_MONTHS)))
+    workers = max(1, min(workers or os.cpu_count() or 1, len(keys) or 1))
+    chunk_size = max(1, math.ceil(len(keys) / (workers * 2)))
+    chunks = [keys[start:start + chunk_size] for start in range(0, len(keys), chunk_size)]
+    db_path = db_path or FORECAST_DB_PATH
+    
+    print(f"🏭 Precomputing {len(keys)} models in {len(chunks)} chunks ({workers} processes) -> {db_path}")
+    started = time.perf_counter()
+    written = 0
+    conn = connect_forecast_db(db_path, writable=True)
+    try:
+        version = conn.execute("SELECT value FROM meta WHERE name = 'version'").fetchone()
+        if version is None or version[0] != FORECAST_DB_VERSION:
+            # Rows (and columns) from an older version must not survive a partial run
+            conn.execute("DROP TABLE forecasts")
+            conn.executescript(FORECAST_DB_SCHEMA)
+            conn.commit()
+        
+        if workers == 1:
+            results = map(precompute_models, chunks)
+            pool = None
+        else:
+            pool = ProcessPoolExecutor(max_workers=workers)
+            results = pool.map(precompute_models, chunks)
+        try:
+            for rows in results:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO forecasts VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+                )
+                conn.commit()
+                written += len(rows)
+                print(f"   ✓ {written}/{len(keys)} models written ({time.perf_counter() - started:.1f}s)")
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        
+        conn.executemany("INSERT OR REPLACE INTO meta VALUES (?, ?)", [
+            ('version', FORECAST_DB_VERSION),
+            ('model_dir', os.path.abspath(MODEL_DIR)),
+            ('horizon', str(FORECAST_HORIZON_MONTHS)),
+            ('completed_at', datetime.now().isoformat(timespec='seconds'))
+        ])
+        conn.commit()
+    finally:
+        conn.close()
+    
+    summary = {
+        'models': len(keys),
+        'written': written,
+        'failed': len(keys) - written,
+        'workers': workers,
+        'seconds': round(time.perf_counter() - started, 2),
+        'db_path': db_path
+    }
+    print(f"✅ Precompute finished: {written}/{len(keys)} models in {summary['seconds']}s")
+    return summary
+
+
+# Production: fill FORECAST_STORE once, here, instead of on the first /api/municipalities
+# call of every worker process (precomputed database rows are used where current)
+if BUILD_FORECAST_STORE and len(MODELS) > 0:
+    build_forecast_store()
+
+
+def build_municipalities_response():
+    """Blocking part of get_municipalities (runs in the worker pool)."""
+    summaries = {}
+    
+    print("🔄 Calculating risk levels for all barangays...")
+    
+    # Score every missing/stale forecast in one batched pass (no-op once the store is warm)
+    refresh_forecast_store()
+    
+    for key in MODELS:
+        # Sidecar metadata only - the model itself is loaded just on a forecast cache miss
+        model_meta = MODELS.metadata(key)
+        mun = model_meta['municipality']
+        
+        if mun not in summaries:
+            summaries[mun] = {
+                'barangays': [],
+                'total_barangays': 0,
+                'avg_mae': [],
+                'risk_counts': {'HIGH': 0, 'MEDIUM': 0, 'LOW': 0}
+            }
+        
+        mae_value = model_meta['mae']
+        
+        # Next-month forecast + risk level (cached per model file)
+        forecast_summary = get_forecast_summary(key)
+        pred_value = forecast_summary['next_month'] or 0
+        risk_level, risk_color, risk_icon = forecast_summary['risk']
+        
+        barangay_info = {
+            'name': str(model_meta['barangay']),
+            'mae': round(float(mae_value), 2),
+            'predicted_next': round(float(pred_value), 1),
+            'risk_level': risk_level,
+            'risk_color': risk_color,
+            'risk_icon': risk_icon
+        }
+        if forecast_summary.get('error'):
+            barangay_info['forecast_error'] = forecast_summary['error']
+        
+        summaries[mun]['barangays'].append(barangay_info)
+        summaries[mun]['total_barangays'] += 1
+        summaries[mun]['avg_mae'].append(barangay_info['mae'])
+        
+        # Count risk levels
+        if risk_level in summaries[mun]['risk_counts']:
+            summaries[mun]['risk_counts'][risk_level] += 1
+    
+    # Calculate averages
+    result = []
+    for mun, data in summaries.items():
+        avg_mae = float(np.mean(data['avg_mae']))
+        result.append({
+            'municipality': str(mun),
+            'barangays': sorted(data['barangays'], key=lambda x: x['predicted_next'], reverse=True),
+            'total_barangays': int(data['total_barangays']),
+            'avg_mae': round(avg_mae, 2),
+            'risk_summary': data['risk_counts']
+        })
+    
+    print(f"✅ Risk levels calculated for {len(MODELS)} barangays\n")
+    return {"success": True, "municipalities": result}
+
+
+@app.get("/api/municipalities")
+async def get_municipalities():
+    """Get list of municipalities with summary stats and risk levels."""
+    return await run_blocking(build_municipalities_response)
+
+
+@app.get("/api/weather-insights/{municipality}/{barangay}")
+async def get_weather_insights_endpoint(municipality: str, barangay: str):
+    """
+    Get weather-rabies pattern insights using FPM model.
+    
+    ⚠️ IMPORTANT: This analyzes MONTHLY weather patterns, not daily!
+    - FPM trained on MONTHLY aggregates (1,627 barangay-months)
+    - Weather inputs should be MONTHLY values:
+      * Temperature/Humidity: Monthly averages
+      * Precipitation/Sunshine: Monthly totals
+      * Wind: Monthly maximum
+    - Risk assessment is for THE ENTIRE MONTH
+    
+    This is a SEPARATE analysis from the forecasting model.
+    Since adding weather as regressors hurt forecast accuracy,
+    we use FPM to understand weather-rabies associations independently.
+    """
+    if not FPM_MODEL:
+        return {
+            'success': False,
+            'message': 'FPM model not available',
+            'insights': {'available': False}
+        }
+    
+    # For now, use typical MONTHLY weather values for the region
+    # In production, you'd fetch weather FORECASTS for next month or
+    # current month's accumulated values from weather API
+    # ⚠️ NOTE: These are TYPICAL MONTHLY VALUES (not real-time/daily)!
+    typical_weather = {
+        'tmean_c': 27.5,          # Monthly average temperature
         'rh_pct': 85.0,           # Monthly average humidity
         'precip_mm': 350,         # MONTHLY TOTAL precipitation
         'wind_speed_10m_max_kmh': 12.0,   # Monthly maximum wind speed
@@ -1340,87 +2858,112 @@ async def get_weather_insights_endpoint(municipality: str, barangay: str):
     }
 
 
-@app.get("/api/barangay/{municipality}/{barangay}")
-async def get_barangay_details(municipality: str, barangay: str):
-    """Get detailed data for specific barangay."""
+def iter_fpm_scan_csv(rows, chunk_size=5000):
+    """Stream a risk scan as CSV text, one chunk of rows at a time."""
+    for start in range(0, len(rows), chunk_size):
+        yield rows.iloc[start:start + chunk_size].to_csv(index=False, header=start == 0)
+    if len(rows) == 0:
+        yield ','.join(FPM_SCAN_COLUMNS) + '\n'
+
+
+def build_fpm_risk_scan_response(risk=None, municipality=None, barangay=None, start=None, end=None, format='json'):
+    try:
+        scan = get_fpm_risk_scan()
+    except ValueError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    if scan is None:
+        raise HTTPException(status_code=503, detail="Weather data or FPM model not loaded")
+
+    rows = filter_fpm_risk_scan(scan, risk, municipality, barangay, start, end)
+
+    if format == 'csv':
+        filename = f"fpm_risk_scan_{datetime.now().strftime('%Y%m%d')}.csv"
+        return StreamingResponse(
+            iter_fpm_scan_csv(rows),
+            media_type="text/csv",
+            headers={"Content-Disposition": f"attachment; filename={filename}"}
+        )
+
+    return {
+        'success': True,
+        'count': int(len(rows)),
+        'risk_counts': {level: int(count) for level, count in rows['risk'].value_counts().items()},
+        'columns': FPM_SCAN_COLUMNS,
+        # Compact row arrays instead of one object per barangay-month
+        'rows': rows.astype(object).where(rows.notna(), None).to_numpy().tolist()
+    }
+
+
+@app.get("/api/fpm/risk-scan")
+async def get_fpm_risk_scan_endpoint(risk: Optional[str] = None, municipality: Optional[str] = None,
+                                     barangay: Optional[str] = None, start: Optional[str] = None,
+                                     end: Optional[str] = None, format: str = 'json'):
+    """
+    FPM risk for every barangay-month in the weather history, in one call.
+
+    Query params (all optional):
+    - risk: HIGH, MEDIUM, LOW or a comma list (e.g. HIGH,LOW)
+    - municipality / barangay: place names (matched like the model names)
+    - start / end: YYYY-MM month range, inclusive
+    - format: 'json' (columns + rows arrays) or 'csv' (streamed download)
+    """
+    return await run_blocking(build_fpm_risk_scan_response, risk, municipality, barangay, start, end, format)
+
+
+def build_barangay_details(municipality: str, barangay: str):
+    """Blocking part of get_barangay_details (runs in the worker pool)."""
     key = f"{municipality}_{barangay}"
     
     if key not in MODELS:
         raise HTTPException(status_code=404, detail=f"Barangay not found: {key}")
     
-    model_data = MODELS[key]
-    
-    # Helper function to convert numpy to Python types
-    def to_python_type(value):
-        if hasattr(value, 'item'):  # numpy type
-            return value.item()
-        return value
-    
-    # Extract metrics with proper type conversion
-    # Try different metric key variations
-    print(f"\n🔍 DEBUG: Looking for metrics in model_data keys: {list(model_data.keys())}")
-    
-    # The model uses 'hybrid_mae' and 'hybrid_mase'
+    # Sidecar summary only - the pickle is loaded just if the forecast isn't stored yet
+    model_meta = MODELS.metadata(key)
+    hybrid_metrics = model_meta['hybrid_metrics']
     metrics = {
-        'mae': round(float(to_python_type(
-            model_data.get('hybrid_mae', model_data.get('val_mae', model_data.get('mae', 0)))
-        )), 2),
-        'rmse': round(float(to_python_type(
-            model_data.get('hybrid_rmse', model_data.get('val_rmse', model_data.get('rmse', 0)))
-        )), 2),
-        'mape': round(float(to_python_type(
-            model_data.get('hybrid_mape', model_data.get('val_mape', model_data.get('mape', 0)))
-        )), 2),
-        'r2': round(float(to_python_type(
-            model_data.get('hybrid_r2', model_data.get('val_r2', model_data.get('r2', 0)))
-        )), 3),
-        'mase': round(float(to_python_type(
-            model_data.get('hybrid_mase', model_data.get('val_mase', model_data.get('mase', 0)))
-        )), 3)
+        'mae': round(hybrid_metrics['mae'], 2),
+        'rmse': round(hybrid_metrics['rmse'], 2),
+        'mape': round(hybrid_metrics['mape'], 2),
+        'r2': round(hybrid_metrics['r2'], 3),
+        'mase': round(hybrid_metrics['mase'], 3)
     }
     
     print(f"📊 Extracted metrics: {metrics}")
     
     # Extract training data
-    train_data = []
-    if 'train_dates' in model_data:
-        for i in range(len(model_data['train_dates'])):
-            train_data.append({
-                'date': pd.Timestamp(model_data['train_dates'][i]).strftime('%Y-%m'),
-                'actual': float(to_python_type(model_data['train_actuals'][i])),
-                'predicted': float(to_python_type(model_data['train_predictions'][i]))
-            })
+    train_data = [
+        {'date': date[:7], 'actual': actual, 'predicted': predicted}
+        for date, actual, predicted in zip(
+            model_meta['train_dates'], model_meta['train_actuals'], model_meta['train_predictions']
+        )
+    ]
     
     print(f"📈 Training data points: {len(train_data)}")
     if train_data:
         print(f"   Sample: {train_data[0]}")
     
     # Extract validation data
-    val_data = []
-    if 'dates' in model_data:
-        for i in range(len(model_data['dates'])):
-            val_data.append({
-                'date': pd.Timestamp(model_data['dates'][i]).strftime('%Y-%m'),
-                'actual': float(to_python_type(model_data['actuals'][i])),
-                'predicted': float(to_python_type(model_data['predictions'][i]))
-            })
+    val_data = [
+        {'date': date[:7], 'actual': actual, 'predicted': predicted}
+        for date, actual, predicted in zip(model_meta['dates'], model_meta['actuals'], model_meta['predictions'])
+    ]
     
     print(f"📉 Validation data points: {len(val_data)}")
     if val_data:
         print(f"   Sample: {val_data[0]}")
     
-    # Get next month prediction
-    next_pred = predict_next_month(model_data)
+    # Get next month prediction (same forecast pass the municipality cards and risk use)
+    next_pred = get_forecast_summary(key)['next_month']
     
     response = {
         'success': True,
         'barangay': {
-            'municipality': str(model_data['municipality']),
-            'barangay': str(model_data['barangay']),
+            'municipality': model_meta['municipality'],
+            'barangay': model_meta['barangay'],
             'metrics': metrics,
             'training_data': train_data,
             'validation_data': val_data,
-            'next_month_prediction': round(float(to_python_type(next_pred)), 1) if next_pred else None,
+            'next_month_prediction': round(float(next_pred), 1) if next_pred else None,
             'has_chart_data': len(train_data) > 0 or len(val_data) > 0
         }
     }
@@ -1429,39 +2972,41 @@ async def get_barangay_details(municipality: str, barangay: str):
     return response
 
 
-@app.get("/api/forecast/{municipality}/{barangay}")
-async def get_future_forecast(municipality: str, barangay: str, months: int = 8):
-    """
-    Get future forecasts for a specific barangay.
-    Predicts up to 'months' months into the future (default: 8 months for safer approach).
-    """
+@app.get("/api/barangay/{municipality}/{barangay}")
+async def get_barangay_details(municipality: str, barangay: str):
+    """Get detailed data for specific barangay."""
+    return await run_blocking(build_barangay_details, municipality, barangay)
+
+
+def build_future_forecast(municipality: str, barangay: str, months: int = 8):
+    """Blocking part of get_future_forecast (runs in the worker pool)."""
     key = f"{municipality}_{barangay}"
     
     if key not in MODELS:
         raise HTTPException(status_code=404, detail=f"Barangay not found: {key}")
     
-    model_data = MODELS[key]
-    
     # Validate months parameter
-    if months < 1 or months > 24:
-        raise HTTPException(status_code=400, detail="Months must be between 1 and 24")
+    if months < 1 or months > FORECAST_HORIZON_MONTHS:
+        raise HTTPException(status_code=400, detail=f"Months must be between 1 and {FORECAST_HORIZON_MONTHS}")
     
-    # Get future predictions
-    future_predictions = predict_future_months(model_data, months_ahead=months)
+    # Get future predictions (prefix of the stored 24-month path)
+    forecast_summary = get_forecast_summary(key)
+    future_predictions = forecast_summary['forecast_path'][:months]
     
     if not future_predictions:
-        raise HTTPException(status_code=500, detail="Failed to generate predictions")
+        raise HTTPException(status_code=500, detail=forecast_summary.get('error') or "Failed to generate predictions")
     
-    # Get validation end date for context
-    validation_end = model_data.get('validation_end', model_data['training_end'])
+    # Get validation end date for context (sidecar metadata - no model load on a cache hit)
+    model_meta = MODELS.metadata(key)
+    validation_end = pd.Timestamp(model_meta['validation_end'])
     
-    print(f"🔮 Generated {len(future_predictions)} future predictions for {barangay}, {municipality}")
+    print(f"🔮 Serving {len(future_predictions)} future predictions for {barangay}, {municipality}")
     
     return {
         'success': True,
         'forecast': {
-            'municipality': str(model_data['municipality']),
-            'barangay': str(model_data['barangay']),
+            'municipality': str(model_meta['municipality']),
+            'barangay': str(model_meta['barangay']),
             'validation_end': validation_end.strftime('%Y-%m'),
             'forecast_start': future_predictions[0]['date'] if future_predictions else None,
             'forecast_end': future_predictions[-1]['date'] if future_predictions else None,
@@ -1470,29 +3015,38 @@ async def get_future_forecast(municipality: str, barangay: str, months: int = 8)
     }
 
 
-@app.get("/api/interpretability/{municipality}/{barangay}")
-async def get_model_interpretability(municipality: str, barangay: str):
+@app.get("/api/forecast/{municipality}/{barangay}")
+async def get_future_forecast(municipality: str, barangay: str, request: Request, months: int = 8):
     """
-    Get model interpretability data including:
-    - Trend decomposition
-    - Seasonality patterns
-    - Feature importance from XGBoost
-    - Changepoints detection
-    - Weather-Rabies pattern insights (FPM)
-    
-    This helps understand HOW the model makes predictions (not a black box!)
+    Get future forecasts for a specific barangay.
+    Predicts up to 'months' months into the future (default: 8 months for safer approach).
+    Responses carry an ETag from the model file and forecast version, so clients can revalidate with a 304.
     """
     key = f"{municipality}_{barangay}"
+    validators = None
+    if key in MODELS and 1 <= months <= FORECAST_HORIZON_MONTHS:
+        validators = get_forecast_validators(key, months)
+        if validators and is_not_modified(request, validators):
+            return Response(status_code=304, headers=validators)
+    
+    result = await run_blocking(build_future_forecast, municipality, barangay, months)
+    return JSONResponse(result, headers=validators)
+
+
+def build_interpretability_response(municipality: str, barangay: str):
+    """Blocking part of get_model_interpretability (runs in the worker pool)."""
+    key = f"{municipality}_{barangay}"
     
     if key not in MODELS:
         raise HTTPException(status_code=404, detail=f"Barangay not found: {key}")
     
-    model_data = MODELS[key]
+    # Sidecar metadata is enough here; the model is only loaded if the components aren't cached/precomputed
+    model_data = MODELS.metadata(key)
     
     print(f"🔍 Extracting interpretability components for {barangay}, {municipality}...")
     
     # Extract all interpretability components
-    interpretability_data = extract_model_components(model_data)
+    interpretability_data = get_model_components(key)
     
     if not interpretability_data['success']:
         raise HTTPException(
@@ -1615,139 +3169,6 @@ async def get_model_interpretability(municipality: str, barangay: str):
     return response
 
 
-# ==============================================
-# 📊 REPORT GENERATION ENDPOINTS
-# ==============================================
-    return {"success": True, "municipalities": result}
-
-@app.get("/api/barangay/{municipality}/{barangay}")
-async def get_barangay_details(municipality: str, barangay: str):
-    """Get detailed data for specific barangay."""
-    key = f"{municipality}_{barangay}"
-    
-    if key not in MODELS:
-        raise HTTPException(status_code=404, detail=f"Barangay not found: {key}")
-    
-    model_data = MODELS[key]
-    
-    # Helper function to convert numpy to Python types
-    def to_python_type(value):
-        if hasattr(value, 'item'):  # numpy type
-            return value.item()
-        return value
-    
-    # Extract metrics with proper type conversion
-    # Try different metric key variations
-    print(f"\n🔍 DEBUG: Looking for metrics in model_data keys: {list(model_data.keys())}")
-    
-    # The model uses 'hybrid_mae' and 'hybrid_mase'
-    metrics = {
-        'mae': round(float(to_python_type(
-            model_data.get('hybrid_mae', model_data.get('val_mae', model_data.get('mae', 0)))
-        )), 2),
-        'rmse': round(float(to_python_type(
-            model_data.get('hybrid_rmse', model_data.get('val_rmse', model_data.get('rmse', 0)))
-        )), 2),
-        'mape': round(float(to_python_type(
-            model_data.get('hybrid_mape', model_data.get('val_mape', model_data.get('mape', 0)))
-        )), 2),
-        'r2': round(float(to_python_type(
-            model_data.get('hybrid_r2', model_data.get('val_r2', model_data.get('r2', 0)))
-        )), 3),
-        'mase': round(float(to_python_type(
-            model_data.get('hybrid_mase', model_data.get('val_mase', model_data.get('mase', 0)))
-        )), 3)
-    }
-    
-    print(f"📊 Extracted metrics: {metrics}")
-    
-    # Extract training data
-    train_data = []
-    if 'train_dates' in model_data:
-        for i in range(len(model_data['train_dates'])):
-            train_data.append({
-                'date': pd.Timestamp(model_data['train_dates'][i]).strftime('%Y-%m'),
-                'actual': float(to_python_type(model_data['train_actuals'][i])),
-                'predicted': float(to_python_type(model_data['train_predictions'][i]))
-            })
-    
-    print(f"📈 Training data points: {len(train_data)}")
-    if train_data:
-        print(f"   Sample: {train_data[0]}")
-    
-    # Extract validation data
-    val_data = []
-    if 'dates' in model_data:
-        for i in range(len(model_data['dates'])):
-            val_data.append({
-                'date': pd.Timestamp(model_data['dates'][i]).strftime('%Y-%m'),
-                'actual': float(to_python_type(model_data['actuals'][i])),
-                'predicted': float(to_python_type(model_data['predictions'][i]))
-            })
-    
-    print(f"📉 Validation data points: {len(val_data)}")
-    if val_data:
-        print(f"   Sample: {val_data[0]}")
-    
-    # Get next month prediction
-    next_pred = predict_next_month(model_data)
-    
-    response = {
-        'success': True,
-        'barangay': {
-            'municipality': str(model_data['municipality']),
-            'barangay': str(model_data['barangay']),
-            'metrics': metrics,
-            'training_data': train_data,
-            'validation_data': val_data,
-            'next_month_prediction': round(float(to_python_type(next_pred)), 1) if next_pred else None,
-            'has_chart_data': len(train_data) > 0 or len(val_data) > 0
-        }
-    }
-    
-    print(f"✅ Returning response with chart data: {response['barangay']['has_chart_data']}\n")
-    return response
-
-@app.get("/api/forecast/{municipality}/{barangay}")
-async def get_future_forecast(municipality: str, barangay: str, months: int = 8):
-    """
-    Get future forecasts for a specific barangay.
-    Predicts up to 'months' months into the future (default: 8 months for safer approach).
-    """
-    key = f"{municipality}_{barangay}"
-    
-    if key not in MODELS:
-        raise HTTPException(status_code=404, detail=f"Barangay not found: {key}")
-    
-    model_data = MODELS[key]
-    
-    # Validate months parameter
-    if months < 1 or months > 24:
-        raise HTTPException(status_code=400, detail="Months must be between 1 and 24")
-    
-    # Get future predictions
-    future_predictions = predict_future_months(model_data, months_ahead=months)
-    
-    if not future_predictions:
-        raise HTTPException(status_code=500, detail="Failed to generate predictions")
-    
-    # Get validation end date for context
-    validation_end = model_data.get('validation_end', model_data['training_end'])
-    
-    print(f"🔮 Generated {len(future_predictions)} future predictions for {barangay}, {municipality}")
-    
-    return {
-        'success': True,
-        'forecast': {
-            'municipality': str(model_data['municipality']),
-            'barangay': str(model_data['barangay']),
-            'validation_end': validation_end.strftime('%Y-%m'),
-            'forecast_start': future_predictions[0]['date'] if future_predictions else None,
-            'forecast_end': future_predictions[-1]['date'] if future_predictions else None,
-            'predictions': future_predictions
-        }
-    }
-
 @app.get("/api/interpretability/{municipality}/{barangay}")
 async def get_model_interpretability(municipality: str, barangay: str):
     """
@@ -1756,369 +3177,421 @@ async def get_model_interpretability(municipality: str, barangay: str):
     - Seasonality patterns
     - Feature importance from XGBoost
     - Changepoints detection
+    - Weather-Rabies pattern insights (FPM)
     
     This helps understand HOW the model makes predictions (not a black box!)
     """
-    key = f"{municipality}_{barangay}"
+    return await run_blocking(build_interpretability_response, municipality, barangay)
+
+
+# ==============================================
+# 🏘️ MUNICIPALITY COMPARISON (shared by all reports)
+# ==============================================
+# The CSV report ranks sibling barangays by MAE only (sidecar metadata, no forecasts). The
+# "comparison with other barangays" tables in the PDF report need metrics and a 6-month
+# forecast for every sibling barangay. The forecasts are prefixes of the
+# FORECAST_STORE paths (batched, precompute-database backed), and the finished aggregate
+# is kept per municipality until one of its model files changes.
+COMPARISON_MONTHS = 6
+
+# Risk bands for MONTHLY case totals (forecasts are monthly), from the old daily cutoffs
+# (HIGH > 5 cases/day, MEDIUM > 2 cases/day). Shared by the comparison tables and the
+# per-month Risk_Level column of the reports.
+DAYS_PER_MONTH = 30
+MONTHLY_HIGH_RISK_CASES = 5 * DAYS_PER_MONTH  # 150 cases/month
+MONTHLY_MEDIUM_RISK_CASES = 2 * DAYS_PER_MONTH  # 60 cases/month
+
+COMPARISON_CACHE = {}  # MUNICIPALITY -> (keys, signatures, comparison)
+_COMPARISON_CACHE_LOCK = threading.Lock()
+
+
+def municipality_model_keys(municipality):
+    """Model keys of every barangay in a municipality (case-insensitive)."""
+    prefix = f"{municipality}_".upper()
+    return [key for key in MODELS if key.upper().startswith(prefix)]
+
+
+def municipality_signatures(municipality):
+    """(model keys, model file signatures) of a municipality - what its comparison depends on."""
+    keys = municipality_model_keys(municipality)
+    return keys, [get_model_signature(key) for key in keys]
+
+
+def comparison_risk_level(avg_cases_monthly):
+    """Risk level of a barangay from its average projected cases per month."""
+    if avg_cases_monthly > MONTHLY_HIGH_RISK_CASES:
+        return "HIGH"
+    elif avg_cases_monthly > MONTHLY_MEDIUM_RISK_CASES:
+        return "MEDIUM"
+    return "LOW"
+
+
+def comparison_metric_rows(keys):
+    """One comparison row per model with its validation metrics (sidecar metadata only)."""
+    rows = []
+    for key in keys:
+        metrics = MODELS.metadata(key)['metrics']
+        rows.append({
+            'barangay': key.split('_', 1)[1],  # Keep original case
+            'model_key': key,
+            'mae': metrics.get('mae', 'N/A'),
+            'rmse': metrics.get('rmse', 'N/A'),
+            'r2': metrics.get('r2', 'N/A'),
+            'mase': metrics.get('mase', 'N/A')
+        })
+    return rows
+
+
+def rank_by_mae(rows):
+    """Rows sorted best MAE first, each with its 'mae_rank' (missing MAE last)."""
+    by_mae = sorted(rows, key=lambda x: float(x['mae']) if isinstance(x['mae'], (int, float)) else 999)
+    for rank, row in enumerate(by_mae, 1):
+        row['mae_rank'] = rank
+    return by_mae
+
+
+def get_municipality_mae_ranking(municipality):
+    """A municipality's barangays ranked by MAE - metadata only, no forecasts (CSV report)."""
+    return rank_by_mae(comparison_metric_rows(municipality_model_keys(municipality)))
+
+
+def build_municipality_comparison(keys):
+    """
+    Comparison aggregate for one municipality's models.
     
-    if key not in MODELS:
-        raise HTTPException(status_code=404, detail=f"Barangay not found: {key}")
+    Returns:
+        {'by_mae': every barangay, best MAE first (with 'mae_rank'),
+         'by_forecast': barangays with a forecast, highest avg cases/month first (with 'forecast_rank')}
+    """
+    refresh_forecast_store(keys)  # one batched pass for whatever isn't stored yet
+    
+    rows = comparison_metric_rows(keys)
+    for row in rows:
+        entry = FORECAST_STORE.get(row['model_key'])
+        forecast = entry['forecast_path'][:COMPARISON_MONTHS] if entry else []
+        if forecast:
+            monthly_cases = np.array([p['predicted'] for p in forecast], dtype=np.float64)
+            avg_cases = float(monthly_cases.mean())
+            peak = int(monthly_cases.argmax())
+            row.update({
+                'avg_cases_monthly': avg_cases,  # Average cases per MONTH
+                'max_cases_monthly': float(monthly_cases[peak]),  # Peak month
+                'peak_month': forecast[peak]['date'],
+                'total_cases': float(monthly_cases.sum()),
+                'high_risk_months': int((monthly_cases > MONTHLY_HIGH_RISK_CASES).sum()),
+                'risk_level': comparison_risk_level(avg_cases)
+            })
+        else:
+            print(f"⚠️ No predictions for {row['barangay']}")
     
-    model_data = MODELS[key]
+    by_mae = rank_by_mae(rows)
     
-    print(f"🔍 Extracting interpretability components for {barangay}, {municipality}...")
+    by_forecast = sorted((row for row in rows if 'avg_cases_monthly' in row),
+                         key=lambda x: x['avg_cases_monthly'], reverse=True)
+    for rank, row in enumerate(by_forecast, 1):
+        row['forecast_rank'] = rank
     
-    # Extract all interpretability components
-    interpretability_data = extract_model_components(model_data)
+    return {'by_mae': by_mae, 'by_forecast': by_forecast}
+
+
+def get_municipality_comparison(municipality):
+    """
+    build_municipality_comparison() for a municipality, memoized until its set of models
+    or any of their files changes. Shared between requests - treat it as read-only.
+    """
+    keys, signatures = municipality_signatures(municipality)
+    cache_key = municipality.upper()
     
-    if not interpretability_data['success']:
-        raise HTTPException(
-            status_code=500, 
-            detail=f"Failed to extract model components: {interpretability_data.get('error', 'Unknown error')}"
-        )
+    with _COMPARISON_CACHE_LOCK:
+        cached = COMPARISON_CACHE.get(cache_key)
+        if cached is not None and cached[0] == keys and cached[1] == signatures:
+            return cached[2]
     
-    response = {
-        'success': True,
-        'interpretability': {
-            'municipality': str(model_data['municipality']),
-            'barangay': str(model_data['barangay']),
-            
-            # Time series decomposition
-            'trend': {
-                'dates': interpretability_data['components']['dates'],
-                'values': interpretability_data['components']['trend'],
-                'description': 'Long-term direction of rabies cases (upward/downward pattern)'
-            },
-            
-            'seasonality': {
-                'dates': interpretability_data['components']['dates'],
-                'values': interpretability_data['components']['yearly_seasonality'],
-                'description': 'Recurring yearly patterns (e.g., higher cases in certain months)'
-            },
-            
-            # Holiday effects (NEW!)
-            'holidays': {
-                'dates': interpretability_data['components']['dates'],
-                'values': interpretability_data['components']['holidays'],
-                'description': 'Philippine public holiday effects on rabies cases',
-                'significant_effects': interpretability_data['holiday_effects'],
-                'has_holidays': interpretability_data['has_holidays']
-            },
-            
-            # 🆕 Weather regressors
-            'weather_regressors': {
-                'data': interpretability_data['components']['weather_regressors'],
-                'description': 'Weather factors impact on rabies cases (temperature, humidity, precipitation, etc.)',
-                'columns': list(interpretability_data['components']['weather_regressors'].keys())
-            },
-            
-            # 🆕 Vaccination regressors (ANTIPOLO only)
-            'vaccination_regressors': {
-                'data': interpretability_data['components']['vaccination_regressors'],
-                'description': 'Vaccination campaign impact on rabies cases',
-                'columns': list(interpretability_data['components']['vaccination_regressors'].keys())
-            },
-            
-            # 🆕 Seasonal regressors (CAINTA/ANGONO)
-            'seasonal_regressors': {
-                'data': interpretability_data['components']['seasonal_regressors'],
-                'description': 'Custom seasonal patterns specific to this municipality',
-                'columns': list(interpretability_data['components']['seasonal_regressors'].keys())
-            },
-            
-            # Feature importance from XGBoost
-            'feature_importance': {
-                'features': interpretability_data['feature_importance'],
-                'description': 'Which factors contribute most to predictions',
-                'top_3_features': interpretability_data['feature_importance'][:3]
-            },
-            
-            # Changepoints
-            'changepoints': {
-                'points': interpretability_data['changepoints'],
-                'description': 'Dates where the trend significantly changed (e.g., policy changes, outbreaks)'
-            },
-            
-            # Model configuration info
-            'model_config': interpretability_data['model_info']
-        }
-    }
+    comparison = build_municipality_comparison(keys)
     
-    print(f"✅ Interpretability data extracted successfully")
-    print(f"   - Trend points: {len(interpretability_data['components']['trend'])}")
-    print(f"   - Seasonality points: {len(interpretability_data['components']['yearly_seasonality'])}")
-    print(f"   - Holiday points: {len(interpretability_data['components']['holidays'])}")
-    print(f"   - Holidays configured: {interpretability_data['has_holidays']}")
-    print(f"   - Significant holiday effects: {len(interpretability_data['holiday_effects'])}")
-    print(f"   - Weather regressors: {len(interpretability_data['components']['weather_regressors'])}")
-    print(f"   - Vaccination regressors: {len(interpretability_data['components']['vaccination_regressors'])}")
-    print(f"   - Seasonal regressors: {len(interpretability_data['components']['seasonal_regressors'])}")
-    print(f"   - Feature importance: {len(interpretability_data['feature_importance'])} features")
-    print(f"   - Changepoints detected: {len(interpretability_data['changepoints'])}\n")
+    # Incomplete aggregates (a forecast failed) aren't cached so the next report retries
+    if len(comparison['by_forecast']) == len(keys):
+        with _COMPARISON_CACHE_LOCK:
+            COMPARISON_CACHE[cache_key] = (keys, signatures, comparison)
+    return comparison
+
+
+def comparison_rank(rows, barangay, rank_field):
+    """Rank of a barangay in a comparison list (case-insensitive), -1 if absent."""
+    return next((row[rank_field] for row in rows if row['barangay'].upper() == barangay.upper()), -1)
+
+
+# ==============================================
+# 📄 CSV REPORT ENGINE (monthly)
+# ==============================================
+# The models are trained on monthly (MS) data, so the report has one row per forecast
+# month instead of 180 daily rows. Every column comes out of ONE NeuralProphet pass
+# (prediction + decomposition) and ONE XGBoost pass, and the finished frame is kept
+# per model file so repeat downloads only format text.
+REPORT_FORECAST_MONTHS = 6  # same ~180-day window the daily report covered
+REPORT_COLUMNS = [
+    'Date', 'Predicted_Cases', 'Risk_Level', 'Trend_Component', 'Seasonal_Component',
+    'Holiday_Effect', 'Weather_Impact', 'Vaccination_Impact'
+]
+
+REPORT_FRAME_CACHE = OrderedDict()  # model key -> (signature, report frame)
+_REPORT_FRAME_CACHE_LOCK = threading.Lock()
+
+
+def report_risk_levels(monthly_cases):
+    """HIGH / MEDIUM / LOW for a whole column of monthly case totals (same bands as comparison_risk_level)."""
+    monthly_cases = np.asarray(monthly_cases, dtype=np.float64)
+    return np.select(
+        [monthly_cases > MONTHLY_HIGH_RISK_CASES, monthly_cases > MONTHLY_MEDIUM_RISK_CASES],
+        ['HIGH', 'MEDIUM'], default='LOW'
+    )
+
+
+def sum_regressor_impact(regressors, n_rows):
+    """Per-month total contribution of a regressor group ({col: [values]}) -> array."""
+    if not regressors:
+        return np.zeros(n_rows)
+    return np.round(np.asarray(list(regressors.values()), dtype=np.float64).sum(axis=0), 2)
+
+
+def build_report_frame(model_data, months=REPORT_FORECAST_MONTHS):
+    """
+    Monthly forecast report for a model: hybrid prediction, risk level and the
+    NeuralProphet components of each forecast month.
     
-    return response
+    Forecast months start after validation_end, like /api/forecast, so Predicted_Cases
+    matches the forecast path for the same months.
+    """
+    _, future_dates, _ = forecast_anchor_dates(model_data['training_end'], model_data.get('validation_end'), months)
+    future_df = build_future_frame(model_data, future_dates)
+    
+    # One predict gives yhat1 and every component column
+    np_forecast = np_predict(model_data['np_model'], future_df)
+    hybrid_preds = score_hybrid(model_data['xgb_model'], future_dates, np_forecast['yhat1'].to_numpy()[:months])
+    
+    regressors = model_data.get('regressors', {})
+    vax_cols = []
+    if model_data.get('municipality', '') == "CITY OF ANTIPOLO":
+        vax_cols = regressors.get('vaccination') or [col for col in future_df.columns if 'vaccination' in col]
+    components = extract_component_series(
+        np_forecast, future_dates, component_column(np_forecast, ['events_additive']),
+        regressors.get('weather', []), vax_cols, regressors.get('seasonal', [])
+    )
+    
+    return pd.DataFrame({
+        'Date': future_dates.strftime('%Y-%m'),
+        'Predicted_Cases': np.round(hybrid_preds, 2),
+        'Risk_Level': report_risk_levels(hybrid_preds),
+        'Trend_Component': components['trend'],
+        'Seasonal_Component': components['yearly_seasonality'],
+        'Holiday_Effect': components['holidays'],
+        'Weather_Impact': sum_regressor_impact(components['weather_regressors'], months),
+        'Vaccination_Impact': sum_regressor_impact(components['vaccination_regressors'], months)
+    }, columns=REPORT_COLUMNS)
 
-# ==============================================
-# 📊 REPORT GENERATION ENDPOINTS
-# ==============================================
 
-@app.get("/api/report/csv/{municipality}/{barangay}")
-async def generate_csv_report(municipality: str, barangay: str):
+def get_report_frame(key):
     """
-    Generate CSV report with forecast and interpretability data
+    build_report_frame() for a model key (precomputed database first), memoized until
+    the model file changes (LRU).
     """
-    print(f"\n📄 Generating CSV report for {municipality} - {barangay}")
-    
-    # Get the model - try exact match first, then case-insensitive
+    signature = get_model_signature(key)
+    with _REPORT_FRAME_CACHE_LOCK:
+        cached = REPORT_FRAME_CACHE.get(key)
+        if cached is not None and cached[0] == signature:
+            REPORT_FRAME_CACHE.move_to_end(key)
+            return cached[1]
+    
+    report_df = load_precomputed_report(key, signature)
+    if report_df is None:
+        report_df = build_report_frame(MODELS[key])
+    if signature is not None:
+        with _REPORT_FRAME_CACHE_LOCK:
+            REPORT_FRAME_CACHE[key] = (signature, report_df)
+            REPORT_FRAME_CACHE.move_to_end(key)
+            while len(REPORT_FRAME_CACHE) > COMPONENTS_CACHE_SIZE:
+                REPORT_FRAME_CACHE.popitem(last=False)
+    return report_df
+
+
+def find_model_key(municipality, barangay):
+    """Model key for a municipality/barangay - exact match first, then case-insensitive (None if missing)."""
     model_key = f"{municipality}_{barangay}"
-    print(f"🔍 Looking for model key: {model_key}")
-    print(f"📋 Available models: {list(MODELS.keys())[:5]}...")  # Show first 5
+    if model_key in MODELS:
+        return model_key
+    model_key_upper = model_key.upper()
+    return next((key for key in MODELS.keys() if key.upper() == model_key_upper), None)
+
+
+def iter_csv_report(municipality, barangay, metrics, report_df, municipality_barangays):
+    """
+    Stream the CSV report: metadata header, barangay comparison, then the forecast rows.
+    municipality_barangays is get_municipality_mae_ranking() (best MAE first).
+    """
+    yield (
+        f"# Rabies Forecast Report\n"
+        f"# Municipality: {municipality}\n"
+        f"# Barangay: {barangay}\n"
+        f"# Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+        f"# Forecast Period: {len(report_df)} months (monthly, matching the model's training data)\n"
+        f"#\n"
+        f"# Model Metrics:\n"
+        f"# - MAE: {metrics.get('mae', 'N/A')}\n"
+        f"# - RMSE: {metrics.get('rmse', 'N/A')}\n"
+        f"# - R²: {metrics.get('r2', 'N/A')}\n"
+        f"# - MASE: {metrics.get('mase', 'N/A')}\n"
+        f"#\n"
+    )
+    
+    # === BARANGAY COMPARISON (Professor's Requirement) ===
+    current_rank = comparison_rank(municipality_barangays, barangay, 'mae_rank')
+    
+    lines = [
+        f"# === COMPARISON WITH OTHER BARANGAYS IN {municipality} ===",
+        "#",
+        f"# {barangay} ranks #{current_rank} out of {len(municipality_barangays)} barangays in {municipality}",
+        "# (Ranked by MAE - lower is better)",
+        "#",
+        "# Barangay,MAE,RMSE,R2,MASE,Status"
+    ]
+    for idx, brgy in enumerate(municipality_barangays[:10], 1):  # Top 10
+        status = ">>> THIS BARANGAY <<<" if brgy['barangay'].upper() == barangay.upper() else ""
+        lines.append(f"# {idx}. {brgy['barangay']},{brgy['mae']},{brgy['rmse']},{brgy['r2']},{brgy['mase']},{status}")
+    lines += ["#", "# === END COMPARISON ===", "#"]
+    yield '\n'.join(lines) + '\n'
+    
+    # Forecast data
+    yield report_df.to_csv(index=False)
+
+
+# ==============================================
+# 🖼️ PDF CHART CACHE
+# ==============================================
+# Report charts only depend on the data they plot, so rendered PNGs are stored on disk
+# under a hash of (model key, chart type, plotted data). A re-download - or another
+# user's download of the same barangay - reuses the file and skips matplotlib.
+# Files are shared by every server process; the least recently used are evicted once
+# the directory grows past CHART_CACHE_MAX_MB.
+CHART_CACHE_DIR = os.getenv("CHART_CACHE_DIR", "chart_cache")
+CHART_CACHE_MAX_MB = float(os.getenv("CHART_CACHE_MAX_MB", "64"))
+CHART_CACHE_VERSION = 2  # bump when a chart_rendering function's styling changes
+
+_CHART_CACHE_LOCK = threading.Lock()
+
+
+def chart_cache_key(model_key, chart_type, data):
+    """Content address of a chart: hash of the model key, chart type and plotted data."""
+    payload = json.dumps([CHART_CACHE_VERSION, model_key, chart_type, data], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def evict_chart_cache(max_bytes=None):
+    """Delete least recently used PNGs until the cache fits in max_bytes."""
+    max_bytes = CHART_CACHE_MAX_MB * 1024 * 1024 if max_bytes is None else max_bytes
+    try:
+        entries = []
+        with os.scandir(CHART_CACHE_DIR) as it:
+            for entry in it:
+                if entry.name.endswith('.png'):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+    except FileNotFoundError:
+        return 0
+    
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for _, size, path in sorted(entries):  # oldest use first
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            removed += 1
+        except FileNotFoundError:
+            pass  # already evicted by another process
+        total -= size
+    return removed
+
+
+def get_chart_png(model_key, chart_type, data):
+    """
+    PNG bytes for a report chart, rendered at most once per distinct input.
     
-    model_data = None
+    Args:
+        model_key: Model the chart belongs to
+        chart_type: One of chart_rendering.CHART_RENDERERS
+        data: JSON-serializable plot input (lists/dicts of plain values)
+    """
+    path = os.path.join(CHART_CACHE_DIR, f"{chart_cache_key(model_key, chart_type, data)}.png")
+    try:
+        with open(path, 'rb') as f:
+            png = f.read()
+    except OSError:
+        png = None
+    if png is not None:
+        try:
+            os.utime(path)  # mark as recently used
+        except OSError:
+            pass  # evicted meanwhile - the bytes are already read
+        return png
+    
+    from chart_rendering import render_chart  # matplotlib is only imported once a chart is drawn
+    png = render_chart(chart_type, data)
     
-    # Try exact match first
-    if model_key in MODELS:
-        model_data = MODELS[model_key]
-    else:
-        # Try case-insensitive match
-        model_key_upper = model_key.upper()
-        for key in MODELS.keys():
-            if key.upper() == model_key_upper:
-                model_data = MODELS[key]
-                print(f"✅ Found case-insensitive match: {key}")
-                break
+    try:
+        os.makedirs(CHART_CACHE_DIR, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(png)
+        os.replace(tmp_path, path)
+        with _CHART_CACHE_LOCK:
+            evict_chart_cache()
+    except OSError as e:
+        print(f"   ⚠️ Could not write chart cache ({e})")
+    return png
+
+
+# ==============================================
+# 📊 REPORT GENERATION ENDPOINTS
+# ==============================================
+
+def build_csv_report(municipality: str, barangay: str):
+    """Blocking part of generate_csv_report (runs in the worker pool)."""
+    print(f"\n📄 Generating CSV report for {municipality} - {barangay}")
     
-    if model_data is None:
-        raise HTTPException(status_code=404, detail=f"Model not found: {model_key}. Available: {list(MODELS.keys())}")
+    model_key = find_model_key(municipality, barangay)
+    if model_key is None:
+        raise HTTPException(status_code=404, detail=f"Model not found: {municipality}_{barangay}. Available: {list(MODELS.keys())}")
     
-    # Generate forecast
+    # Forecast rows are computed up front so errors still become a 500, not a truncated download
     try:
-        # Get the last date from the model (use validation_end or training_end)
-        last_date = model_data.get('validation_end', model_data.get('training_end'))
-        if last_date is None:
-            # Fallback: get from validation dates
-            if 'dates' in model_data and len(model_data['dates']) > 0:
-                last_date = pd.Timestamp(model_data['dates'][-1])
-            else:
-                raise ValueError("Cannot determine last date from model data")
-        
-        future_dates = pd.date_range(
-            start=last_date + pd.Timedelta(days=1),
-            periods=180,
-            freq='D'
-        )
-        
-        forecast_df = pd.DataFrame({
-            'ds': future_dates,
-            'y': [0] * len(future_dates)  # Dummy values for prediction
-        })
-        
-        # Add regressors (handle both dict and DataFrame formats)
-        if 'weather_data' in model_data and model_data['weather_data'] is not None:
-            weather_data = model_data['weather_data']
-            
-            # Handle dict format (column -> list)
-            if isinstance(weather_data, dict):
-                weather_cols = [col for col in weather_data.keys() if col != 'ds']
-                for col in weather_cols:
-                    # Use mean of training data
-                    forecast_df[col] = np.mean(weather_data[col]) if len(weather_data[col]) > 0 else 0.0
-            # Handle DataFrame format
-            elif hasattr(weather_data, 'columns'):
-                weather_cols = [col for col in weather_data.columns if col != 'ds']
-                for col in weather_cols:
-                    forecast_df[col] = weather_data[col].mean()
-        
-        if 'vaccination_data' in model_data and model_data['vaccination_data'] is not None:
-            vax_data = model_data['vaccination_data']
-            
-            # Handle dict format
-            if isinstance(vax_data, dict):
-                vax_cols = [col for col in vax_data.keys() if col != 'ds']
-                for col in vax_cols:
-                    forecast_df[col] = 0
-            # Handle DataFrame format
-            elif hasattr(vax_data, 'columns'):
-                vax_cols = [col for col in vax_data.columns if col != 'ds']
-                for col in vax_cols:
-                    forecast_df[col] = 0
-        
-        if 'seasonal_data' in model_data and model_data['seasonal_data'] is not None:
-            if municipality.upper() == 'CAINTA':
-                forecast_df = add_cainta_seasonal_features(forecast_df)
-            elif municipality.upper() == 'ANGONO':
-                forecast_df = add_angono_seasonal_features(forecast_df)
-        
-        # Make predictions
-        np_forecast = model_data['np_model'].predict(forecast_df)
-        forecast_df['yhat1'] = np_forecast['yhat1']
-        
-        # 🔥 FIX: Prepare XGBoost features properly (don't pass all columns!)
-        # XGBoost was trained on specific engineered features, not raw data
-        xgb_predictions = []
-        for idx in range(len(forecast_df)):
-            row = forecast_df.iloc[idx]
-            X_future = pd.DataFrame({
-                'Year': [row['ds'].year],
-                'Month': [row['ds'].month],
-                'lag_1': [0],
-                'lag_2': [0],
-                'rolling_mean_3': [0],
-                'rolling_std_3': [0],
-                'lag_12': [0],
-                'month_sin': [np.sin(2 * np.pi * row['ds'].month / 12)],
-                'month_cos': [np.cos(2 * np.pi * row['ds'].month / 12)],
-                'rate_of_change_1': [0],
-                'np_prediction': [row['yhat1']]
-            })
-            xgb_predictions.append(model_data['xgb_model'].predict(X_future)[0])
-        
-        forecast_df['yhat'] = np.maximum(0, xgb_predictions)
-        
-        # Get interpretability components
-        interpretability_data = extract_model_components(model_data)
-        components_df = pd.DataFrame(interpretability_data['components'])
-        
-        # Merge forecast with components (use last available component values)
-        if len(components_df) > 0:
-            last_trend = components_df['trend'].iloc[-1]
-            last_seasonality = components_df['yearly_seasonality'].iloc[-1]
-            last_holiday = components_df['holidays'].iloc[-1]
-        else:
-            last_trend = 0
-            last_seasonality = 0
-            last_holiday = 0
-        
-        # Calculate risk levels
-        def calculate_risk(cases):
-            if cases > 5:
-                return "HIGH"
-            elif cases > 2:
-                return "MEDIUM"
-            else:
-                return "LOW"
-        
-        # Create report DataFrame (build columns explicitly to avoid "Mixing dicts" error)
-        date_col = forecast_df['ds'].dt.strftime('%Y-%m-%d').tolist()
-        predicted_cases_col = forecast_df['yhat'].round(2).tolist()
-        risk_level_col = [calculate_risk(val) for val in forecast_df['yhat']]
-        trend_col = [last_trend] * len(forecast_df)
-        seasonal_col = [last_seasonality] * len(forecast_df)
-        holiday_col = [last_holiday] * len(forecast_df)
-        
-        report_df = pd.DataFrame({
-            'Date': date_col,
-            'Predicted_Cases': predicted_cases_col,
-            'Risk_Level': risk_level_col,
-            'Trend_Component': trend_col,
-            'Seasonal_Component': seasonal_col,
-            'Holiday_Effect': holiday_col
-        })
-        
-        # Add weather impact summary
-        if 'weather_regressors' in interpretability_data['components']:
-            weather_impact = sum(interpretability_data['components']['weather_regressors'].values(), [])
-            if weather_impact:
-                report_df['Weather_Impact'] = np.mean(weather_impact)
-            else:
-                report_df['Weather_Impact'] = 0
-        else:
-            report_df['Weather_Impact'] = 0
-        
-        # Add vaccination impact summary
-        if 'vaccination_regressors' in interpretability_data['components']:
-            vax_impact = sum(interpretability_data['components']['vaccination_regressors'].values(), [])
-            if vax_impact:
-                report_df['Vaccination_Impact'] = np.mean(vax_impact)
-            else:
-                report_df['Vaccination_Impact'] = 0
-        else:
-            report_df['Vaccination_Impact'] = 0
-        
-        # Convert to CSV
-        csv_buffer = io.StringIO()
-        
-        # Add metadata header
-        csv_buffer.write(f"# Rabies Forecast Report\n")
-        csv_buffer.write(f"# Municipality: {municipality}\n")
-        csv_buffer.write(f"# Barangay: {barangay}\n")
-        csv_buffer.write(f"# Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-        csv_buffer.write(f"# Forecast Period: 180 days\n")
-        csv_buffer.write(f"#\n")
-        csv_buffer.write(f"# Model Metrics:\n")
-        csv_buffer.write(f"# - MAE: {model_data.get('metrics', {}).get('mae', 'N/A')}\n")
-        csv_buffer.write(f"# - RMSE: {model_data.get('metrics', {}).get('rmse', 'N/A')}\n")
-        csv_buffer.write(f"# - R²: {model_data.get('metrics', {}).get('r2', 'N/A')}\n")
-        csv_buffer.write(f"# - MASE: {model_data.get('metrics', {}).get('mase', 'N/A')}\n")
-        csv_buffer.write(f"#\n")
-        
-        # === BARANGAY COMPARISON (Professor's Requirement) ===
-        csv_buffer.write(f"# === COMPARISON WITH OTHER BARANGAYS IN {municipality} ===\n")
-        csv_buffer.write(f"#\n")
-        
-        # Get all barangays in the same municipality
-        municipality_barangays = []
-        municipality_prefix = f"{municipality}_"
-        
-        for key, mdata in MODELS.items():
-            # Case-insensitive comparison for municipality
-            if key.upper().startswith(municipality_prefix.upper()):
-                brgy_name = key.split('_', 1)[1]  # Keep original case
-                metrics = mdata.get('metrics', {})
-                municipality_barangays.append({
-                    'Barangay': brgy_name,
-                    'MAE': metrics.get('mae', 'N/A'),
-                    'RMSE': metrics.get('rmse', 'N/A'),
-                    'R2': metrics.get('r2', 'N/A'),
-                    'MASE': metrics.get('mase', 'N/A'),
-                    'Avg_Prediction': forecast_df['yhat'].mean() if key.upper() == f"{municipality}_{barangay}".upper() else 'N/A'
-                })
-        
-        # Sort by MAE (best performing first)
-        municipality_barangays.sort(key=lambda x: float(x['MAE']) if isinstance(x['MAE'], (int, float)) else 999)
-        
-        # Find rank of current barangay (case-insensitive)
-        current_rank = next((i+1 for i, b in enumerate(municipality_barangays) 
-                            if b['Barangay'].upper() == barangay.upper()), -1)
-        
-        csv_buffer.write(f"# {barangay} ranks #{current_rank} out of {len(municipality_barangays)} barangays in {municipality}\n")
-        csv_buffer.write(f"# (Ranked by MAE - lower is better)\n")
-        csv_buffer.write(f"#\n")
-        
-        # Write comparison table
-        csv_buffer.write(f"# Barangay,MAE,RMSE,R2,MASE,Status\n")
-        for idx, brgy in enumerate(municipality_barangays[:10], 1):  # Top 10
-            status = ">>> THIS BARANGAY <<<" if brgy['Barangay'].upper() == barangay.upper() else ""
-            csv_buffer.write(f"# {idx}. {brgy['Barangay']},{brgy['MAE']},{brgy['RMSE']},{brgy['R2']},{brgy['MASE']},{status}\n")
-        csv_buffer.write(f"#\n")
-        csv_buffer.write(f"# === END COMPARISON ===\n")
-        csv_buffer.write(f"#\n")
-        
-        # Add forecast data
-        report_df.to_csv(csv_buffer, index=False)
-        
-        # Create response
-        csv_buffer.seek(0)
-        filename = f"rabies_forecast_{municipality}_{barangay}_{datetime.now().strftime('%Y%m%d')}.csv"
-        
-        return StreamingResponse(
-            iter([csv_buffer.getvalue()]),
-            media_type="text/csv",
-            headers={
-                "Content-Disposition": f"attachment; filename={filename}"
-            }
-        )
-        
+        report_df = get_report_frame(model_key)
     except Exception as e:
         print(f"❌ Error generating CSV report: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to generate CSV report: {str(e)}")
+    
+    metrics = MODELS.metadata(model_key)['metrics']
+    mae_ranking = get_municipality_mae_ranking(municipality)  # the CSV only ranks by MAE - no sibling forecasts
+    filename = f"rabies_forecast_{municipality}_{barangay}_{datetime.now().strftime('%Y%m%d')}.csv"
+    
+    return StreamingResponse(
+        iter_csv_report(municipality, barangay, metrics, report_df, mae_ranking),
+        media_type="text/csv",
+        headers={
+            "Content-Disposition": f"attachment; filename={filename}"
+        }
+    )
 
 
-@app.get("/api/report/pdf/{municipality}/{barangay}")
-async def generate_pdf_report(municipality: str, barangay: str):
+@app.get("/api/report/csv/{municipality}/{barangay}")
+async def generate_csv_report(municipality: str, barangay: str):
     """
-    Generate PDF report with forecast and interpretability visualizations
+    Generate CSV report with forecast and interpretability data
     """
+    return await run_blocking(build_csv_report, municipality, barangay)
+
+
+def render_pdf_report(municipality: str, barangay: str):
+    """Forecast PDF report as (pdf bytes, download filename)."""
     print(f"\n📄 Generating PDF report for {municipality} - {barangay}")
     
     try:
@@ -2128,9 +3601,7 @@ async def generate_pdf_report(municipality: str, barangay: str):
         from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak, Image
         from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
         from reportlab.lib.enums import TA_CENTER, TA_LEFT
-        import matplotlib
-        matplotlib.use('Agg')
-        import matplotlib.pyplot as plt
+        import chart_rendering  # matplotlib Figure/FigureCanvasAgg (no pyplot)
         
     except ImportError:
         raise HTTPException(
@@ -2138,119 +3609,19 @@ async def generate_pdf_report(municipality: str, barangay: str):
             detail="PDF generation requires: pip install reportlab matplotlib"
         )
     
-    # Get the model - try exact match first, then case-insensitive
-    model_key = f"{municipality}_{barangay}"
-    print(f"🔍 Looking for model key: {model_key}")
-    
-    model_data = None
-    
-    # Try exact match first
-    if model_key in MODELS:
-        model_data = MODELS[model_key]
-    else:
-        # Try case-insensitive match
-        model_key_upper = model_key.upper()
-        for key in MODELS.keys():
-            if key.upper() == model_key_upper:
-                model_data = MODELS[key]
-                print(f"✅ Found case-insensitive match: {key}")
-                break
-    
-    if model_data is None:
-        raise HTTPException(status_code=404, detail=f"Model not found: {model_key}. Available: {list(MODELS.keys())}")
-    
-    # Generate forecast
-    # Get the last date from the model (use validation_end or training_end)
-    last_date = model_data.get('validation_end', model_data.get('training_end'))
-    if last_date is None:
-        # Fallback: get from validation dates
-        if 'dates' in model_data and len(model_data['dates']) > 0:
-            last_date = pd.Timestamp(model_data['dates'][-1])
-        else:
-            raise ValueError("Cannot determine last date from model data")
-    
-    future_dates = pd.date_range(
-        start=last_date + pd.Timedelta(days=1),
-        periods=180,
-        freq='D'
-    )
-    
-    forecast_df = pd.DataFrame({
-        'ds': future_dates,
-        'y': [0] * len(future_dates)  # Dummy values for prediction
-    })
-    
-    # 🔍 DEBUG: Check types
-    print(f"   🔍 weather_data type: {type(model_data.get('weather_data'))}")
-    print(f"   🔍 vaccination_data type: {type(model_data.get('vaccination_data'))}")
-    print(f"   🔍 seasonal_data type: {type(model_data.get('seasonal_data'))}")
-    
-    # Add regressors (handle both dict and DataFrame formats)
-    if 'weather_data' in model_data and model_data['weather_data'] is not None:
-        weather_data = model_data['weather_data']
-        
-        # Handle dict format (column -> list)
-        if isinstance(weather_data, dict):
-            weather_cols = [col for col in weather_data.keys() if col != 'ds']
-            for col in weather_cols:
-                # Use mean of training data
-                forecast_df[col] = np.mean(weather_data[col]) if len(weather_data[col]) > 0 else 0.0
-        # Handle DataFrame format
-        elif hasattr(weather_data, 'columns'):
-            weather_cols = [col for col in weather_data.columns if col != 'ds']
-            for col in weather_cols:
-                forecast_df[col] = weather_data[col].mean()
-    
-    if 'vaccination_data' in model_data and model_data['vaccination_data'] is not None:
-        vax_data = model_data['vaccination_data']
-        
-        # Handle dict format
-        if isinstance(vax_data, dict):
-            vax_cols = [col for col in vax_data.keys() if col != 'ds']
-            for col in vax_cols:
-                forecast_df[col] = 0
-        # Handle DataFrame format
-        elif hasattr(vax_data, 'columns'):
-            vax_cols = [col for col in vax_data.columns if col != 'ds']
-            for col in vax_cols:
-                forecast_df[col] = 0
-    
-    # 🆕 ADD SEASONAL FEATURES (models now trained with them!)
-    if municipality.upper() == 'CAINTA':
-        forecast_df = add_cainta_seasonal_features(forecast_df)
-        print(f"   🎯 Added CAINTA seasonal features for PDF forecast")
-    elif municipality.upper() == 'ANGONO':
-        forecast_df = add_angono_seasonal_features(forecast_df)
-        print(f"   🎯 Added ANGONO seasonal features for PDF forecast")
-    
-    # Make predictions
-    np_forecast = model_data['np_model'].predict(forecast_df)
-    forecast_df['yhat1'] = np_forecast['yhat1']
-    
-    # 🔥 FIX: Prepare XGBoost features properly (don't pass all columns!)
-    # XGBoost was trained on specific engineered features, not raw data
-    xgb_predictions = []
-    for idx in range(len(forecast_df)):
-        row = forecast_df.iloc[idx]
-        X_future = pd.DataFrame({
-            'Year': [row['ds'].year],
-            'Month': [row['ds'].month],
-            'lag_1': [0],
-            'lag_2': [0],
-            'rolling_mean_3': [0],
-            'rolling_std_3': [0],
-            'lag_12': [0],
-            'month_sin': [np.sin(2 * np.pi * row['ds'].month / 12)],
-            'month_cos': [np.cos(2 * np.pi * row['ds'].month / 12)],
-            'rate_of_change_1': [0],
-            'np_prediction': [row['yhat1']]
-        })
-        xgb_predictions.append(model_data['xgb_model'].predict(X_future)[0])
+    model_key = find_model_key(municipality, barangay)
+    if model_key is None:
+        raise HTTPException(status_code=404, detail=f"Model not found: {municipality}_{barangay}. Available: {list(MODELS.keys())}")
     
-    forecast_df['yhat'] = np.maximum(0, xgb_predictions)
+    # Monthly forecast rows - the same cached frame as the CSV report, so the PDF speaks
+    # cases/month like the comparison table instead of mixing in daily numbers
+    report_df = get_report_frame(model_key)
+    forecast_months = pd.DatetimeIndex(pd.to_datetime(report_df['Date']))
+    monthly_cases = report_df['Predicted_Cases'].to_numpy(dtype=np.float64)
+    n_months = len(report_df)
     
     # Get interpretability
-    interpretability_data = extract_model_components(model_data)
+    interpretability_data = get_model_components(model_key)
     
     # Create PDF
     pdf_buffer = BytesIO()
@@ -2286,32 +3657,29 @@ async def generate_pdf_report(municipality: str, barangay: str):
     # === EXECUTIVE SUMMARY ===
     story.append(Paragraph("Executive Summary", heading_style))
     
-    avg_cases = forecast_df['yhat'].mean()
-    max_cases = forecast_df['yhat'].max()
-    total_cases = forecast_df['yhat'].sum()
-    high_risk_days = len(forecast_df[forecast_df['yhat'] > 5])
-    
-    # Determine overall risk
-    if avg_cases > 5:
-        risk_level = "HIGH RISK"
-        risk_color = colors.red
-    elif avg_cases > 2:
-        risk_level = "MEDIUM RISK"
-        risk_color = colors.orange
-    else:
-        risk_level = "LOW RISK"
-        risk_color = colors.green
+    avg_cases = float(monthly_cases.mean())
+    peak = int(monthly_cases.argmax())
+    max_cases = float(monthly_cases[peak])
+    total_cases = float(monthly_cases.sum())
+    high_risk_months = int((report_df['Risk_Level'] == 'HIGH').sum())
+    
+    # Determine overall risk (same monthly bands as the comparison table)
+    risk_level, risk_color = {
+        'HIGH': ("HIGH RISK", colors.red),
+        'MEDIUM': ("MEDIUM RISK", colors.orange),
+        'LOW': ("LOW RISK", colors.green)
+    }[comparison_risk_level(avg_cases)]
     
     summary_text = f"""
     <b>Overall Assessment:</b> <font color="{risk_color.hexval() if hasattr(risk_color, 'hexval') else 'black'}">{risk_level}</font><br/>
     <br/>
-    <b>Forecast Period:</b> Next 180 days ({forecast_df['ds'].min().strftime('%B %d, %Y')} to {forecast_df['ds'].max().strftime('%B %d, %Y')})<br/>
+    <b>Forecast Period:</b> Next {n_months} months ({forecast_months.min().strftime('%B %Y')} to {forecast_months.max().strftime('%B %Y')})<br/>
     <br/>
     <b>Key Findings:</b><br/>
-    • Expected average: <b>{avg_cases:.1f} cases per day</b><br/>
-    • Peak prediction: <b>{max_cases:.1f} cases</b> (on {forecast_df.loc[forecast_df['yhat'].idxmax(), 'ds'].strftime('%B %d, %Y')})<br/>
-    • Total projected cases: <b>{total_cases:.0f} cases</b> over 6 months<br/>
-    • High-risk days (&gt;5 cases): <b>{high_risk_days} days</b> ({(high_risk_days/180*100):.1f}% of forecast period)<br/>
+    • Expected average: <b>{avg_cases:.1f} cases per month</b><br/>
+    • Peak prediction: <b>{max_cases:.1f} cases</b> (in {forecast_months[peak].strftime('%B %Y')})<br/>
+    • Total projected cases: <b>{total_cases:.0f} cases</b> over {n_months} months<br/>
+    • High-risk months (&gt;{MONTHLY_HIGH_RISK_CASES} cases): <b>{high_risk_months} months</b> ({(high_risk_months/n_months*100):.1f}% of forecast period)<br/>
     """
     
     story.append(Paragraph(summary_text, styles['Normal']))
@@ -2320,52 +3688,12 @@ async def generate_pdf_report(municipality: str, barangay: str):
     # === BARANGAY COMPARISON (Professor's Requirement) ===
     story.append(Paragraph(f"Comparative Forecast Analysis - {municipality}", heading_style))
     
-    # Get forecast predictions for all barangays in same municipality
-    comparison_forecast_data = []
-    for key, data in MODELS.items():
-        if key.upper().startswith(f"{municipality.upper()}_"):
-            brgy_name = key.split('_', 1)[1]
-            
-            # Use the existing predict_future_months function (6 months)
-            try:
-                future_predictions = predict_future_months(data, months_ahead=6)
-                
-                if future_predictions:
-                    # Calculate statistics from monthly predictions
-                    monthly_cases = [p['predicted'] for p in future_predictions]
-                    avg_cases = np.mean(monthly_cases)
-                    max_cases = np.max(monthly_cases)
-                    total_cases = np.sum(monthly_cases)
-                    high_risk_months = len([c for c in monthly_cases if c > 150])  # High risk = >150 cases/month (~5/day)
-                    
-                    # Determine risk level (based on average monthly cases)
-                    if avg_cases > 150:  # ~5 cases/day
-                        risk_level = "HIGH"
-                    elif avg_cases > 60:  # ~2 cases/day
-                        risk_level = "MEDIUM"
-                    else:
-                        risk_level = "LOW"
-                    
-                    comparison_forecast_data.append({
-                        'barangay': brgy_name,
-                        'avg_cases_monthly': avg_cases,  # Average cases per MONTH
-                        'max_cases_monthly': max_cases,  # Peak month
-                        'total_cases': total_cases,
-                        'high_risk_months': high_risk_months,
-                        'risk_level': risk_level,
-                        'is_current': brgy_name.upper() == barangay.upper()
-                    })
-                else:
-                    print(f"⚠️ No predictions for {brgy_name}")
-                    
-            except Exception as e:
-                print(f"❌ Error comparing {brgy_name}: {e}")
-                import traceback
-                traceback.print_exc()
-                continue
-    
-    # Sort by average monthly cases (highest risk first)
-    comparison_forecast_data.sort(key=lambda x: x['avg_cases_monthly'], reverse=True)
+    # Forecast aggregate for all barangays in same municipality (cached, shared with the CSV report)
+    # Already sorted by average monthly cases (highest risk first)
+    comparison_forecast_data = [
+        dict(row, is_current=row['barangay'].upper() == barangay.upper())
+        for row in get_municipality_comparison(municipality)['by_forecast']
+    ]
     
     # Find rank of current barangay
     current_rank = next((i+1 for i, b in enumerate(comparison_forecast_data) 
@@ -2436,17 +3764,14 @@ async def generate_pdf_report(municipality: str, barangay: str):
     story.append(Spacer(1, 0.3*inch))
     
     # Forecast Summary
-    story.append(Paragraph("Forecast Summary (Next 180 Days)", heading_style))
-    avg_cases = forecast_df['yhat'].mean()
-    max_cases = forecast_df['yhat'].max()
-    high_risk_days = len(forecast_df[forecast_df['yhat'] > 5])
+    story.append(Paragraph(f"Forecast Summary (Next {n_months} Months)", heading_style))
     
     summary_data = [
         ['Metric', 'Value'],
-        ['Average Predicted Cases/Day', f"{avg_cases:.2f}"],
-        ['Maximum Predicted Cases/Day', f"{max_cases:.2f}"],
-        ['High Risk Days (>5 cases)', f"{high_risk_days}"],
-        ['Forecast Period', '180 days']
+        ['Average Predicted Cases/Month', f"{avg_cases:.2f}"],
+        ['Maximum Predicted Cases/Month', f"{max_cases:.2f}"],
+        [f'High Risk Months (>{MONTHLY_HIGH_RISK_CASES} cases)', f"{high_risk_months}"],
+        ['Forecast Period', f'{n_months} months']
     ]
     
     summary_table = Table(summary_data, colWidths=[3*inch, 2*inch])
@@ -2465,24 +3790,14 @@ async def generate_pdf_report(municipality: str, barangay: str):
     
     # Create forecast chart
     story.append(Paragraph("Forecast Visualization", heading_style))
-    fig, ax = plt.subplots(figsize=(8, 4))
-    ax.plot(forecast_df['ds'], forecast_df['yhat'], color='#3498db', linewidth=2)
-    ax.fill_between(forecast_df['ds'], 0, forecast_df['yhat'], alpha=0.3, color='#3498db')
-    ax.set_xlabel('Date', fontsize=12)
-    ax.set_ylabel('Predicted Cases', fontsize=12)
-    ax.set_title('180-Day Rabies Cases Forecast', fontsize=14, fontweight='bold')
-    ax.grid(True, alpha=0.3)
-    plt.xticks(rotation=45)
-    plt.tight_layout()
-    
-    # Save chart to buffer
-    img_buffer = BytesIO()
-    plt.savefig(img_buffer, format='png', dpi=150)
-    img_buffer.seek(0)
-    plt.close()
+    chart_png = get_chart_png(model_key, 'forecast', {
+        'dates': forecast_months.strftime('%Y-%m-%d').tolist(),
+        'values': monthly_cases.tolist(),
+        'title': f'{n_months}-Month Rabies Cases Forecast'
+    })
     
     # Add chart to PDF
-    img = Image(img_buffer, width=6*inch, height=3*inch)
+    img = Image(BytesIO(chart_png), width=6*inch, height=3*inch)
     story.append(img)
     story.append(Spacer(1, 0.3*inch))
     
@@ -2499,10 +3814,10 @@ async def generate_pdf_report(municipality: str, barangay: str):
     # Recommendations
     story.append(Paragraph("Recommendations", heading_style))
     recommendations = []
-    if high_risk_days > 30:
-        recommendations.append("⚠️ HIGH ALERT: Significant number of high-risk days detected. Increase vaccination campaigns.")
-    if avg_cases > 3:
-        recommendations.append("📊 Monitor closely: Average daily cases above normal threshold.")
+    if high_risk_months > 0:
+        recommendations.append("⚠️ HIGH ALERT: High-risk months detected in the forecast. Increase vaccination campaigns.")
+    if avg_cases > MONTHLY_MEDIUM_RISK_CASES:
+        recommendations.append("📊 Monitor closely: Average monthly cases above normal threshold.")
     else:
         recommendations.append("✅ Cases within normal range. Maintain current prevention measures.")
     
@@ -2518,12 +3833,14 @@ async def generate_pdf_report(municipality: str, barangay: str):
     
     # Build PDF
     doc.build(story)
-    pdf_buffer.seek(0)
     
     filename = f"rabies_forecast_{municipality}_{barangay}_{datetime.now().strftime('%Y%m%d')}.pdf"
-    
-    return StreamingResponse(
-        pdf_buffer,
+    return pdf_buffer.getvalue(), filename
+
+
+def pdf_response(pdf_bytes, filename):
+    return Response(
+        content=pdf_bytes,
         media_type="application/pdf",
         headers={
             "Content-Disposition": f"attachment; filename={filename}"
@@ -2531,11 +3848,21 @@ async def generate_pdf_report(municipality: str, barangay: str):
     )
 
 
-@app.get("/api/report/insights-pdf/{municipality}/{barangay}")
-async def generate_insights_pdf(municipality: str, barangay: str):
+def build_pdf_report(municipality: str, barangay: str):
+    """Blocking part of generate_pdf_report (runs in the worker pool)."""
+    return pdf_response(*render_pdf_report(municipality, barangay))
+
+
+@app.get("/api/report/pdf/{municipality}/{barangay}")
+async def generate_pdf_report(municipality: str, barangay: str):
     """
-    Generate comprehensive Model Interpretability PDF with all visualizations
+    Generate PDF report with forecast and interpretability visualizations
     """
+    return await run_blocking(build_pdf_report, municipality, barangay)
+
+
+def render_insights_pdf(municipality: str, barangay: str):
+    """Model interpretability PDF as (pdf bytes, download filename)."""
     print(f"\n📊 Generating Interpretability PDF for {municipality} - {barangay}")
     
     try:
@@ -2545,33 +3872,19 @@ async def generate_insights_pdf(municipality: str, barangay: str):
         from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak, Image
         from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
         from reportlab.lib.enums import TA_CENTER, TA_LEFT
-        import matplotlib
-        matplotlib.use('Agg')
-        import matplotlib.pyplot as plt
+        import chart_rendering  # matplotlib Figure/FigureCanvasAgg (no pyplot)
     except ImportError:
         raise HTTPException(
             status_code=500,
             detail="PDF generation requires: pip install reportlab matplotlib"
         )
     
-    # Get model
-    model_key = f"{municipality}_{barangay}"
-    model_data = None
-    
-    if model_key in MODELS:
-        model_data = MODELS[model_key]
-    else:
-        model_key_upper = model_key.upper()
-        for key in MODELS.keys():
-            if key.upper() == model_key_upper:
-                model_data = MODELS[key]
-                break
-    
-    if model_data is None:
-        raise HTTPException(status_code=404, detail=f"Model not found: {model_key}")
+    model_key = find_model_key(municipality, barangay)
+    if model_key is None:
+        raise HTTPException(status_code=404, detail=f"Model not found: {municipality}_{barangay}")
     
     # Get interpretability data
-    interpretability_data = extract_model_components(model_data)
+    interpretability_data = get_model_components(model_key)
     
     if not interpretability_data['success']:
         raise HTTPException(status_code=500, detail="Failed to extract model components")
@@ -2639,29 +3952,15 @@ async def generate_insights_pdf(municipality: str, barangay: str):
     story.append(Spacer(1, 0.15*inch))
     
     # Create decomposition chart
-    fig, ax = plt.subplots(figsize=(10, 5))
     dates = interpretability_data['components']['dates']
-    trend = interpretability_data['components']['trend']
-    seasonality = interpretability_data['components']['yearly_seasonality']
-    holidays = interpretability_data['components']['holidays']
-    
-    ax.plot(dates, trend, label='Trend', linewidth=2, color='#3498db')
-    ax.plot(dates, seasonality, label='Seasonality', linewidth=2, color='#e74c3c', linestyle='--')
-    ax.plot(dates, holidays, label='Holiday Effects', linewidth=2, color='#f39c12', alpha=0.7)
-    
-    ax.set_xlabel('Date', fontsize=10)
-    ax.set_ylabel('Impact on Cases', fontsize=10)
-    ax.legend(loc='best', fontsize=9)
-    ax.grid(True, alpha=0.3)
-    ax.tick_params(axis='x', rotation=45, labelsize=8)
-    plt.tight_layout()
-    
-    img_buffer = BytesIO()
-    plt.savefig(img_buffer, format='png', dpi=150, bbox_inches='tight')
-    img_buffer.seek(0)
-    plt.close()
-    
-    img = Image(img_buffer, width=6.5*inch, height=3*inch)
+    chart_png = get_chart_png(model_key, 'decomposition', {
+        'dates': dates,
+        'trend': interpretability_data['components']['trend'],
+        'seasonality': interpretability_data['components']['yearly_seasonality'],
+        'holidays': interpretability_data['components']['holidays']
+    })
+    
+    img = Image(BytesIO(chart_png), width=6.5*inch, height=3*inch)
     story.append(img)
     story.append(Spacer(1, 0.2*inch))
     
@@ -2712,28 +4011,12 @@ async def generate_insights_pdf(municipality: str, barangay: str):
         story.append(Spacer(1, 0.15*inch))
         
         # Create weather chart
-        fig, ax = plt.subplots(figsize=(10, 5))
-        weather_data = interpretability_data['components']['weather_regressors']
-        
-        for col, values in weather_data.items():
-            if values and any(v != 0 for v in values):  # Only plot non-zero data
-                label = col.replace('_', ' ').title()
-                ax.plot(dates, values, label=label, linewidth=1.5, alpha=0.8)
-        
-        ax.set_xlabel('Date', fontsize=10)
-        ax.set_ylabel('Impact on Cases', fontsize=10)
-        ax.legend(loc='best', fontsize=8, ncol=2)
-        ax.grid(True, alpha=0.3)
-        ax.axhline(y=0, color='k', linestyle='-', linewidth=0.5)
-        ax.tick_params(axis='x', rotation=45, labelsize=8)
-        plt.tight_layout()
-        
-        img_buffer = BytesIO()
-        plt.savefig(img_buffer, format='png', dpi=150, bbox_inches='tight')
-        img_buffer.seek(0)
-        plt.close()
-        
-        img = Image(img_buffer, width=6.5*inch, height=3*inch)
+        chart_png = get_chart_png(model_key, 'weather', {
+            'dates': dates,
+            'regressors': interpretability_data['components']['weather_regressors']
+        })
+        
+        img = Image(BytesIO(chart_png), width=6.5*inch, height=3*inch)
         story.append(img)
         story.append(Spacer(1, 0.15*inch))
         
@@ -2758,27 +4041,9 @@ async def generate_insights_pdf(municipality: str, barangay: str):
             story.append(Spacer(1, 0.15*inch))
             
             # Create vaccination chart
-            fig, ax = plt.subplots(figsize=(10, 5))
+            chart_png = get_chart_png(model_key, 'vaccination', {'dates': dates, 'regressors': vax_data})
             
-            for col, values in vax_data.items():
-                if values and any(v != 0 for v in values):
-                    label = col.replace('_', ' ').title()
-                    ax.plot(dates, values, label=label, linewidth=2, marker='o', markersize=3)
-            
-            ax.set_xlabel('Date', fontsize=10)
-            ax.set_ylabel('Impact on Cases', fontsize=10)
-            ax.legend(loc='best', fontsize=9)
-            ax.grid(True, alpha=0.3)
-            ax.axhline(y=0, color='k', linestyle='-', linewidth=0.5)
-            ax.tick_params(axis='x', rotation=45, labelsize=8)
-            plt.tight_layout()
-            
-            img_buffer = BytesIO()
-            plt.savefig(img_buffer, format='png', dpi=150, bbox_inches='tight')
-            img_buffer.seek(0)
-            plt.close()
-            
-            img = Image(img_buffer, width=6.5*inch, height=3*inch)
+            img = Image(BytesIO(chart_png), width=6.5*inch, height=3*inch)
             story.append(img)
             story.append(Spacer(1, 0.15*inch))
             
@@ -2809,28 +4074,12 @@ async def generate_insights_pdf(municipality: str, barangay: str):
     feature_names = [f['feature'] for f in features]
     importance_values = [f['percentage'] for f in features]
     
-    fig, ax = plt.subplots(figsize=(8, 5))
-    colors_list = plt.cm.viridis(np.linspace(0.3, 0.9, len(feature_names)))
-    bars = ax.barh(feature_names, importance_values, color=colors_list)
-    
-    ax.set_xlabel('Importance (%)', fontsize=10)
-    ax.set_ylabel('Feature', fontsize=10)
-    ax.set_title('Top 10 Most Important Features', fontsize=12, fontweight='bold')
-    
-    # Add percentage labels on bars
-    for bar in bars:
-        width = bar.get_width()
-        ax.text(width, bar.get_y() + bar.get_height()/2, f'{width:.1f}%',
-                ha='left', va='center', fontsize=8, fontweight='bold')
-    
-    plt.tight_layout()
-    
-    img_buffer = BytesIO()
-    plt.savefig(img_buffer, format='png', dpi=150, bbox_inches='tight')
-    img_buffer.seek(0)
-    plt.close()
+    chart_png = get_chart_png(model_key, 'feature_importance', {
+        'features': feature_names,
+        'importance': importance_values
+    })
     
-    img = Image(img_buffer, width=6*inch, height=3.5*inch)
+    img = Image(BytesIO(chart_png), width=6*inch, height=3.5*inch)
     story.append(img)
     story.append(Spacer(1, 0.15*inch))
     
@@ -2913,18 +4162,383 @@ async def generate_insights_pdf(municipality: str, barangay: str):
     doc.build(story)
     
     # Return PDF
-    pdf_buffer.seek(0)
     filename = f"rabies_model_insights_{municipality}_{barangay}_{datetime.now().strftime('%Y%m%d')}.pdf"
+    return pdf_buffer.getvalue(), filename
+
+
+def build_insights_pdf(municipality: str, barangay: str):
+    """Blocking part of generate_insights_pdf (runs in the worker pool)."""
+    return pdf_response(*render_insights_pdf(municipality, barangay))
+
+
+@app.get("/api/report/insights-pdf/{municipality}/{barangay}")
+async def generate_insights_pdf(municipality: str, barangay: str):
+    """
+    Generate comprehensive Model Interpretability PDF with all visualizations
+    """
+    return await run_blocking(build_insights_pdf, municipality, barangay)
+
+
+# ==============================================
+# 📥 BACKGROUND REPORT JOBS
+# ==============================================
+# PDF reports can take long enough for clients to time out, so they can also be generated
+# in the background:
+#   POST /api/report/jobs/{kind}/{municipality}/{barangay}  -> queue (or join) a job
+#   GET  /api/report/jobs/{job_id}                          -> poll its status
+#   GET  /api/report/jobs/{job_id}/download                 -> fetch the finished file
+# Job state and artifacts live in REPORT_JOB_DIR so every gunicorn worker sees them. The
+# job id is derived from (report kind, model key, model file signature): identical requests
+# for the same barangay and model version - from any process - collapse into one job.
+# Finished artifacts are deleted REPORT_JOB_TTL_SECONDS after they were produced.
+# A process keeps the state files of its queued and running jobs fresh (heartbeat), so a
+# job is only handed to another process once its owner stopped - never while it is
+# still waiting in, or being rendered by, a live pool.
+REPORT_JOB_DIR = os.getenv("REPORT_JOB_DIR", "report_jobs")
+REPORT_JOB_WORKERS = int(os.getenv("REPORT_JOB_WORKERS", "2"))
+REPORT_JOB_MAX_QUEUE = int(os.getenv("REPORT_JOB_MAX_QUEUE", "8"))  # new jobs waiting for a report worker before 503
+REPORT_JOB_TTL_SECONDS = int(os.getenv("REPORT_JOB_TTL_SECONDS", "3600"))
+REPORT_JOB_TIMEOUT_SECONDS = int(os.getenv("REPORT_JOB_TIMEOUT_SECONDS", "300"))  # no heartbeat this long = owner process died
+REPORT_JOB_HEARTBEAT_SECONDS = 30  # how often a process touches the state files of its unfinished jobs
+REPORT_JOB_CLEANUP_INTERVAL = 60  # seconds between artifact directory sweeps
+
+REPORT_JOB_KINDS = {  # kind -> renderer returning (content bytes, download filename)
+    'pdf': render_pdf_report,
+    'insights-pdf': render_insights_pdf
+}
+REPORT_JOB_FIELDS = ['id', 'kind', 'municipality', 'barangay', 'model_key', 'status', 'error', 'filename', 'size']
+
+_REPORT_JOB_EXECUTOR = None
+_REPORT_JOB_EXECUTOR_GUARD = threading.Lock()
+_REPORT_JOB_SLOTS = threading.BoundedSemaphore(REPORT_JOB_WORKERS + REPORT_JOB_MAX_QUEUE)
+_REPORT_JOB_CLAIM_LOCK = threading.Lock()
+_REPORT_JOB_LAST_CLEANUP = 0.0
+
+_REPORT_JOBS_PENDING = {}  # job id -> 'queued' | 'running', for jobs submitted to THIS process's pool
+_REPORT_JOBS_PENDING_LOCK = threading.Lock()
+
+
+def get_report_job_executor():
+    """Create the report job pool (and its heartbeat thread) on first use (threads must not exist before a fork)."""
+    global _REPORT_JOB_EXECUTOR
+    with _REPORT_JOB_EXECUTOR_GUARD:
+        if _REPORT_JOB_EXECUTOR is None:
+            _REPORT_JOB_EXECUTOR = ThreadPoolExecutor(max_workers=REPORT_JOB_WORKERS, thread_name_prefix="report-job")
+            threading.Thread(target=report_job_heartbeat, name="report-job-heartbeat", daemon=True).start()
+        return _REPORT_JOB_EXECUTOR
+
+
+def set_report_job_pending(job_id, state):
+    """Track a job of this process's pool as 'queued' / 'running' (None = finished)."""
+    with _REPORT_JOBS_PENDING_LOCK:
+        if state is None:
+            _REPORT_JOBS_PENDING.pop(job_id, None)
+        else:
+            _REPORT_JOBS_PENDING[job_id] = state
+
+
+def report_job_heartbeat():
+    """Touch the state file of every queued/running job of this process, forever (daemon thread)."""
+    while True:
+        time.sleep(REPORT_JOB_HEARTBEAT_SECONDS)
+        with _REPORT_JOBS_PENDING_LOCK:
+            job_ids = list(_REPORT_JOBS_PENDING)
+        for job_id in job_ids:
+            try:
+                os.utime(report_job_path(job_id, 'json'))
+            except OSError:
+                pass  # removed meanwhile
+
+
+def report_job_last_seen(job):
+    """Last sign of life of an unfinished job: its last state write or heartbeat."""
+    try:
+        return max(job['updated_at'], os.path.getmtime(report_job_path(job['id'], 'json')))
+    except OSError:
+        return job['updated_at']
+
+
+def report_job_id(kind, model_key, municipality):
+    """
+    Same report kind + model key + model file versions -> same job id. The PDF embeds the
+    municipality comparison, so every sibling model's key and file version count too.
+    """
+    keys, signatures = municipality_signatures(municipality)
+    return hashlib.sha1(json.dumps(
+        [kind, model_key, get_model_signature(model_key), keys, signatures]
+    ).encode('utf-8')).hexdigest()[:20]
+
+
+def report_job_path(job_id, extension):
+    return os.path.join(REPORT_JOB_DIR, f"{job_id}.{extension}")
+
+
+def read_report_job(job_id):
+    """Job state from REPORT_JOB_DIR, or None (unknown id or state not fully written yet)."""
+    if not re.fullmatch(r'[0-9a-f]{20}', job_id):  # ids become file names
+        return None
+    try:
+        with open(report_job_path(job_id, 'json'), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_report_job(job, exclusive=False):
+    """
+    Persist job state. Normal writes replace the file atomically; exclusive=True only
+    creates it when no state exists yet and returns False if another process got there first.
+    """
+    job['updated_at'] = time.time()
+    path = report_job_path(job['id'], 'json')
+    if exclusive:
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            return False
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(job, f)
+        return True
+    
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(job, f)
+    os.replace(tmp_path, path)
+    return True
+
+
+def remove_report_job(job):
+    """Delete a job's state file and artifact."""
+    for path in (report_job_path(job['id'], 'json'), report_job_path(job['id'], job.get('extension', 'pdf'))):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def is_report_job_expired(job, now=None):
+    """
+    True for jobs that should be forgotten: queued/running without a heartbeat for
+    REPORT_JOB_TIMEOUT_SECONDS (the process owning it died), finished past their TTL,
+    or done with the artifact gone. A job still in this process's pool never expires,
+    however long it has been waiting.
+    """
+    now = time.time() if now is None else now
+    if job['status'] in ('queued', 'running'):
+        with _REPORT_JOBS_PENDING_LOCK:
+            if job['id'] in _REPORT_JOBS_PENDING:
+                return False
+        return now - report_job_last_seen(job) > REPORT_JOB_TIMEOUT_SECONDS
+    if now > job.get('expires_at', 0):
+        return True
+    return job['status'] == 'done' and not os.path.exists(report_job_path(job['id'], job['extension']))
+
+
+def cleanup_report_jobs(force=False):
+    """
+    Delete expired jobs and their artifacts, plus leftovers (temp files, artifacts without
+    state) older than the TTL. Runs at most every REPORT_JOB_CLEANUP_INTERVAL seconds.
+    """
+    global _REPORT_JOB_LAST_CLEANUP
+    now = time.time()
+    if not force and now - _REPORT_JOB_LAST_CLEANUP < REPORT_JOB_CLEANUP_INTERVAL:
+        return 0
+    _REPORT_JOB_LAST_CLEANUP = now
     
-    return StreamingResponse(
-        pdf_buffer,
-        media_type="application/pdf",
-        headers={
-            "Content-Disposition": f"attachment; filename={filename}"
+    try:
+        names = os.listdir(REPORT_JOB_DIR)
+    except FileNotFoundError:
+        return 0
+    
+    removed = 0
+    for name in names:
+        if name.endswith('.json'):
+            job = read_report_job(name[:-len('.json')])
+            if job is not None and is_report_job_expired(job, now):
+                remove_report_job(job)
+                removed += 1
+    
+    for name in names:
+        path = os.path.join(REPORT_JOB_DIR, name)
+        job_id = name.split('.', 1)[0]
+        try:
+            if (not name.endswith('.json') and not os.path.exists(report_job_path(job_id, 'json'))
+                    and now - os.path.getmtime(path) > REPORT_JOB_TTL_SECONDS):
+                os.remove(path)
+        except FileNotFoundError:
+            pass
+    
+    if removed:
+        print(f"🧹 Removed {removed} expired report jobs")
+    return removed
+
+
+def run_report_job(job):
+    """Report job pool entry point: render_report_job(), then stop tracking the job as pending."""
+    try:
+        return render_report_job(job)
+    finally:
+        set_report_job_pending(job['id'], None)
+
+
+def render_report_job(job):
+    """Render a queued report into its artifact file (skipped if another process took the job over)."""
+    current = read_report_job(job['id'])
+    if current is None or current.get('created_at') != job['created_at']:
+        # The state was replaced meanwhile (owner presumed dead and the job re-queued elsewhere)
+        print(f"⚠️ Report job {job['id']} was taken over, not rendering it again")
+        return current
+    
+    set_report_job_pending(job['id'], 'running')
+    job = dict(job, status='running', started_at=time.time())
+    write_report_job(job)
+    
+    try:
+        content, filename = REPORT_JOB_KINDS[job['kind']](job['municipality'], job['barangay'])
+        
+        artifact_path = report_job_path(job['id'], job['extension'])
+        tmp_path = f"{artifact_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(content)
+        os.replace(tmp_path, artifact_path)
+        
+        job.update(status='done', filename=filename, size=len(content))
+        print(f"✓ Report job {job['id']} ({job['kind']}, {job['model_key']}) done in {time.time() - job['started_at']:.1f}s")
+    except Exception as e:
+        error = e.detail if isinstance(e, HTTPException) else str(e)
+        print(f"❌ Report job {job['id']} failed: {error}")
+        job.update(status='failed', error=error)  # kept for the TTL so pollers see why; a new POST retries
+    
+    job['finished_at'] = time.time()
+    job['expires_at'] = job['finished_at'] + REPORT_JOB_TTL_SECONDS
+    write_report_job(job)
+    return job
+
+
+def enqueue_report_job(kind, municipality, barangay):
+    """
+    Queue a report, or return the live job already covering the same barangay and model versions.
+    Raises 503 when REPORT_JOB_WORKERS jobs are rendering and REPORT_JOB_MAX_QUEUE more are waiting.
+    """
+    if kind not in REPORT_JOB_KINDS:
+        raise HTTPException(status_code=400, detail=f"Unknown report kind: {kind}. Use one of {list(REPORT_JOB_KINDS)}")
+    model_key = find_model_key(municipality, barangay)
+    if model_key is None:
+        raise HTTPException(status_code=404, detail=f"Model not found: {municipality}_{barangay}")
+    
+    cleanup_report_jobs()
+    os.makedirs(REPORT_JOB_DIR, exist_ok=True)
+    job_id = report_job_id(kind, model_key, municipality)
+    
+    with _REPORT_JOB_CLAIM_LOCK:
+        job = read_report_job(job_id)
+        if job is not None:
+            if not (job['status'] == 'failed' or is_report_job_expired(job)):
+                return job
+            remove_report_job(job)  # failed or stale - start over
+        
+        job = {
+            'id': job_id,
+            'kind': kind,
+            'municipality': municipality,
+            'barangay': barangay,
+            'model_key': model_key,
+            'extension': 'pdf',
+            'status': 'queued',
+            'created_at': time.time()
         }
+        # Joining a live job is free; only a new job needs a pool slot
+        if not _REPORT_JOB_SLOTS.acquire(blocking=False):
+            raise HTTPException(
+                status_code=503,
+                detail="Too many reports are being generated, please retry shortly",
+                headers={"Retry-After": "5"}
+            )
+        set_report_job_pending(job_id, 'queued')
+        if not write_report_job(job, exclusive=True):
+            # Another server process claimed the same job first - join it
+            set_report_job_pending(job_id, None)
+            _REPORT_JOB_SLOTS.release()
+            return read_report_job(job_id) or job
+    
+    try:
+        future = get_report_job_executor().submit(run_report_job, job)
+    except Exception:
+        set_report_job_pending(job_id, None)
+        _REPORT_JOB_SLOTS.release()
+        remove_report_job(job)
+        raise
+    future.add_done_callback(lambda _: _REPORT_JOB_SLOTS.release())
+    return job
+
+
+def report_job_response(job):
+    """Public view of a job: state, timestamps and the URLs to poll / download."""
+    response = {field: job[field] for field in REPORT_JOB_FIELDS if field in job}
+    for field in ('created_at', 'finished_at', 'expires_at'):
+        if field in job:
+            response[field] = datetime.fromtimestamp(job[field]).isoformat(timespec='seconds')
+    response['status_url'] = f"/api/report/jobs/{job['id']}"
+    if job['status'] == 'done':
+        response['download_url'] = f"/api/report/jobs/{job['id']}/download"
+    return response
+
+
+def get_live_report_job(job_id):
+    job = read_report_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Report job not found: {job_id}")
+    if is_report_job_expired(job):
+        raise HTTPException(status_code=410, detail="Report job expired - queue the report again")
+    return job
+
+
+def build_report_job_creation(kind: str, municipality: str, barangay: str):
+    """Blocking part of create_report_job (state files + directory sweep, runs in the worker pool)."""
+    job = enqueue_report_job(kind, municipality, barangay)
+    return JSONResponse(report_job_response(job), status_code=200 if job['status'] == 'done' else 202)
+
+
+def build_report_job_status(job_id: str):
+    """Blocking part of get_report_job (runs in the worker pool)."""
+    return report_job_response(get_live_report_job(job_id))
+
+
+def build_report_job_download(job_id: str):
+    """Blocking part of download_report_job (runs in the worker pool)."""
+    job = get_live_report_job(job_id)
+    if job['status'] != 'done':
+        raise HTTPException(status_code=409, detail=f"Report job is {job['status']}" + (f": {job['error']}" if job.get('error') else ""))
+    return FileResponse(
+        report_job_path(job['id'], job['extension']),
+        media_type="application/pdf",
+        filename=job['filename']
     )
 
 
+@app.post("/api/report/jobs/{kind}/{municipality}/{barangay}")
+async def create_report_job(kind: str, municipality: str, barangay: str):
+    """
+    Queue a report for background generation (kind: 'pdf' or 'insights-pdf').
+    
+    Returns 202 with the job status (200 if an identical report is already done);
+    poll status_url, then fetch download_url.
+    """
+    return await run_blocking(build_report_job_creation, kind, municipality, barangay)
+
+
+@app.get("/api/report/jobs/{job_id}")
+async def get_report_job(job_id: str):
+    """Status of a report job: queued, running, done or failed."""
+    return await run_blocking(build_report_job_status, job_id)
+
+
+@app.get("/api/report/jobs/{job_id}/download")
+async def download_report_job(job_id: str):
+    """Finished report file (409 while the job is still queued/running or has failed)."""
+    return await run_blocking(build_report_job_download, job_id)
+
+
 if __name__ == "__main__":
     import uvicorn
     
@@ -2940,7 +4554,7 @@ if __name__ == "__main__":
     
     if IS_PRODUCTION:
         print("⚡ Production mode: Auto-reload DISABLED")
-        print("💡 Tip: Use 'gunicorn -w 4 -k uvicorn.workers.UvicornWorker main:app' for better performance\n")
+        print("💡 Tip: Use './start_production.sh' (gunicorn, preloaded shared models) for better performance\n")
     else:
         print("🔄 Development mode: Auto-reload ENABLED\n")
     
@@ -0,0 +1,46 @@
+"""
+Province-wide forecast precompute job
+
+Loads every model in MODEL_DIR and writes 24-month hybrid forecasts, risk levels,
+interpretability components and CSV report frames to the SQLite forecast database
+(FORECAST_DB_PATH, default MODEL_DIR/forecast_store.sqlite). The API serves those reads
+from the database, so it doesn't have to run NeuralProphet/torch for them. Rows are tied to the model file's
+mtime/size, so a retrained .pkl is recomputed on request until this job runs again.
+
+Usage:
+    python precompute_forecasts.py                     # all models, one process per core
+    python precompute_forecasts.py --workers 4
+    python precompute_forecasts.py --db /data/forecast_store.sqlite
+"""
+import argparse
+import os
+
+os.environ.setdefault("BUILD_FORECAST_STORE", "0")  # the job scores every model itself
+
+import main
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Precompute forecasts, risk levels and components for every model")
+    parser.add_argument('--workers', type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument('--db', help=f"SQLite file to write (default: {main.FORECAST_DB_PATH})")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    if len(main.MODELS) == 0:
+        raise SystemExit(f"❌ No models found in {main.MODEL_DIR}")
+
+    summary = main.run_precompute(workers=args.workers, db_path=args.db)
+
+    print("=" * 60)
+    print("PRECOMPUTE SUMMARY")
+    print("=" * 60)
+    print(f"Models:   {summary['written']}/{summary['models']} written ({summary['failed']} failed)")
+    print(f"Workers:  {summary['workers']} processes")
+    print(f"Time:     {summary['seconds']}s")
+    print(f"Database: {summary['db_path']}")
+    if summary['failed']:
+        raise SystemExit(1)
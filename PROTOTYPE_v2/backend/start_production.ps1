@@ -11,6 +11,8 @@ Write-Host "⚡ Running with uvicorn (recommended for testing)..." -ForegroundCo
 python -m uvicorn main:app --host 0.0.0.0 --port 8000 --no-reload
 
 # Option 2: For better performance, install and use gunicorn (multiple workers)
+# gunicorn only runs on Linux/macOS - there use ./start_production.sh instead,
+# which preloads the models once and shares them between workers (gunicorn.conf.py)
 # Uncomment below and run: pip install gunicorn
 # Write-Host "⚡ Running with gunicorn (4 workers)..." -ForegroundColor Yellow
 # gunicorn -w 4 -k uvicorn.workers.UvicornWorker main:app --bind 0.0.0.0:8000
@@ -0,0 +1,21 @@
+#!/usr/bin/env bash
+# Production startup script for Rabies Forecasting API (Linux)
+# Equivalent of start_production.ps1, but with multiple workers: models are loaded
+# once in the gunicorn master and shared with the workers (see gunicorn.conf.py).
+
+set -euo pipefail
+cd "$(dirname "$0")"
+
+echo "🚀 Starting API in PRODUCTION mode..."
+
+# Set environment to production (also loads the whole model set up front)
+# After `python precompute_forecasts.py`, WARM_MODELS=0 serves forecasts/risk/components/reports
+# straight from the forecast database without loading models or torch.
+export ENV=production
+export WARM_MODELS="${WARM_MODELS:-1}"
+
+# Worker count (default 4), override with: WEB_CONCURRENCY=8 ./start_production.sh
+export WEB_CONCURRENCY="${WEB_CONCURRENCY:-4}"
+
+echo "⚡ Running with gunicorn ($WEB_CONCURRENCY workers, preloaded models)..."
+exec gunicorn -c gunicorn.conf.py main:app
@@ -0,0 +1,169 @@
+"""
+Regression test for the column-wise interpretability component extraction
+Checks extract_component_series() against the original per-row loop, value for value
+Run this BEFORE starting the FastAPI server (needs the backend environment: python test_component_extraction.py)
+"""
+
+import json
+import pandas as pd
+import numpy as np
+
+from main import extract_component_series, extract_model_components, MODELS
+
+
+def legacy_component_loop(forecast_df, df_components, holiday_col, weather_cols, vax_cols, seasonal_cols):
+    """The per-row iloc extraction extract_model_components used before (kept verbatim as the reference)."""
+    components = {
+        'trend': [],
+        'yearly_seasonality': [],
+        'holidays': [],
+        'weather_regressors': {},
+        'vaccination_regressors': {},
+        'seasonal_regressors': {},
+        'dates': []
+    }
+    for col in weather_cols:
+        components['weather_regressors'][col] = []
+    for col in vax_cols:
+        components['vaccination_regressors'][col] = []
+    for col in seasonal_cols:
+        components['seasonal_regressors'][col] = []
+
+    for i in range(len(df_components)):
+        date = df_components['ds'].iloc[i]
+        components['dates'].append(date.strftime('%Y-%m'))
+
+        if 'trend' in forecast_df.columns:
+            components['trend'].append(round(float(forecast_df['trend'].iloc[i]), 2))
+        elif 'yhat1' in forecast_df.columns:
+            components['trend'].append(round(float(forecast_df['yhat1'].iloc[i]), 2))
+        else:
+            components['trend'].append(0)
+
+        season_col = None
+        for col in ['season_yearly', 'seasonal_yearly', 'yearly', 'seasonality']:
+            if col in forecast_df.columns:
+                season_col = col
+                break
+        if season_col:
+            components['yearly_seasonality'].append(round(float(forecast_df[season_col].iloc[i]), 2))
+        else:
+            components['yearly_seasonality'].append(0)
+
+        if holiday_col:
+            components['holidays'].append(round(float(forecast_df[holiday_col].iloc[i]), 2))
+        else:
+            components['holidays'].append(0)
+
+        for group, cols in [('weather_regressors', weather_cols), ('vaccination_regressors', vax_cols),
+                            ('seasonal_regressors', seasonal_cols)]:
+            for col in cols:
+                regressor_col = f'future_regressor_{col}'
+                if regressor_col in forecast_df.columns:
+                    components[group][col].append(round(float(forecast_df[regressor_col].iloc[i]), 2))
+                else:
+                    alt_col = f'season_{col}'
+                    if alt_col in forecast_df.columns:
+                        components[group][col].append(round(float(forecast_df[alt_col].iloc[i]), 2))
+                    else:
+                        components[group][col].append(0.0)
+    return components
+
+
+def make_forecast(n_rows, columns, seed=0):
+    """Fake NeuralProphet forecast with awkward values (x.xx5 ties, negatives, large numbers)."""
+    rng = np.random.default_rng(seed)
+    forecast_df = pd.DataFrame({'ds': pd.date_range('2022-01-01', periods=n_rows, freq='MS')})
+    for i, col in enumerate(columns):
+        values = rng.normal(0, 5, n_rows)
+        values[::3] = np.round(values[::3], 2) + 0.005  # rounding ties
+        values[1] = -1234.5678 * (i + 1)
+        forecast_df[col] = values
+    return forecast_df
+
+
+def assert_identical(expected, actual, label):
+    # json.dumps catches int-vs-float differences (0 vs 0.0) that == would let through
+    assert json.dumps(expected) == json.dumps(actual), f"{label}: output differs from the per-row loop!"
+    assert list(expected.keys()) == list(actual.keys()), f"{label}: key order differs!"
+    print(f"✅ {label}: identical ({len(actual['dates'])} rows)")
+
+
+def test_full_forecast():
+    print("=" * 60)
+    print("🧪 Full forecast (trend, seasonality, holidays, all regressor groups)")
+    print("=" * 60)
+
+    weather_cols = ['tmean_c', 'rh_pct', 'precip_mm']
+    vax_cols = [f'vaccination_{m}_{v}' for m in ['jan2023', 'feb2023', 'mar2023', 'apr2023', 'mar2024']
+                for v in ['pulse', 'lag1', 'lag2', 'ramp']]  # ANTIPOLO-sized: 20 regressors
+    seasonal_cols = ['high_season', 'july_dip']
+    columns = ['trend', 'yhat1', 'season_yearly', 'events_additive']
+    columns += [f'future_regressor_{col}' for col in weather_cols[:2]] + ['season_precip_mm']
+    columns += [f'future_regressor_{col}' for col in vax_cols]
+    columns += ['future_regressor_high_season']  # july_dip missing -> 0.0
+
+    forecast_df = make_forecast(48, columns)
+    df_components = forecast_df[['ds']]
+
+    expected = legacy_component_loop(forecast_df, df_components, 'events_additive', weather_cols, vax_cols, seasonal_cols)
+    actual = extract_component_series(forecast_df, df_components['ds'], 'events_additive', weather_cols, vax_cols, seasonal_cols)
+    assert_identical(expected, actual, "Full forecast")
+
+
+def test_fallback_columns():
+    print("\n" + "=" * 60)
+    print("🧪 Fallback column names (yhat1 as trend, alternative seasonality name)")
+    print("=" * 60)
+
+    forecast_df = make_forecast(30, ['yhat1', 'seasonality'], seed=1)
+    df_components = forecast_df[['ds']]
+    expected = legacy_component_loop(forecast_df, df_components, None, ['tmean_c'], [], [])
+    actual = extract_component_series(forecast_df, df_components['ds'], None, ['tmean_c'], [], [])
+    assert_identical(expected, actual, "Fallback columns")
+
+
+def test_missing_components():
+    print("\n" + "=" * 60)
+    print("🧪 Nothing available (all zeros, ints for trend/seasonality/holidays)")
+    print("=" * 60)
+
+    forecast_df = make_forecast(12, [], seed=2)
+    df_components = forecast_df[['ds']]
+    expected = legacy_component_loop(forecast_df, df_components, None, [], [], ['may_peak'])
+    actual = extract_component_series(forecast_df, df_components['ds'], None, [], [], ['may_peak'])
+    assert_identical(expected, actual, "Missing components")
+
+
+def test_real_model():
+    print("\n" + "=" * 60)
+    print("🧪 extract_model_components() on a saved model")
+    print("=" * 60)
+
+    if len(MODELS) == 0:
+        print("⚠️ No models found - skipping")
+        return
+
+    key = next(iter(MODELS))
+    result = extract_model_components(MODELS[key])
+    assert result['success'], f"Extraction failed for {key}: {result.get('error')}"
+
+    components = result['components']
+    n_rows = len(components['dates'])
+    for name in ['trend', 'yearly_seasonality', 'holidays']:
+        assert len(components[name]) == n_rows, f"{name} has {len(components[name])} values for {n_rows} dates!"
+    for group in ['weather_regressors', 'vaccination_regressors', 'seasonal_regressors']:
+        for col, values in components[group].items():
+            assert len(values) == n_rows, f"{group}.{col} has {len(values)} values for {n_rows} dates!"
+    print(f"✅ {key}: {n_rows} months, format OK")
+
+
+if __name__ == "__main__":
+    test_full_forecast()
+    test_fallback_columns()
+    test_missing_components()
+    test_real_model()
+
+    print("\n" + "=" * 60)
+    print("✅ ALL COMPONENT EXTRACTION TESTS PASSED!")
+    print("=" * 60)
@@ -0,0 +1,76 @@
+"""
+Test the forecast anchors (next month from training_end, forecast path from validation_end)
+Month-end dates like training_end = 2024-12-31 (the documented schema) must land on the
+month-start grid, so the single NeuralProphet pass of predict_forecast_anchors() is used
+Run this BEFORE starting the FastAPI server (needs the backend environment: python test_forecast_anchors.py)
+"""
+
+import numpy as np
+import pandas as pd
+
+from main import forecast_anchor_dates, predict_forecast_anchors, next_month_start
+
+
+class CountingNeuralProphet:
+    """Stand-in NeuralProphet: yhat1 = month number, counts predict() calls."""
+    def __init__(self):
+        self.calls = 0
+
+    def predict(self, df, **kwargs):
+        self.calls += 1
+        return pd.DataFrame({'ds': df['ds'], 'yhat1': df['ds'].dt.month.astype(float)})
+
+
+class ZeroResidualXGB:
+    def predict(self, X):
+        return np.zeros(len(X))
+
+
+def test_month_end_anchors():
+    print("=" * 60)
+    print("🧪 Month-end training_end / validation_end snap to month starts")
+    print("=" * 60)
+
+    next_month, future_dates, frame_dates = forecast_anchor_dates(
+        pd.Timestamp('2024-12-31'), pd.Timestamp('2025-06-30'), 3
+    )
+    assert next_month == pd.Timestamp('2025-01-01'), f"next_month is {next_month}"
+    assert list(future_dates.strftime('%Y-%m-%d')) == ['2025-07-01', '2025-08-01', '2025-09-01'], \
+        f"future path starts at {future_dates[0]} (a month was skipped?)"
+    assert frame_dates is not None and next_month in frame_dates, "next_month is off the frame grid"
+    print(f"✅ next_month={next_month.date()}, path={future_dates[0].date()}..{future_dates[-1].date()}")
+
+    # Month-start, month-end and mid-month anchors of the same month agree
+    for date in ['2024-12-01', '2024-12-15', '2024-12-31 23:00']:
+        assert next_month_start(date) == pd.Timestamp('2025-01-01'), f"{date} -> {next_month_start(date)}"
+    print("✅ Month-start, mid-month and month-end anchors give the same month")
+
+
+def test_month_end_single_pass():
+    print("\n" + "=" * 60)
+    print("🧪 predict_forecast_anchors() uses ONE NeuralProphet pass for month-end models")
+    print("=" * 60)
+
+    np_model = CountingNeuralProphet()
+    model_data = {
+        'np_model': np_model,
+        'xgb_model': ZeroResidualXGB(),
+        'training_end': pd.Timestamp('2024-12-31'),
+        'validation_end': pd.Timestamp('2025-06-30'),
+        'regressors': {}
+    }
+    next_pred, path = predict_forecast_anchors(model_data, months_ahead=3)
+
+    assert np_model.calls == 1, f"{np_model.calls} NeuralProphet passes (fell back to separate passes?)"
+    assert next_pred == 1.0, f"next month (January) predicted as {next_pred}"
+    assert [p['date'] for p in path] == ['2025-07', '2025-08', '2025-09'], f"path dates {path}"
+    print(f"✅ 1 pass, next month={next_pred}, path={[p['date'] for p in path]}")
+
+
+if __name__ == "__main__":
+    test_month_end_anchors()
+    test_month_end_single_pass()
+
+    print("\n" + "=" * 60)
+    print("✅ ALL FORECAST ANCHOR TESTS PASSED!")
+    print("=" * 60)
@@ -0,0 +1,48 @@
+"""
+Test the monthly risk bands of the CSV report and the barangay comparison tables
+Forecasts are monthly totals, so HIGH/MEDIUM/LOW must use the monthly cutoffs (not the old per-day 5/2)
+Run this BEFORE starting the FastAPI server (needs the backend environment: python test_report_risk_levels.py)
+"""
+
+from main import (
+    report_risk_levels, comparison_risk_level,
+    MONTHLY_HIGH_RISK_CASES, MONTHLY_MEDIUM_RISK_CASES
+)
+
+
+def test_band_edges():
+    print("=" * 60)
+    print("🧪 Monthly risk bands (report Risk_Level column)")
+    print("=" * 60)
+
+    assert MONTHLY_HIGH_RISK_CASES == 150, f"HIGH cutoff is {MONTHLY_HIGH_RISK_CASES}, expected 150 cases/month"
+    assert MONTHLY_MEDIUM_RISK_CASES == 60, f"MEDIUM cutoff is {MONTHLY_MEDIUM_RISK_CASES}, expected 60 cases/month"
+
+    cases = [0, 2.5, 6, 60, 60.1, 149.9, 150, 150.1, 400]
+    expected = ['LOW', 'LOW', 'LOW', 'LOW', 'MEDIUM', 'MEDIUM', 'MEDIUM', 'HIGH', 'HIGH']
+    actual = report_risk_levels(cases).tolist()
+
+    for value, want, got in zip(cases, expected, actual):
+        print(f"   {value:>6} cases/month -> {got}")
+        assert got == want, f"{value} cases/month should be {want}, got {got}"
+    print("✅ Band edges pinned (6 cases/month is LOW, not HIGH)")
+
+
+def test_matches_comparison_table():
+    print("\n" + "=" * 60)
+    print("🧪 Report column agrees with the comparison table")
+    print("=" * 60)
+
+    for value in [0, 59.9, 60, 61, 149, 150, 151, 1000]:
+        assert report_risk_levels([value])[0] == comparison_risk_level(value), \
+            f"{value}: report says {report_risk_levels([value])[0]}, comparison says {comparison_risk_level(value)}"
+    print("✅ report_risk_levels() == comparison_risk_level() for every value")
+
+
+if __name__ == "__main__":
+    test_band_edges()
+    test_matches_comparison_table()
+
+    print("\n" + "=" * 60)
+    print("✅ ALL RISK BAND TESTS PASSED!")
+    print("=" * 60)